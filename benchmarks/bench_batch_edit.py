@@ -0,0 +1,65 @@
+"""Benchmark batch multi-slide edits against one model call per slide.
+
+Uses MockGeminiModel with simulated latency, so the numbers reflect how
+many round trips each approach pays rather than real model speed.
+
+    python benchmarks/bench_batch_edit.py --edit 2 4 8 --latency 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+REQUEST = "Update these slides to focus on results from the last quarter"
+
+
+def make_chatbot(slide_count, latency, latency_per_line):
+    model = MockGeminiModel(latency=latency, latency_per_line=latency_per_line)
+    # No response cache, so every run pays for its model calls
+    client = GeminiClient(model=model, response_cache=ResponseCache(max_entries=0))
+    chatbot = PowerPointChatbot(client=client)
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(4)]}
+        for i in range(slide_count)
+    ]
+    chatbot.create_presentation("Benchmark", structure)
+    return chatbot, model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=20)
+    parser.add_argument('--edit', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--latency', type=float, default=0.5, help="simulated seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"{'slides':>6} {'per-slide s':>12} {'calls':>6} {'batch s':>8} {'calls':>6} {'speedup':>8}")
+    for edit_count in args.edit:
+        numbers = list(range(2, 2 + edit_count))
+
+        chatbot, model = make_chatbot(args.slides, args.latency, args.latency_per_line)
+        start = time.perf_counter()
+        for number in numbers:
+            chatbot.edit_slides_batch([number], REQUEST)
+        per_slide_time, per_slide_calls = time.perf_counter() - start, model.calls
+
+        chatbot, model = make_chatbot(args.slides, args.latency, args.latency_per_line)
+        start = time.perf_counter()
+        edits, missing = chatbot.edit_slides_batch(numbers, REQUEST)
+        batch_time, batch_calls = time.perf_counter() - start, model.calls
+        assert sorted(edits) == numbers and not missing, (sorted(edits), missing)
+
+        print(f"{edit_count:>6} {per_slide_time:12.2f} {per_slide_calls:>6} {batch_time:8.2f} "
+              f"{batch_calls:>6} {per_slide_time / batch_time:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
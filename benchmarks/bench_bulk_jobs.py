@@ -0,0 +1,80 @@
+"""Compare one-at-a-time deck generation with the bulk job runner.
+
+The sequential baseline does what typing the prompts into the chat does:
+generate a structure, build the deck and save it, one deck after another.
+``BulkRunner`` overlaps the (simulated) model calls on threads and builds
+the decks in worker processes. Worker start-up (a fresh interpreter per
+process) is included in the runner's time.
+
+    python benchmarks/bench_bulk_jobs.py --jobs 24 --slides 12 --latency 0.5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_jobs import BulkRunner, Job, build_deck  # noqa: E402
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+
+def make_chatbot(args):
+    model = MockGeminiModel(latency=args.latency, latency_per_line=args.latency_per_line)
+    return PowerPointChatbot(client=GeminiClient(model=model, max_concurrency=args.concurrency))
+
+
+def make_jobs(args):
+    return [Job(f"client_{i}", f"Quarterly Review for Client {i}", args.slides, output=f"client_{i}.pptx")
+            for i in range(args.jobs)]
+
+
+def run_sequential(jobs, args, out_dir):
+    os.makedirs(out_dir)
+    runner = BulkRunner(make_chatbot(args), out_dir)
+    for job in jobs:
+        structure, _ = runner.generate(job)
+        build_deck(job.topic, structure, os.path.join(out_dir, job.output))
+
+
+def run_bulk(jobs, args, out_dir):
+    runner = BulkRunner(make_chatbot(args), out_dir, concurrency=args.concurrency, processes=args.processes)
+    summary = runner.run(jobs)
+    assert summary['done'] == len(jobs), summary
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=24)
+    parser.add_argument('--slides', type=int, default=12)
+    parser.add_argument('--latency', type=float, default=0.5, help="fixed seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.01, help="seconds per output line")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--processes', type=int, default=None, help="default: CPU count")
+    args = parser.parse_args()
+
+    jobs = make_jobs(args)
+    print(f"{'runner':>10} {'wall s':>7} {'decks/min':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        run_sequential(jobs, args, os.path.join(out_dir, 'sequential'))
+        elapsed = time.perf_counter() - start
+        print(f"{'sequential':>10} {elapsed:7.2f} {len(jobs) / elapsed * 60:10.1f}")
+
+        start = time.perf_counter()
+        runner = run_bulk(jobs, args, os.path.join(out_dir, 'bulk'))
+        elapsed = time.perf_counter() - start
+        print(f"{'bulk':>10} {elapsed:7.2f} {len(jobs) / elapsed * 60:10.1f}")
+
+        # A second run over the same job list only reads the checkpoint
+        start = time.perf_counter()
+        summary = runner.run(jobs)
+        print(f"{'resume':>10} {time.perf_counter() - start:7.2f} {'':>10} ({summary['skipped']} skipped)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Exercise GeminiClient flow control against a local fake model server.
+
+Starts an HTTP server on localhost that behaves like a quota-limited model
+API: it answers with simulated latency, returns 429 once more than
+``--server-rpm`` requests arrive within a minute-scaled window or more
+than ``--server-concurrency`` are in flight, and fails a fraction of
+requests with 503. Many threads then send prompts drawn from a small pool
+(so identical prompts overlap) through a plain client and through one with
+rate limiting, coalescing, a concurrency cap and backoff.
+
+    python benchmarks/bench_client_limits.py --threads 16 --requests 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel, MockResponse  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+class FakeModelServer(ThreadingHTTPServer):
+    """Quota-limited fake model endpoint"""
+    daemon_threads = True
+
+    def __init__(self, latency, rpm, window, max_in_flight, error_rate, seed=0):
+        super().__init__(('127.0.0.1', 0), FakeModelHandler)
+        self.latency = latency
+        self.rpm = rpm
+        self.window = window
+        self.max_in_flight = max_in_flight
+        self.error_rate = error_rate
+        self.model = MockGeminiModel()
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.recent = deque()
+            self.in_flight = 0
+            self.counts = {'received': 0, 'ok': 0, '429': 0, '503': 0, 'max_in_flight': 0}
+            self.arrivals = []  # monotonic time of every request
+            self.scripted = deque()  # statuses to answer the next requests with, before any quota check
+
+    def admit(self):
+        """Return the status code for a new request and track it as in flight"""
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and now - self.recent[0] > self.window:
+                self.recent.popleft()
+            self.counts['received'] += 1
+            self.arrivals.append(now)
+            if self.scripted:
+                status = self.scripted.popleft()
+                self.counts[str(status)] = self.counts.get(str(status), 0) + 1
+                return status
+            if len(self.recent) >= self.rpm or self.in_flight >= self.max_in_flight:
+                self.counts['429'] += 1
+                return 429
+            self.recent.append(now)
+            if self.rng.random() < self.error_rate:
+                self.counts['503'] += 1
+                return 503
+            self.in_flight += 1
+            self.counts['max_in_flight'] = max(self.counts['max_in_flight'], self.in_flight)
+            return 200
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.counts['ok'] += 1
+
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status = self.server.admit()
+        if status != 200:
+            self.send_response(status)
+            self.end_headers()
+            return
+        try:
+            time.sleep(self.server.latency)
+            payload = json.dumps({'text': self.server.model.respond(body['prompt'])}).encode('utf-8')
+        finally:
+            self.server.release()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeApiError(Exception):
+    """HTTP error carrying ``code`` like google.api_core exceptions do"""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class HttpModel:
+    """``generate_content`` over HTTP to the fake server"""
+
+    def __init__(self, url):
+        self.url = url
+        self.model_name = 'fake-http-model'
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        request = urllib.request.Request(
+            self.url, data=json.dumps({'prompt': prompt}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return MockResponse(json.loads(response.read())['text'])
+        except urllib.error.HTTPError as e:
+            raise FakeApiError(e.code) from None
+
+
+def run(client, server, threads, requests, prompts, seed):
+    server.reset()
+    rng = random.Random(seed)
+    jobs = [rng.choice(prompts) for _ in range(threads * requests)]
+
+    def call(prompt):
+        try:
+            client.generate_text(prompt)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(call, jobs))
+    elapsed = time.perf_counter() - start
+    errors = results.count(False)
+    return elapsed, errors, len(jobs), dict(server.counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=8, help="requests per thread")
+    parser.add_argument('--prompts', type=int, default=12, help="distinct prompts in the pool")
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--server-rpm', type=int, default=60, help="quota per window")
+    parser.add_argument('--window', type=float, default=1.0, help="quota window in seconds (60 = real RPM)")
+    parser.add_argument('--server-concurrency', type=int, default=6)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = FakeModelServer(args.latency, args.server_rpm, args.window,
+                             args.server_concurrency, args.error_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    prompts = [f'Write a slide titled "Topic {i}"' for i in range(args.prompts)]
+
+    # The quota is expressed per window; scale it to requests per minute for the bucket
+    client_rpm = args.server_rpm * 60.0 / args.window * 0.9
+    clients = {
+        'plain': GeminiClient(model=HttpModel(url), response_cache=ResponseCache(max_entries=0),
+                              max_retries=0, coalesce=False),
+        'controlled': GeminiClient(model=HttpModel(url), response_cache=ResponseCache(max_entries=0),
+                                   requests_per_minute=client_rpm, max_concurrency=args.server_concurrency,
+                                   max_retries=5, base_delay=0.05, max_delay=1.0),
+    }
+
+    print(f"{'client':>10} {'wall s':>7} {'failed':>7} {'sent':>5} {'429':>5} {'503':>5} "
+          f"{'peak in flight':>15} {'coalesced':>10} {'retries':>8}")
+    for name, client in clients.items():
+        elapsed, errors, total, counts = run(client, server, args.threads, args.requests, prompts, seed=1)
+        stats = client.stats()
+        print(f"{name:>10} {elapsed:7.2f} {errors:>3}/{total:<3} {counts['received']:>5} {counts['429']:>5} "
+              f"{counts['503']:>5} {counts['max_in_flight']:>15} {stats['coalesced']:>10} {stats['retries']:>8}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark the local edit command path against a model round trip per edit.
+
+Replays a mix of chat edit requests. Simple commands ("rename slide 2 to
+...", "delete slide 5") are applied by ``DeckService`` without a model call;
+the baseline sends every request through the edit prompt, as all edits did
+before. Uses MockGeminiModel with simulated latency, so the model column
+reflects round trips rather than real model speed.
+
+    python benchmarks/bench_edit_commands.py --slides 20 --latency 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from deck_service import DeckService, INTENT_ROUTER, build_edit_prompt  # noqa: E402
+from edit_commands import COMMAND_STATS  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from intent_router import extract_slide_numbers  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+PROMPTS = [
+    "Edit slide 2 title to New Marketing Strategy",
+    "replace bullet 2 on slide 3 with Revenue grew 12% year over year",
+    "add a bullet to slide 4: Hiring starts in Q3",
+    "delete the last bullet from slide 5",
+    "move slide 6 to position 2",
+    "duplicate slide 7",
+    "swap slides 3 and 8",
+    "delete slide 9",
+    "Modify slide 3 content about social media",
+    "make slide 4 more concise",
+]
+
+
+def make_service(slide_count, latency, latency_per_line):
+    model = MockGeminiModel(latency=latency, latency_per_line=latency_per_line)
+    # No response cache, so every run pays for its model calls
+    client = GeminiClient(model=model, response_cache=ResponseCache(max_entries=0))
+    service = DeckService(chatbot=PowerPointChatbot(client=client))
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(4)]}
+        for i in range(slide_count)
+    ]
+    service.chatbot.current_ppt = service.chatbot.create_presentation("Benchmark", structure)
+    service.summary()  # build the slide index outside the timed edits
+    return service
+
+
+def model_edit(service, prompt):
+    """The pre-command path: one edit prompt round trip for the mentioned slide"""
+    route = INTENT_ROUTER.route(prompt)
+    # Commands such as "swap slides 3 and 8" do not route as edits, so read the slide list directly
+    number = route.slide_number or extract_slide_numbers(prompt.lower())[0]
+    current = service.chatbot.get_slide_content(number)
+    new_content = service._generate_slide(build_edit_prompt(number, current, prompt), service.mode)
+    service.chatbot.edit_slide_content(number - 1, new_content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.5, help="simulated seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.005)
+    args = parser.parse_args()
+
+    baseline = make_service(args.slides, args.latency, args.latency_per_line)
+    service = make_service(args.slides, args.latency, args.latency_per_line)
+    COMMAND_STATS.reset()
+
+    print(f"{'request':<66} {'path':>15} {'ms':>9} {'model ms':>9}")
+    total = total_baseline = 0.0
+    for prompt in PROMPTS:
+        start = time.perf_counter()
+        model_edit(baseline, prompt)
+        baseline_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = service.edit(prompt, slide_number=INTENT_ROUTER.route(prompt).slide_number)
+        seconds = time.perf_counter() - start
+
+        total += seconds
+        total_baseline += baseline_seconds
+        path = result.get('command', 'model')
+        print(f"{prompt[:66]:<66} {path:>15} {seconds * 1000:9.2f} {baseline_seconds * 1000:9.1f}")
+
+    stats = COMMAND_STATS.snapshot()
+    print(f"\nserved locally: {stats['local']}/{stats['requests']} ({stats['local_share']:.0%})")
+    print(f"total: {total:.2f}s vs {total_baseline:.2f}s with a model call per edit "
+          f"({total_baseline / total:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark incremental saves against full Presentation.save after each edit.
+
+Builds a deck with content slides and chart pictures, then repeatedly edits
+one slide and serializes, the way the chat flow does after every edit.
+
+    python benchmarks/bench_incremental_save.py --slides 200 --charts 20 --edits 10
+"""
+import argparse
+import os
+import sys
+import time
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation  # noqa: E402
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+
+def build_deck(chatbot, slide_count, chart_count):
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1} in detail" for j in range(4)]}
+        for i in range(slide_count)
+    ]
+    chatbot.create_presentation("Benchmark", structure)
+    for i in range(chart_count):
+        chatbot.add_chart_slide({'title': f"Chart {i}", 'labels': ['Q1', 'Q2', 'Q3', 'Q4'],
+                                 'values': [i, i + 1, i * 2, 3]}, "bar")
+
+
+def full_save(chatbot):
+    buffer = BytesIO()
+    chatbot.current_ppt.save(buffer)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=200)
+    parser.add_argument('--charts', type=int, default=20)
+    parser.add_argument('--edits', type=int, default=10)
+    args = parser.parse_args()
+
+    chatbot = PowerPointChatbot(client=GeminiClient(model=MockGeminiModel()))
+    build_deck(chatbot, args.slides, args.charts)
+
+    timings = {'full save': 0.0, 'incremental save': 0.0}
+    for edit in range(args.edits):
+        slide_index = 1 + edit % args.slides
+        chatbot.edit_slide_content(slide_index, {'title': f"Edited {edit}", 'content': ["Updated point"]})
+
+        start = time.perf_counter()
+        full = full_save(chatbot)
+        timings['full save'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        incremental = chatbot.get_pptx_bytes()
+        timings['incremental save'] += time.perf_counter() - start
+
+    # The incremental output must be a valid package with the same content
+    assert zipfile.ZipFile(BytesIO(incremental)).testzip() is None
+    reloaded = Presentation(BytesIO(incremental))
+    assert len(reloaded.slides) == len(Presentation(BytesIO(full)).slides)
+
+    for name, total in timings.items():
+        print(f"{name:>17}: {total / args.edits * 1000:8.1f} ms per edit")
+    print(f"{'speedup':>17}: {timings['full save'] / timings['incremental save']:8.1f}x")
+    print(f"{'sizes':>17}: full {len(full) / 1024:.0f} KiB, incremental {len(incremental) / 1024:.0f} KiB")
+    print(f"{'saver stats':>17}: {chatbot._saver.stats}")
+
+
+if __name__ == '__main__':
+    main()
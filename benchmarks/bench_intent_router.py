@@ -0,0 +1,115 @@
+"""Benchmark the compiled IntentRouter against the per-turn keyword scans it replaced.
+
+The legacy path is reproduced here verbatim (four keyword lists scanned with
+``any(... in prompt.lower())`` plus the three extractors re-lowercasing the
+prompt), and both paths are checked to agree on every sample prompt. Exits
+non-zero if the router is slower than the legacy scans.
+
+    python benchmarks/bench_intent_router.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import intent_router  # noqa: E402
+from intent_router import IntentRouter, INTENT_KEYWORDS  # noqa: E402
+
+SAMPLE_PROMPTS = [
+    "Create a presentation about digital marketing",
+    "Make a 5-slide presentation on artificial intelligence",
+    "Generate slides about climate change with 6 slides",
+    "create ppt on renewable energy and i want 8 slides",
+    "Edit slide 2 title to New Marketing Strategy",
+    "Modify slide 3 content about social media",
+    "Change slide 1 to focus on digital transformation",
+    "update the second slide with latest revenue numbers",
+    "Add a new slide about market analysis",
+    "insert slide on competitive landscape",
+    "add new slides about pricing tiers",
+    "Show me slide 4",
+    "what's in slide 7?",
+    "display slide number 12",
+    "show me the presentation overview",
+    "How do I make my slides look more professional?",
+    "What font size should I use for bullet points?",
+    "Thanks, that looks great!",
+    "Can you give me tips for presenting to executives?",
+    "Update slide 1 and 2 with latest data",
+    "I need a presentation about the history of the roman empire with 10 slides",
+    "view slide 3 please",
+    "make presentation about onboarding new engineers",
+    "create slide about quarterly goals",
+]
+
+
+def legacy_route(prompt):
+    """The keyword scans and extractors exactly as main() used to run them"""
+    intent = 'chat'
+    if any(keyword in prompt.lower() for keyword in INTENT_KEYWORDS['create']):
+        intent = 'create'
+    elif any(keyword in prompt.lower() for keyword in INTENT_KEYWORDS['edit']):
+        intent = 'edit'
+    elif any(keyword in prompt.lower() for keyword in INTENT_KEYWORDS['add_slide']):
+        intent = 'add_slide'
+    elif any(keyword in prompt.lower() for keyword in INTENT_KEYWORDS['view']):
+        intent = 'view'
+
+    import re
+    count = 5
+    for pattern in [r'(\d+)\s*slides?', r'include\s*(\d+)\s*slides?', r'with\s*(\d+)\s*slides?',
+                    r'want\s*(\d+)\s*slides?', r'need\s*(\d+)\s*slides?', r'make\s*(\d+)\s*slides?']:
+        match = re.search(pattern, prompt.lower())
+        if match and 2 <= int(match.group(1)) <= 15:
+            count = int(match.group(1))
+            break
+
+    number = None
+    for pattern in [r'slide\s*(\d+)', r'slide\s*number\s*(\d+)', r'(\d+)(?:st|nd|rd|th)?\s*slide']:
+        match = re.search(pattern, prompt.lower())
+        if match:
+            number = int(match.group(1))
+            break
+    if number is None:
+        for word, num in intent_router.ORDINALS.items():
+            if word in prompt.lower():
+                number = num
+                break
+
+    topic = intent_router.extract_topic(prompt.lower().strip())
+    return intent, topic, count, number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000, help="passes over the sample corpus")
+    args = parser.parse_args()
+
+    router = IntentRouter()
+    for prompt in SAMPLE_PROMPTS:
+        route = router.route(prompt)
+        routed = (route.intent, route.topic, route.slide_count, route.slide_number)
+        assert routed == legacy_route(prompt), (prompt, routed, legacy_route(prompt))
+
+    total = args.repeat * len(SAMPLE_PROMPTS)
+    results = {}
+    for name, fn in [('legacy scans', legacy_route), ('IntentRouter.route', router.route),
+                     ('intent only', lambda p: router.match_intent(p.lower()))]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for prompt in SAMPLE_PROMPTS:
+                fn(prompt)
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        print(f"{name:>20}: {elapsed / total * 1e6:8.2f} us/prompt")
+
+    speedup = results['legacy scans'] / results['IntentRouter.route']
+    print(f"{'speedup':>20}: {speedup:8.1f}x")
+    if speedup < 1:
+        sys.exit("IntentRouter.route is slower than the keyword scans it replaced")
+
+
+if __name__ == '__main__':
+    main()
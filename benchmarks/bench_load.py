@@ -0,0 +1,120 @@
+"""Benchmark loading large uploaded decks: temp file vs in-memory vs mmap.
+
+Generates a deck of incompressible images (default ~60 MB), then loads it
+in a fresh subprocess per method so peak RSS is measured independently.
+
+    python benchmarks/bench_load.py --images 20 --repeat 3
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deck_loader import open_presentation  # noqa: E402
+
+METHODS = ['tempfile', 'buffer', 'path', 'mmap']
+
+
+def build_deck(path, image_count, size=1000):
+    import numpy as np
+    from PIL import Image
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    prs = Presentation()
+    rng = np.random.default_rng(0)
+    for _ in range(image_count):
+        pixels = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+        png = BytesIO()
+        Image.fromarray(pixels).save(png, format='PNG', compress_level=1)
+        png.seek(0)
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_picture(png, Inches(1), Inches(1), width=Inches(8))
+    prs.save(path)
+
+
+def current_rss_kib():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * resource.getpagesize() // 1024
+
+
+def load_once(method, path, payload):
+    if method == 'tempfile':
+        # The previous upload path: write the buffer out, load by path, delete
+        temp_path = os.path.join(tempfile.gettempdir(), f"temp_{os.getpid()}.pptx")
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        try:
+            return open_presentation(temp_path, use_mmap=False)
+        finally:
+            os.remove(temp_path)
+    if method == 'buffer':
+        return open_presentation(memoryview(payload))
+    return open_presentation(path, use_mmap=method == 'mmap')
+
+
+def run_child(method, path, repeat):
+    # Uploads arrive in memory; only the methods that need them pay for the buffer
+    payload = None
+    if method in ('tempfile', 'buffer'):
+        with open(path, 'rb') as f:
+            payload = f.read()
+    baseline = current_rss_kib()
+
+    timings = []
+    peak = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prs = load_once(method, path, payload)
+        timings.append(time.perf_counter() - start)
+        slide_count = len(prs.slides)
+        if peak is None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # python-pptx parts form reference cycles; free them before the next load
+        del prs
+        gc.collect()
+    print(json.dumps({
+        'method': method,
+        'best_ms': min(timings) * 1000,
+        'peak_delta_mib': (peak - baseline) / 1024,
+        'slides': slide_count,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--images', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--method', choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.method:
+        run_child(args.method, args.path, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'large.pptx')
+        build_deck(path, args.images)
+        print(f"deck: {os.path.getsize(path) / 1024 / 1024:.1f} MiB, {args.images} slides")
+        print(f"{'method':>10} {'best ms':>9} {'peak RSS delta MiB':>19}")
+        for method in METHODS:
+            output = subprocess.run(
+                [sys.executable, __file__, '--method', method, '--path', path, '--repeat', str(args.repeat)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{method:>10} {result['best_ms']:9.1f} {result['peak_delta_mib']:19.1f}")
+        print("mmap RSS includes mapped file pages, which the kernel can drop under pressure")
+
+
+if __name__ == '__main__':
+    main()
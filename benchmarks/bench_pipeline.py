@@ -0,0 +1,71 @@
+"""Benchmark single-request generation against the concurrent per-slide pipeline.
+
+Runs fully offline against MockGeminiModel, whose latency grows with the
+number of output lines, so the numbers reflect how generation time scales
+with slide count rather than network noise.
+
+    python benchmarks/bench_pipeline.py --slides 5 10 20 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+
+def make_chatbot(args):
+    model = MockGeminiModel(latency=args.latency, latency_per_line=args.latency_per_line,
+                            fail_every=args.fail_every)
+    return PowerPointChatbot(client=GeminiClient(model=model))
+
+
+def run_single(chatbot, topic, slide_count):
+    prompt = f"""
+    Create a detailed and professional presentation structure about "{topic}".
+    Generate EXACTLY {slide_count} slides with 3-5 bullet points each.
+    """
+    response_text = chatbot.generate_text(prompt)
+    structure = chatbot.parse_presentation_structure(response_text)
+    chatbot.create_presentation(topic, structure)
+    return len(structure)
+
+
+def run_pipeline(chatbot, topic, slide_count, workers, retries):
+    _, structure, _ = chatbot.create_presentation_pipeline(
+        topic, slide_count, max_workers=workers, retries=retries
+    )
+    return len(structure)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[5, 10, 20])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--latency', type=float, default=0.3, help="fixed seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.05, help="seconds per output line")
+    parser.add_argument('--fail-every', type=int, default=0, help="make every Nth model call fail")
+    args = parser.parse_args()
+
+    print(f"{'slides':>6} {'single (s)':>11} {'pipeline (s)':>13} {'speedup':>8}")
+    for slide_count in args.slides:
+        topic = f"benchmark topic {slide_count}"
+
+        start = time.perf_counter()
+        run_single(make_chatbot(args), topic, slide_count)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_pipeline(make_chatbot(args), topic, slide_count, args.workers, args.retries)
+        pipeline = time.perf_counter() - start
+
+        print(f"{slide_count:>6} {single:>11.2f} {pipeline:>13.2f} {single / pipeline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
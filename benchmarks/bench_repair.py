@@ -0,0 +1,80 @@
+"""Benchmark targeted slide repair against regenerating the whole deck.
+
+The first structure answer for every deck is cut short the way answers that
+hit the output limit are: the last third of the slides is missing and one
+slide lost its bullet points. The baseline does what users did, asking for
+the whole deck again; the repair path asks only for the missing slides.
+Uses MockGeminiModel with a per-output-line latency, so longer answers cost
+more, as with the real model.
+
+    python benchmarks/bench_repair.py --slides 6 12 24 --latency 0.3
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from deck_service import build_create_prompt  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+TOPIC = "Renewable Energy Transition"
+
+
+class FirstAnswerCutShort(MockGeminiModel):
+    """Mock model whose first answer is incomplete"""
+
+    def generate_content(self, prompt, **kwargs):
+        self.incomplete_every = 1 if self.calls == 0 else 0
+        return super().generate_content(prompt, **kwargs)
+
+
+def make_chatbot(args):
+    model = FirstAnswerCutShort(latency=args.latency, latency_per_line=args.latency_per_line)
+    # No response cache, so asking again really asks again
+    client = GeminiClient(model=model, response_cache=ResponseCache(max_entries=0))
+    return PowerPointChatbot(client=client), model
+
+
+def regenerate(args, slide_count):
+    chatbot, model = make_chatbot(args)
+    prompt = build_create_prompt(TOPIC, slide_count)
+    structure = chatbot.parse_presentation_structure(chatbot.generate_text(prompt))
+    start = time.perf_counter()
+    while len(structure) < slide_count and model.calls < 3:
+        structure = chatbot.parse_presentation_structure(chatbot.generate_text(prompt))
+    return structure, time.perf_counter() - start
+
+
+def repair(args, slide_count):
+    chatbot, model = make_chatbot(args)
+    prompt = build_create_prompt(TOPIC, slide_count)
+    outline = []
+    structure = chatbot.parse_presentation_structure(chatbot.generate_text(prompt), outline)
+    start = time.perf_counter()
+    structure, _ = chatbot.repair_structure(TOPIC, structure, slide_count, outline=outline)
+    return structure, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[6, 12, 24])
+    parser.add_argument('--latency', type=float, default=0.3, help="simulated seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.01, help="seconds per output line")
+    args = parser.parse_args()
+
+    # Time spent recovering after the incomplete first answer
+    print(f"{'slides':>6} {'regenerate s':>13} {'slides':>7} {'repair s':>9} {'slides':>7} {'speedup':>8}")
+    for slide_count in args.slides:
+        full, full_seconds = regenerate(args, slide_count)
+        repaired, repair_seconds = repair(args, slide_count)
+        print(f"{slide_count:>6} {full_seconds:13.2f} {len(full):>7} {repair_seconds:9.2f} {len(repaired):>7} "
+              f"{full_seconds / repair_seconds:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
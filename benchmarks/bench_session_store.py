@@ -0,0 +1,113 @@
+"""Benchmark process memory with and without the session deck budget.
+
+Simulates many sessions of one worker process, each holding its own deck,
+with most requests going to a small set of active sessions. Without a
+budget every deck stays loaded; with one, ``SessionStore`` offloads the
+least recently used decks to disk and reloads a deck when its session comes
+back. Each mode runs in its own subprocess so resident memory (RSS) is
+measured from a clean start. No model calls are made.
+
+    python benchmarks/bench_session_store.py --sessions 40 --slides 60 --budget-mb 64
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from session_store import BlobStore, SessionStore  # noqa: E402
+
+
+def rss_mb():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, in KB on Linux
+
+
+def make_deck(chatbot, slides, seed):
+    structure = [
+        {'title': f"Deck {seed} section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(4)]}
+        for i in range(slides)
+    ]
+    chatbot.current_ppt = chatbot.create_presentation(f"Deck {seed}", structure)
+    chatbot.get_pptx_bytes()
+
+
+def run(args, budget_mb):
+    budget = budget_mb * 1024 * 1024 if budget_mb else float('inf')
+    store = SessionStore(BlobStore(tempfile.mkdtemp(prefix='bench-sessions-')), memory_budget=budget, idle_seconds=None)
+    baseline = rss_mb()
+    sessions = {}
+    for i in range(args.sessions):
+        chatbot = PowerPointChatbot(client=object())
+        sessions[f"session-{i}"] = chatbot
+        with store.session(f"session-{i}", chatbot):
+            make_deck(chatbot, args.slides, i)
+
+    # 80% of the requests go to the most recently active sessions
+    rng = random.Random(0)
+    ids = list(sessions)
+    active = ids[-args.active:]
+    latencies = []
+    reloads = 0
+    for n in range(args.requests):
+        session_id = rng.choice(active) if rng.random() < 0.8 else rng.choice(ids)
+        chatbot = sessions[session_id]
+        reloads += chatbot.deck_offloaded
+        start = time.perf_counter()
+        with store.session(session_id, chatbot):
+            chatbot.edit_slide_content(1, {'title': f"Edited {n}", 'content': ["One", "Two", "Three"]})
+            chatbot.get_pptx_bytes()
+        latencies.append(time.perf_counter() - start)
+
+    stats = store.stats(per_session=False)
+    return {
+        'rss_mb': rss_mb() - baseline,
+        'estimate_mb': stats['resident_bytes'] / 1024 / 1024,
+        'resident': stats['resident_sessions'],
+        'disk_mb': stats['disk_bytes'] / 1024 / 1024,
+        'reloads': reloads,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': statistics.quantiles(latencies, n=20)[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=40)
+    parser.add_argument('--active', type=int, default=5, help="sessions receiving most requests")
+    parser.add_argument('--slides', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--budget-mb', type=float, default=64)
+    parser.add_argument('--only', type=float, help=argparse.SUPPRESS)  # run one mode, print JSON
+    args = parser.parse_args()
+
+    if args.only is not None:
+        print(json.dumps(run(args, args.only)))
+        return
+
+    base = [sys.executable, os.path.abspath(__file__), '--sessions', str(args.sessions), '--active', str(args.active),
+            '--slides', str(args.slides), '--requests', str(args.requests)]
+    print(f"{args.sessions} sessions x {args.slides} slides, {args.requests} edits, {args.active} active sessions\n")
+    print(f"{'budget':>10} {'RSS MB':>8} {'est MB':>8} {'resident':>9} {'disk MB':>8} {'reloads':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8}")
+    for label, budget_mb in (("none", 0), (f"{args.budget_mb:g} MB", args.budget_mb)):
+        output = subprocess.run(base + ['--only', str(budget_mb)], capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{label:>10} {result['rss_mb']:8.1f} {result['estimate_mb']:8.1f} {result['resident']:>9} "
+              f"{result['disk_mb']:8.1f} {result['reloads']:>8} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark create_presentation with the template-cloning slide factory.
+
+The baseline styles every content slide property by property (the path the
+factory uses only for the first slide of each kind).
+
+    python benchmarks/bench_slide_factory.py --slides 50 100 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation  # noqa: E402
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+
+def make_structure(slide_count):
+    return [
+        {
+            'title': f"Section {i + 1}: Key findings",
+            'content': [f"Finding {j + 1} for section {i + 1} with supporting detail and context"
+                        for j in range(4)]
+        }
+        for i in range(slide_count)
+    ]
+
+
+def build_per_property(chatbot, title, structure):
+    prs = Presentation()
+    chatbot.create_title_slide(prs, title)
+    for i, slide_data in enumerate(structure):
+        chatbot._build_content_slide(prs, slide_data, i)
+    chatbot.add_conclusion_slide(prs, title)
+    return prs
+
+
+def build_with_factory(chatbot, title, structure):
+    return chatbot.create_presentation(title, structure)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    chatbot = PowerPointChatbot(client=GeminiClient(model=MockGeminiModel()))
+    print(f"{'slides':>6} {'per-property (s)':>17} {'factory (s)':>12} {'speedup':>8}")
+    for slide_count in args.slides:
+        structure = make_structure(slide_count)
+        baseline = best_of(lambda: build_per_property(chatbot, "Benchmark", structure), args.repeat)
+        factory = best_of(lambda: build_with_factory(chatbot, "Benchmark", structure), args.repeat)
+        print(f"{slide_count:>6} {baseline:>17.3f} {factory:>12.3f} {baseline / factory:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
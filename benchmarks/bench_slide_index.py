@@ -0,0 +1,93 @@
+"""Benchmark chat-turn summary/view lookups with the slide index.
+
+The baseline is the previous shape walk over every slide per request. Each
+simulated turn edits one slide, then asks for the summary and one slide.
+
+    python benchmarks/bench_slide_index.py --slides 50 200 --turns 50
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+
+def walk_summary(prs):
+    slides_info = []
+    for i, slide in enumerate(prs.slides, 1):
+        title = 'Untitled Slide'
+        if slide.shapes.title and slide.shapes.title.text:
+            title = slide.shapes.title.text.strip()
+        content_count = 0
+        for shape in slide.shapes:
+            if shape.has_text_frame and shape != slide.shapes.title:
+                for paragraph in shape.text_frame.paragraphs:
+                    if paragraph.text.strip():
+                        content_count += 1
+        slides_info.append({'number': i, 'title': title, 'content_points': content_count})
+    return {'total_slides': len(prs.slides), 'slides': slides_info}
+
+
+def walk_slide(prs, slide_number):
+    slide = prs.slides[slide_number - 1]
+    title = slide.shapes.title.text if slide.shapes.title else f"Slide {slide_number}"
+    content = []
+    for shape in slide.shapes:
+        if shape.has_text_frame and shape != slide.shapes.title:
+            for paragraph in shape.text_frame.paragraphs:
+                if paragraph.text.strip():
+                    content.append(paragraph.text.strip())
+    return {'title': title, 'content': content}
+
+
+def make_chatbot(slide_count):
+    chatbot = PowerPointChatbot(client=GeminiClient(model=MockGeminiModel()))
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(5)]}
+        for i in range(slide_count)
+    ]
+    chatbot.create_presentation("Benchmark", structure)
+    return chatbot
+
+
+def run_turns(chatbot, turns, indexed):
+    prs = chatbot.current_ppt
+    total = len(prs.slides)
+    start = time.perf_counter()
+    for turn in range(turns):
+        number = 2 + turn % (total - 2)
+        chatbot.edit_slide_content(number - 1, {'title': f"Edited {turn}", 'content': [f"Point {turn}"]})
+        if indexed:
+            summary = chatbot.get_presentation_summary()
+            content = chatbot.get_slide_content(number)
+        else:
+            summary = walk_summary(prs)
+            content = walk_slide(prs, number)
+    return time.perf_counter() - start, summary, content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--turns', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'slides':>6} {'walk ms/turn':>13} {'index ms/turn':>14} {'speedup':>8}")
+    for slide_count in args.slides:
+        walk_time, walk_summary_result, walk_content = run_turns(make_chatbot(slide_count), args.turns, False)
+        index_time, index_summary, index_content = run_turns(make_chatbot(slide_count), args.turns, True)
+        # Both paths must report the same deck
+        assert walk_summary_result == index_summary
+        assert walk_content == index_content
+
+        print(f"{slide_count:>6} {walk_time / args.turns * 1000:13.2f} "
+              f"{index_time / args.turns * 1000:14.2f} {walk_time / index_time:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
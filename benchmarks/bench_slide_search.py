@@ -0,0 +1,111 @@
+"""Benchmark "the slide about X" lookups on a large deck.
+
+Builds a synthetic deck, indexes it the way load_presentation does, then
+resolves queries made from each sampled slide's own title terms. The
+baseline is a linear scan that counts query-term substrings in every
+slide's text.
+
+    python benchmarks/bench_slide_search.py --slides 1000 --queries 500
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+from slide_index import SlideIndex  # noqa: E402
+
+SUBJECTS = [
+    "pricing", "revenue", "hiring", "churn", "onboarding", "security", "compliance", "roadmap",
+    "marketing", "partnerships", "logistics", "inventory", "retention", "analytics", "support",
+    "procurement", "budget", "forecast", "branding", "infrastructure", "latency", "migration",
+    "training", "diversity", "sustainability", "expansion", "licensing", "warranty", "research",
+    "design", "accessibility", "localization", "payments", "fraud", "billing", "upsell",
+]
+QUALIFIERS = [
+    "enterprise", "regional", "quarterly", "global", "mobile", "cloud", "legacy", "strategic",
+    "customer", "internal", "european", "asian", "startup", "annual", "weekly", "vendor",
+]
+FILLER = ("team plan goal metric process review update target growth risk owner timeline "
+          "priority result impact status action insight initiative").split()
+
+
+def make_structure(slide_count, rng):
+    structure = []
+    for i in range(slide_count):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        qualifier = QUALIFIERS[(i // len(SUBJECTS)) % len(QUALIFIERS)]
+        bullets = [" ".join(rng.choice(FILLER) for _ in range(10)) + f" {subject}" for _ in range(4)]
+        structure.append({'title': f"{qualifier} {subject} {i}", 'content': bullets})
+    return structure
+
+
+def linear_scan(entries, query):
+    terms = query.lower().split()
+    best, best_score = None, 0
+    for number, entry in enumerate(entries, 1):
+        text = " ".join(((entry.title or ''),) + entry.paragraphs + (entry.notes,)).lower()
+        score = sum(text.count(term) for term in terms)
+        if score > best_score:
+            best, best_score = number, score
+    return best
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chatbot = PowerPointChatbot(client=GeminiClient(model=MockGeminiModel()))
+    structure = make_structure(args.slides, rng)
+    chatbot.create_presentation("Search benchmark", structure)
+
+    start = time.perf_counter()
+    index = SlideIndex(chatbot.current_ppt)
+    entries = index.entries()
+    build_time = time.perf_counter() - start
+
+    # Query by each sampled slide's title without its serial number
+    sample = rng.sample(range(args.slides), min(args.queries, args.slides))
+    queries = [structure[i]['title'].rsplit(' ', 1)[0] for i in sample]
+
+    results = {}
+    for name, resolve in [
+        ('bm25 index', lambda query: (index.search(query, limit=1) or [(None, 0)])[0][0]),
+        ('linear scan', lambda query: linear_scan(entries, query)),
+    ]:
+        latencies = []
+        hits = 0
+        for query in queries:
+            start = time.perf_counter()
+            number = resolve(query)
+            latencies.append(time.perf_counter() - start)
+            # Several slides share a qualifier/subject pair; any of them is a fair answer.
+            # The title slide comes first, so structure[i] is slide i + 2.
+            if number is not None and number >= 2 and structure[number - 2]['title'].rsplit(' ', 1)[0] == query:
+                hits += 1
+        results[name] = (latencies, hits)
+
+    print(f"deck: {len(entries)} slides, index built in {build_time * 1000:.0f} ms")
+    print(f"{'method':>12} {'p50 us':>9} {'p95 us':>9} {'mean us':>9} {'top-1':>7}")
+    for name, (latencies, hits) in results.items():
+        print(f"{name:>12} {percentile(latencies, 0.5) * 1e6:9.1f} {percentile(latencies, 0.95) * 1e6:9.1f} "
+              f"{statistics.mean(latencies) * 1e6:9.1f} {hits / len(queries):7.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark cold-start import time of the app and its entry points.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``
+so every run is a cold start. Reports the median import time, the packages
+that cost the most, and whether any of the heavy dependencies that are
+only needed for charts, CSV data or model calls (matplotlib, pandas, NumPy,
+the Gemini SDK) were imported anyway. Exits non-zero when ``app`` exceeds
+``--budget-ms`` or imports one of them. No model calls are made.
+
+    python benchmarks/bench_startup.py --repeat 5 --budget-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use by the chart, CSV and model paths, never at startup
+DEFERRED = ['matplotlib', 'pandas', 'numpy', 'google.generativeai', 'plotly.express']
+
+# Cold-start budget for ``import app`` (Streamlit alone is most of it)
+DEFAULT_BUDGET_MS = 1500
+
+
+def import_profile(module):
+    """Import ``module`` in a new interpreter; returns (wall ms, import ms, {name: (self us, cumulative us)})"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.setdefault(name.strip(), (int(self_us), int(cumulative_us)))
+    return wall_ms, imports[module][1] / 1000, imports
+
+
+def run(module, repeat):
+    walls, totals, packages = [], [], Counter()
+    for _ in range(repeat):
+        wall_ms, import_ms, imports = import_profile(module)
+        walls.append(wall_ms)
+        totals.append(import_ms)
+        for name, (self_us, _) in imports.items():
+            packages[name.split('.')[0]] += self_us / 1000 / repeat
+    return {
+        'wall_ms': statistics.median(walls),
+        'import_ms': statistics.median(totals),
+        'top': packages.most_common(5),
+        'deferred': [name for name in DEFERRED if name in imports],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modules', nargs='+', default=['app', 'chatbot', 'deck_service', 'cli'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help="budget for importing app")
+    args = parser.parse_args()
+
+    print(f"median of {args.repeat} cold imports\n")
+    print(f"{'module':>13} {'import ms':>10} {'process ms':>11}  heaviest packages (self ms)")
+    failures = []
+    for module in args.modules:
+        result = run(module, args.repeat)
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in result['top'])
+        print(f"{module:>13} {result['import_ms']:10.0f} {result['wall_ms']:11.0f}  {top}")
+        if result['deferred']:
+            failures.append(f"{module} imports {', '.join(result['deferred'])} at startup")
+        if module == 'app' and result['import_ms'] > args.budget_ms:
+            failures.append(f"app imports in {result['import_ms']:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
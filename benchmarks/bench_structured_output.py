@@ -0,0 +1,56 @@
+"""Compare markdown parsing and structured JSON output on unreliable responses.
+
+MockGeminiModel returns a malformed answer every ``--malformed-every`` calls
+(markdown without headings, or JSON cut off halfway). Markdown mode can only
+fall back to the default structure, which the user then has to re-prompt
+for. JSON mode re-asks once with the validation error. The parse statistics
+show both rates.
+
+    python benchmarks/bench_structured_output.py --requests 200 --malformed-every 5
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from deck_schema import PARSE_STATS  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+
+
+def structure_prompt(i):
+    return f'Create a presentation about "Topic {i}" with EXACTLY 5 slides.'
+
+
+def run(mode, requests, malformed_every):
+    # Each mode gets its own counters
+    PARSE_STATS.reset()
+    model = MockGeminiModel(malformed_every=malformed_every)
+    chatbot = PowerPointChatbot(client=GeminiClient(model=model, response_cache=ResponseCache(max_entries=0)))
+    for i in range(requests):
+        if mode == 'json':
+            chatbot.generate_structure(structure_prompt(i))
+        else:
+            chatbot.parse_presentation_structure(chatbot.generate_text(structure_prompt(i)))
+    return PARSE_STATS.stats(), model.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--malformed-every', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':>9} {'calls':>6} {'failure rate':>13} {'retry rate':>11} {'fallback rate':>14}")
+    for mode in ('markdown', 'json'):
+        stats, calls = run(mode, args.requests, args.malformed_every)
+        # A failed parse costs the user another full request
+        print(f"{mode:>9} {calls:>6} {stats['failure_rate']:13.1%} {stats['retry_rate']:11.1%} "
+              f"{stats['fallback_rate']:14.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""Offline regression suite for the chatbot's main operations.
+
+Swaps ``PowerPointChatbot.model`` for ``MockGeminiModel`` (deterministic
+answers, configurable latency) and drives generation, structure parsing,
+deck creation, slide edits, added slides, chart slides, summaries and
+saves on decks of each ``--slides`` size. For every operation it reports
+throughput, p50/p90/p99 latency and the peak Python heap of one call, plus
+the process peak RSS per deck size.
+
+``--json`` writes the results to a file; ``--baseline`` compares against
+such a file and exits non-zero when an operation's p50 got slower than
+``--tolerance`` allows, so the suite can gate dependency upgrades.
+
+    python benchmarks/bench_suite.py --slides 5 50 500 --json results.json
+    python benchmarks/bench_suite.py --baseline results.json --tolerance 0.25
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+from gemini_client import GeminiClient  # noqa: E402
+from metrics import percentile  # noqa: E402
+from mock_model import MockGeminiModel  # noqa: E402
+
+OPERATIONS = (
+    'generate', 'parse_structure', 'create_presentation', 'edit_slide_content',
+    'add_new_slide', 'add_chart_slide', 'get_presentation_summary', 'save_presentation',
+)
+
+
+def structure_prompt(topic, slide_count):
+    return f'Create a presentation about "{topic}" with EXACTLY {slide_count} slides.'
+
+
+def summarize(samples, peak_bytes):
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'ops': len(ordered),
+        'ops_per_second': round(len(ordered) / total, 2) if total else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 0.90) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'peak_kib': peak_bytes // 1024,
+    }
+
+
+def traced_peak(fn):
+    """Peak Python heap allocated while running ``fn`` once (kept out of the timed runs)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn, repeat):
+    """Time ``repeat`` calls of ``fn(i)``, then trace the memory of one more call"""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, traced_peak(lambda: fn(repeat)))
+
+
+def chart_data(i):
+    # Distinct values per call so the chart render cache does not hide the render cost
+    rng = random.Random(i)
+    labels = ['Q1', 'Q2', 'Q3', 'Q4']
+    return {'title': f"Revenue {i}", 'labels': labels, 'values': [rng.randint(10, 100) for _ in labels]}
+
+
+def run_size(slide_count, args):
+    # Swapping the model replaces the placeholder client with an uncached one
+    chatbot = PowerPointChatbot(client=GeminiClient(model=MockGeminiModel()))
+    chatbot.model = MockGeminiModel(latency=args.latency, latency_per_line=args.latency_per_line)
+    rng = random.Random(slide_count)
+    results = {}
+
+    # Distinct topics so every call reaches the (fake) model
+    results['generate'] = measure(
+        lambda i: chatbot.generate_text(structure_prompt(f"Topic {slide_count}-{i}", slide_count)),
+        args.model_repeat,
+    )
+    response = chatbot.generate_text(structure_prompt(f"Topic {slide_count}", slide_count))
+    results['parse_structure'] = measure(lambda i: chatbot.parse_presentation_structure(response),
+                                         args.repeat)
+    structure = chatbot.parse_presentation_structure(response)
+    results['create_presentation'] = measure(lambda i: chatbot.create_presentation("Benchmark", structure),
+                                             args.deck_repeat)
+    total_slides = len(chatbot.current_ppt.slides)
+
+    def edit(i):
+        chatbot.edit_slide_content(rng.randrange(1, total_slides - 1), {
+            'title': f"Edited {i}", 'content': [f"Updated point {j} of edit {i}" for j in range(4)],
+        })
+
+    results['edit_slide_content'] = measure(edit, args.repeat)
+
+    # The summary is cached until the deck changes, so edit before every timed summary
+    summary_samples = []
+    for i in range(args.repeat):
+        edit(i)
+        start = time.perf_counter()
+        chatbot.get_presentation_summary()
+        summary_samples.append(time.perf_counter() - start)
+    edit(args.repeat)
+    results['get_presentation_summary'] = summarize(summary_samples,
+                                                    traced_peak(chatbot.get_presentation_summary))
+
+    # Save after an edit each time; an unchanged deck would return cached bytes
+    def save(i):
+        edit(i)
+        chatbot.save_presentation("benchmark.pptx")
+
+    save_samples = []
+    for i in range(args.deck_repeat):
+        edit(i)
+        start = time.perf_counter()
+        chatbot.save_presentation("benchmark.pptx")
+        save_samples.append(time.perf_counter() - start)
+    results['save_presentation'] = summarize(save_samples, traced_peak(lambda: save(args.deck_repeat)))
+
+    results['add_new_slide'] = measure(
+        lambda i: chatbot.add_new_slide({'title': f"Added {i}", 'content': [f"Added point {j}" for j in range(4)]}),
+        args.repeat,
+    )
+    results['add_chart_slide'] = measure(lambda i: chatbot.add_chart_slide(chart_data(i)), args.chart_repeat)
+
+    gc.collect()
+    return results, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def compare(results, baseline, tolerance):
+    """Return ``(size, operation, old_ms, new_ms)`` for every p50 regression"""
+    regressions = []
+    for size, operations in results.items():
+        for name, stats in operations['operations'].items():
+            old = baseline.get(size, {}).get('operations', {}).get(name)
+            if old and old['p50_ms'] and stats['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+                regressions.append((size, name, old['p50_ms'], stats['p50_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[5, 50, 500])
+    parser.add_argument('--repeat', type=int, default=50, help="runs of the per-slide operations")
+    parser.add_argument('--deck-repeat', type=int, default=5, help="runs of whole-deck create and save")
+    parser.add_argument('--model-repeat', type=int, default=5, help="fake model calls")
+    parser.add_argument('--chart-repeat', type=int, default=10, help="chart slides rendered")
+    parser.add_argument('--latency', type=float, default=0.05, help="fixed seconds per model call")
+    parser.add_argument('--latency-per-line', type=float, default=0.0, help="seconds per output line")
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'slides':>6} {'operation':>25} {'ops':>5} {'ops/s':>9} {'p50 ms':>9} {'p90 ms':>9} "
+          f"{'p99 ms':>9} {'peak KiB':>9}")
+    for slide_count in args.slides:
+        operations, peak_rss = run_size(slide_count, args)
+        results[str(slide_count)] = {'operations': operations, 'peak_rss_kib': peak_rss}
+        for name in OPERATIONS:
+            stats = operations[name]
+            print(f"{slide_count:>6} {name:>25} {stats['ops']:>5} {stats['ops_per_second']:>9.1f} "
+                  f"{stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                  f"{stats['peak_kib']:>9}")
+        print(f"{slide_count:>6} {'peak RSS (process)':>25} {peak_rss:>56} KiB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for size, name, old, new in regressions:
+            print(f"REGRESSION {name} on {size} slides: p50 {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No p50 regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark slide-granular version history against a full .pptx per version.
+
+Applies the same mix of edits (retitles, bullet changes, moves, duplicates,
+deletes, added slides) to decks of several sizes. The baseline keeps undo
+by saving the whole deck after every edit; ``VersionHistory`` keeps only the
+parts each edit touched. Reports history memory for both and undo/redo
+latency for the history. No model calls are made.
+
+    python benchmarks/bench_version_history.py --slides 20 100 400 --edits 40
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import PowerPointChatbot  # noqa: E402
+
+
+def make_chatbot(slides):
+    chatbot = PowerPointChatbot(client=object())
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(4)]}
+        for i in range(slides)
+    ]
+    chatbot.current_ppt = chatbot.create_presentation("Benchmark", structure)
+    return chatbot
+
+
+def apply_edit(chatbot, n):
+    count = len(chatbot.current_ppt.slides)
+    index = 1 + (n * 7) % (count - 2)
+    kind = n % 6
+    if kind == 0:
+        return chatbot.edit_slide_content(index, {'title': f"Edited title {n}"})
+    if kind == 1:
+        return chatbot.replace_bullet(index, 1, f"Replaced point {n}")
+    if kind == 2:
+        return chatbot.add_bullet(index, f"Added point {n}")
+    if kind == 3:
+        return chatbot.move_slide(index, 1 + (index + 3) % (count - 2))
+    if kind == 4:
+        return chatbot.duplicate_slide(index)
+    return chatbot.delete_slide(index)
+
+
+def percentile_ms(samples, fraction):
+    return sorted(samples)[int(fraction * (len(samples) - 1))] * 1000
+
+
+def run(slides, edits):
+    chatbot = make_chatbot(slides)
+    baseline_bytes = len(chatbot.get_pptx_bytes())
+    edit_seconds = []
+    for n in range(edits):
+        start = time.perf_counter()
+        assert apply_edit(chatbot, n)
+        edit_seconds.append(time.perf_counter() - start)
+        # The baseline's undo stack: the whole deck after every edit
+        baseline_bytes += len(chatbot.get_pptx_bytes())
+    chatbot.history.seal()
+    history_bytes = chatbot.history.memory_bytes()
+
+    undo_seconds = []
+    while chatbot.history.can_undo:
+        start = time.perf_counter()
+        chatbot.undo()
+        undo_seconds.append(time.perf_counter() - start)
+    redo_seconds = []
+    while chatbot.history.can_redo:
+        start = time.perf_counter()
+        chatbot.redo()
+        redo_seconds.append(time.perf_counter() - start)
+
+    return {
+        'deck_kb': len(chatbot.get_pptx_bytes()) / 1024,
+        'baseline_kb': baseline_bytes / 1024,
+        'history_kb': history_bytes / 1024,
+        'edit_ms': statistics.median(edit_seconds) * 1000,
+        'undo_p50': percentile_ms(undo_seconds, 0.5),
+        'undo_p95': percentile_ms(undo_seconds, 0.95),
+        'redo_p50': percentile_ms(redo_seconds, 0.5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--slides', type=int, nargs='+', default=[20, 100, 400])
+    parser.add_argument('--edits', type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{args.edits} edits per deck\n")
+    print(f"{'slides':>6} {'deck KB':>8} {'full-copy KB':>13} {'history KB':>11} {'edit ms':>8} "
+          f"{'undo p50':>9} {'undo p95':>9} {'redo p50':>9}")
+    for slides in args.slides:
+        result = run(slides, args.edits)
+        print(f"{slides:>6} {result['deck_kb']:8.0f} {result['baseline_kb']:13.0f} {result['history_kb']:11.1f} "
+              f"{result['edit_ms']:8.2f} {result['undo_p50']:9.2f} {result['undo_p95']:9.2f} {result['redo_p50']:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
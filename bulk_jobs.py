@@ -0,0 +1,257 @@
+"""Bulk deck generation from a CSV or JSONL job list.
+
+Each job is one deck: a topic plus optional ``id``, ``slides``, ``request``,
+``mode`` (single or json) and ``output`` (a file name inside the output
+directory) columns/keys. ``BulkRunner``
+generates deck structures concurrently on a thread pool, with the model
+client's rate limit and concurrency cap keeping requests within quota,
+and hands each finished structure to a process pool that builds and saves
+the .pptx, so slide assembly uses every core instead of contending for
+the GIL with the generation threads.
+
+Progress is appended to a JSONL checkpoint: a ``generated`` record keeps
+the slides of a job whose file is not written yet, ``done`` marks a saved
+deck and ``failed`` an error (a failed build keeps the slides too).
+Re-running the same job list resumes: done jobs are skipped and generated
+ones, or ones whose build failed, go straight to assembly, so no model
+call is repeated. Records carry the job's topic, slide count, request and
+mode, and a job edited since its record was written starts over.
+"""
+import csv
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from chatbot import DEFAULT_SLIDE_STRUCTURE, PowerPointChatbot
+from deck_service import MODE_JSON, MODE_SINGLE, build_create_prompt, build_requirements
+from intent_router import DEFAULT_SLIDE_COUNT
+
+# Bulk structures are generated in one request each; streaming and the
+# per-slide pipeline build the deck while generating, which happens in
+# the worker processes here instead
+BULK_MODES = (MODE_SINGLE, MODE_JSON)
+
+CHECKPOINT_NAME = '.checkpoint.jsonl'
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w.-]+')
+
+# Workers start fresh instead of forking a process that is running generation threads
+_SPAWN = multiprocessing.get_context('spawn')
+
+
+class JobError(ValueError):
+    """Raised for an unusable job list"""
+
+
+@dataclass(frozen=True)
+class Job:
+    """One deck to generate"""
+    id: str
+    topic: str
+    slides: int = DEFAULT_SLIDE_COUNT
+    request: str = ''
+    mode: str = MODE_SINGLE
+    output: str = ''
+
+
+def job_inputs(job):
+    """Everything a job's generated slides depend on"""
+    return {'topic': job.topic, 'slides': job.slides, 'request': job.request, 'mode': job.mode}
+
+
+def slugify(text):
+    return _UNSAFE_FILENAME_CHARS.sub('_', text.strip().lower()).strip('_')[:80] or 'deck'
+
+
+def _read_rows(path):
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise JobError(f"{path}:{number}: invalid JSON: {e}") from e
+    elif path.endswith('.csv'):
+        with open(path, encoding='utf-8', newline='') as f:
+            for number, row in enumerate(csv.DictReader(f), 2):
+                yield number, {key.strip(): value for key, value in row.items() if key and value not in (None, '')}
+    else:
+        raise JobError(f"{path}: job lists must be .csv or .jsonl")
+
+
+def load_jobs(path, default_mode=MODE_SINGLE):
+    """Read and validate a job list; ids default to the topic and are made unique"""
+    jobs = []
+    seen = set()
+    for number, row in _read_rows(path):
+        topic = str(row.get('topic') or '').strip()
+        if not topic:
+            raise JobError(f"{path}:{number}: 'topic' is required")
+        mode = row.get('mode') or default_mode
+        if mode not in BULK_MODES:
+            raise JobError(f"{path}:{number}: mode must be one of {', '.join(BULK_MODES)}, not {mode!r}")
+        try:
+            slides = int(row.get('slides') or DEFAULT_SLIDE_COUNT)
+        except ValueError:
+            raise JobError(f"{path}:{number}: 'slides' must be a number") from None
+
+        output = str(row.get('output') or '')
+        if output and (os.path.basename(output) != output or output in ('.', '..')):
+            raise JobError(f"{path}:{number}: 'output' must be a file name, not a path: {output!r}")
+
+        base = slugify(str(row.get('id') or topic))
+        job_id, suffix = base, 2
+        while job_id in seen:
+            job_id, suffix = f"{base}_{suffix}", suffix + 1
+        seen.add(job_id)
+        jobs.append(Job(job_id, topic, slides, str(row.get('request') or ''), mode, output or f"{job_id}.pptx"))
+    return jobs
+
+
+class Checkpoint:
+    """Append-only JSONL log of job progress; the last record per job wins"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self):
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
+                records[record['id']] = record
+        return records
+
+    def record(self, job_id, stage, **fields):
+        line = json.dumps(dict(fields, id=job_id, stage=stage), ensure_ascii=False)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def build_deck(topic, structure, path):
+    """Build and save one deck; runs in a worker process"""
+    start = time.perf_counter()
+    chatbot = PowerPointChatbot()  # the model client is never touched here
+    chatbot.create_presentation(topic, structure)
+    data = chatbot.get_pptx_bytes()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    # A crash never leaves a truncated deck behind that looks finished
+    os.replace(tmp_path, path)
+    return len(data), time.perf_counter() - start
+
+
+class BulkRunner:
+    """Generate structures on threads and assemble decks in processes"""
+
+    def __init__(self, chatbot, out_dir, concurrency=4, processes=None, checkpoint_path=None, progress=None):
+        self.chatbot = chatbot
+        self.out_dir = out_dir
+        self.concurrency = concurrency
+        self.processes = processes or os.cpu_count() or 1
+        self.checkpoint = Checkpoint(checkpoint_path or os.path.join(out_dir, CHECKPOINT_NAME))
+        self.progress = progress
+
+    def generate(self, job):
+        """Ask the model for the job's slides (the chatbot's deck is not touched)"""
+        start = time.perf_counter()
+        prompt = build_create_prompt(job.topic, job.slides, job.request)
+        outline = []
+        if job.mode == MODE_JSON:
+            structure = self.chatbot.generate_structure(prompt, outline=outline)
+        else:
+            structure = self.chatbot.parse_presentation_structure(self.chatbot.generate_text(prompt), outline)
+        # Both parsers fall back to the placeholder deck; in bulk that is a failure, not a deck
+        if not structure or structure == DEFAULT_SLIDE_STRUCTURE:
+            raise ValueError("the model's answer contained no usable slides")
+        structure, _ = self.chatbot.repair_structure(
+            job.topic, structure, job.slides, build_requirements(job.request), outline
+        )
+        return structure, time.perf_counter() - start
+
+    def _report(self, event, job, **details):
+        if self.progress is not None:
+            self.progress(event, job, details)
+
+    def run(self, jobs):
+        """Run every job not already done; returns counts and the failed job ids"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        previous = self.checkpoint.load()
+        started = time.perf_counter()
+        summary = {'total': len(jobs), 'skipped': 0, 'done': 0, 'failed': 0, 'resumed': 0, 'errors': {}}
+
+        to_generate, to_build = [], []
+        for job in jobs:
+            record = previous.get(job.id, {})
+            path = os.path.join(self.out_dir, job.output)
+            current = record.get('inputs') == job_inputs(job)
+            if record.get('stage') == 'done' and current and os.path.exists(path):
+                summary['skipped'] += 1
+                self._report('skipped', job, output=path)
+            elif record.get('slides') is not None and current:
+                # Generated, or generated and then failed to build
+                summary['resumed'] += 1
+                to_build.append((job, record['slides']))
+            else:
+                to_generate.append(job)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as threads, \
+                ProcessPoolExecutor(max_workers=max(1, self.processes), mp_context=_SPAWN) as processes:
+            pending = {}
+
+            def submit_build(job, structure):
+                path = os.path.join(self.out_dir, job.output)
+                pending[processes.submit(build_deck, job.topic, structure, path)] = ('build', job, structure)
+
+            for job, structure in to_build:
+                submit_build(job, structure)
+            for job in to_generate:
+                pending[threads.submit(self.generate, job)] = ('generate', job, None)
+
+            # Assembly of one deck overlaps with generation of the others
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, job, structure = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        summary['failed'] += 1
+                        summary['errors'][job.id] = f"{stage}: {e}"
+                        # A failed build keeps its slides, so a rerun only retries the build
+                        kept = {'inputs': job_inputs(job), 'slides': structure} if structure is not None else {}
+                        self.checkpoint.record(job.id, 'failed', topic=job.topic, error=f"{stage}: {e}", **kept)
+                        self._report('failed', job, stage=stage, error=str(e))
+                        continue
+
+                    if stage == 'generate':
+                        structure, seconds = result
+                        self.checkpoint.record(job.id, 'generated', topic=job.topic, inputs=job_inputs(job),
+                                               slides=structure)
+                        self._report('generated', job, slides=len(structure), seconds=seconds)
+                        submit_build(job, structure)
+                    else:
+                        size, seconds = result
+                        path = os.path.join(self.out_dir, job.output)
+                        self.checkpoint.record(job.id, 'done', topic=job.topic, inputs=job_inputs(job),
+                                               output=path, bytes=size)
+                        summary['done'] += 1
+                        self._report('done', job, output=path, bytes=size, seconds=seconds)
+
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        return summary
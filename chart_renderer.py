@@ -0,0 +1,128 @@
+"""Chart rendering for chart slides.
+
+Charts are drawn with matplotlib's object-oriented ``Figure`` API, so no
+pyplot global state is touched and renders are safe from Streamlit's
+worker threads. PNG bytes are cached by chart data, type, size and DPI,
+so adding the same chart again costs a dictionary lookup.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+DEFAULT_FIGSIZE = (10, 6)
+
+# 300 dpi on a 10x6 figure is a 3000x1800 PNG for an image shown at 8x6 inches;
+# 150 dpi is already sharper than a projector or a full-screen slide can show.
+DEFAULT_DPI = 150
+
+
+class ChartRenderer:
+    """Render charts to PNG bytes with an LRU cache in front"""
+
+    def __init__(self, dpi=DEFAULT_DPI, figsize=DEFAULT_FIGSIZE, max_entries=64,
+                 max_bytes=64 * 1024 * 1024):
+        self.dpi = dpi
+        self.figsize = figsize
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._cache = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """Create a renderer configured by CHART_DPI / CHART_CACHE_ENTRIES"""
+        return cls(
+            dpi=int(os.getenv("CHART_DPI", str(DEFAULT_DPI))),
+            max_entries=int(os.getenv("CHART_CACHE_ENTRIES", "64")),
+        )
+
+    def _cache_key(self, chart_data, chart_type, figsize, dpi):
+        payload = json.dumps(
+            {
+                'title': chart_data.get('title', 'Chart'),
+                'labels': list(chart_data['labels']),
+                'values': [float(value) for value in chart_data['values']],
+                'type': chart_type,
+                'figsize': list(figsize),
+                'dpi': dpi,
+            },
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def render(self, chart_data, chart_type="bar", dpi=None, figsize=None):
+        """Return the chart as PNG bytes, rendering it only on a cache miss"""
+        dpi = dpi or self.dpi
+        figsize = tuple(figsize or self.figsize)
+        key = self._cache_key(chart_data, chart_type, figsize, dpi)
+
+        with self._lock:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+
+        png = self._draw(chart_data, chart_type, figsize, dpi)
+
+        with self._lock:
+            if key not in self._cache and len(png) <= self.max_bytes:
+                self._cache[key] = png
+                self._bytes += len(png)
+                while len(self._cache) > self.max_entries or self._bytes > self.max_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return png
+
+    def _draw(self, chart_data, chart_type, figsize, dpi):
+        # Imported on first render: matplotlib is the slowest import of a chart-free session
+        from matplotlib.figure import Figure
+
+        # A standalone Figure has its own canvas, independent of pyplot state
+        fig = Figure(figsize=figsize)
+        ax = fig.subplots()
+
+        if chart_type == "bar":
+            ax.bar(chart_data['labels'], chart_data['values'])
+        elif chart_type == "line":
+            ax.plot(chart_data['labels'], chart_data['values'])
+        elif chart_type == "pie":
+            ax.pie(chart_data['values'], labels=chart_data['labels'], autopct='%1.1f%%')
+
+        ax.set_title(chart_data.get('title', 'Chart'))
+
+        img_buffer = BytesIO()
+        fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=dpi)
+        return img_buffer.getvalue()
+
+    def stats(self):
+        """Return cache hit/miss counters and size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._cache),
+                'bytes': self._bytes,
+            }
+
+
+_shared_renderer = None
+_shared_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer():
+    """Return the process-wide renderer, creating it on first use"""
+    global _shared_renderer
+    if _shared_renderer is None:
+        with _shared_renderer_lock:
+            if _shared_renderer is None:
+                _shared_renderer = ChartRenderer.from_env()
+    return _shared_renderer
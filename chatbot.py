@@ -0,0 +1,1564 @@
+"""The ``PowerPointChatbot``: deck building, editing and model calls.
+
+Kept free of Streamlit so the UI in ``app.py``, the service layer in
+``deck_service.py`` and the benchmarks can all share it.
+"""
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+from pptx.oxml.ns import qn
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import logging
+import random
+import re
+from gemini_client import GeminiClient, get_shared_client
+from slide_factory import append_slide, get_slide_factory
+from chart_renderer import get_chart_renderer
+from deck_serializer import IncrementalSaver
+from deck_loader import open_presentation
+from slide_index import SlideIndex
+from session_store import estimate_presentation_memory
+from version_history import VersionHistory, bind_slides
+from metrics import METRICS
+from deck_schema import DeckSchemaError, JSON_GENERATION_CONFIG, JSON_INSTRUCTIONS, PARSE_STATS, parse_deck_json
+from native_charts import add_native_chart, build_chart_data
+from deck_repair import GAP_SHORT, RepairPlan, build_repair_prompt
+from intent_router import DEFAULT_SLIDE_COUNT, extract_topic, extract_slide_count, extract_slide_number
+
+logger = logging.getLogger(__name__)
+
+# "# Slide 3: New Title" headings in batch edit responses
+BATCH_SLIDE_HEADING = re.compile(r'^slide\s+(\d+)\s*[:.\-–]\s*(.*)$', re.IGNORECASE)
+
+# Shape name prefix of the content slides' randomly placed dots
+DECORATIVE_DOT_NAME = "Decorative dot"
+
+# Fallback structure used when the AI response contains no parsable slides
+DEFAULT_SLIDE_STRUCTURE = [
+    {
+        'title': 'Main Topic',
+        'content': [
+            'Key point about the topic',
+            'Important benefits and applications',
+            'Current trends and developments',
+            'Future opportunities and challenges'
+        ]
+    }
+]
+
+
+class StreamingStructureParser:
+    """Incrementally parse a markdown deck outline as text chunks arrive.
+
+    Text is buffered until a full line is available, so a slide is only
+    emitted once the next ``# Title`` heading (or the end of the stream)
+    proves it is finished.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.current_slide = None
+        self.slides = []
+        # Every heading in order, including slides dropped for having no points
+        self.outline = []
+
+    def feed(self, text):
+        """Consume a chunk of text and return the slides it completed"""
+        self.buffer += text
+        completed = []
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            finished = self._parse_line(line)
+            if finished:
+                completed.append(finished)
+        return completed
+
+    def close(self):
+        """Flush any buffered text and return the remaining finished slides"""
+        completed = []
+        if self.buffer:
+            finished = self._parse_line(self.buffer)
+            self.buffer = ""
+            if finished:
+                completed.append(finished)
+        
+        # Add the last slide
+        if self.current_slide and self.current_slide.get('content'):
+            completed.append(self._finish_slide(self.current_slide))
+        self.current_slide = None
+        return completed
+
+    def _finish_slide(self, slide):
+        self.slides.append(slide)
+        logger.debug("Parsed slide %r with %d points", slide['title'], len(slide['content']))
+        return slide
+
+    def _parse_line(self, line):
+        """Parse a single line, returning a slide if the line completed one"""
+        line = line.strip()
+        finished = None
+        
+        # Check for slide titles (starting with # or ##)
+        if line.startswith('# ') or line.startswith('## '):
+            # Save previous slide if it exists
+            if self.current_slide and self.current_slide.get('content'):
+                finished = self._finish_slide(self.current_slide)
+            
+            # Start new slide
+            title = line.replace('# ', '').replace('## ', '').strip()
+            self.current_slide = {
+                'title': title,
+                'content': []
+            }
+            self.outline.append(self.current_slide)
+        
+        # Check for bullet points
+        elif line.startswith(('- ', '* ', '• ')):
+            if self.current_slide:
+                content_point = line.replace('- ', '').replace('* ', '').replace('• ', '').strip()
+                if content_point and len(content_point) > 3:  # Only meaningful content
+                    self.current_slide['content'].append(content_point)
+        
+        # Handle regular text lines as content (but avoid very short lines)
+        elif line and self.current_slide and not line.startswith('#') and len(line) > 10:
+            self.current_slide['content'].append(line)
+        
+        return finished
+
+
+_R_NAMESPACE = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def _remap_relationship_ids(element, r_ids):
+    """Point ``r:id`` / ``r:embed`` / ... attributes at the copied relationships"""
+    for node in element.iter():
+        for name, value in node.attrib.items():
+            if name.startswith(_R_NAMESPACE) and value in r_ids:
+                node.set(name, r_ids[value])
+
+
+class PowerPointChatbot:
+    def __init__(self, client=None):
+        # The model client is shared process-wide; only the deck is per-session state
+        self.client = client
+        self.current_ppt = None
+    
+    @property
+    def client(self):
+        # Resolved on first use, so deck-only work (e.g. bulk assembly workers) never configures Gemini
+        if self._client is None:
+            self._client = get_shared_client()
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+    
+    @property
+    def current_ppt(self):
+        if self._current_ppt is None and self._stored_digest is not None:
+            self._reload()
+        return self._current_ppt
+    
+    @current_ppt.setter
+    def current_ppt(self, prs):
+        # A different deck starts a fresh incremental saver and slide index
+        self._current_ppt = prs
+        self._saver = IncrementalSaver()
+        self.slide_index = SlideIndex(prs) if prs is not None else None
+        self._memory_estimate = None
+        # Blob in a session store holding exactly this deck, while it is unedited
+        self._stored_digest = None
+        self._blob_store = None
+        self.history = VersionHistory()
+    
+    def _begin_change(self, label, slide=None):
+        """Keep what an edit is about to change, for undo; pass the slide it edits, or None for the slide list"""
+        self.history.begin(self._current_ppt, label, slide.part if slide is not None else None)
+    
+    def _abort_change(self):
+        """Put back whatever a failed edit changed after ``_begin_change``, and forget the change"""
+        for part in self.history.rollback(self._current_ppt):
+            self._saver.touch(part)
+            self.slide_index.touch(part)
+        self.slide_index.touch()
+    
+    def mark_dirty(self, slide=None):
+        """Record that the deck changed; pass the edited slide so only it is re-serialized"""
+        part = slide.part if slide is not None else None
+        self._saver.touch(part)
+        if self.slide_index is not None:
+            self.slide_index.touch(part)
+        self._memory_estimate = None
+        self._stored_digest = None
+        self.history.commit(self._current_ppt, part)
+    
+    def checkout(self, version):
+        """Restore the deck to a version from ``history.versions()``"""
+        if not self.current_ppt:
+            return False
+        restored = self.history.checkout(self._current_ppt, version)
+        for part in restored:
+            self._saver.touch(part)
+            self.slide_index.touch(part)
+        self._saver.touch()
+        self.slide_index.touch()
+        self._memory_estimate = None
+        self._stored_digest = None
+        return True
+    
+    def undo(self):
+        """Go back one version; False when there is nothing to undo"""
+        return self.history.can_undo and self.checkout(self.history.position - 1)
+    
+    def redo(self):
+        """Re-apply the version that was last undone"""
+        return self.history.can_redo and self.checkout(self.history.position + 1)
+    
+    @property
+    def deck_resident(self):
+        return self._current_ppt is not None
+    
+    @property
+    def deck_offloaded(self):
+        return self._current_ppt is None and self._stored_digest is not None
+    
+    @property
+    def stored_digest(self):
+        return self._stored_digest
+    
+    def offload(self, blob_store):
+        """Move the deck out of memory into ``blob_store``; it is reloaded on next access.
+
+        An unedited deck that came from the same store is not written again.
+        Returns the digest of the stored deck.
+        """
+        if self._current_ppt is None:
+            return self._stored_digest
+        if self._stored_digest is None or self._blob_store is not blob_store:
+            digest = blob_store.put(self.get_pptx_bytes())
+        else:
+            digest = self._stored_digest
+        # Version history is kept by partname, so it carries over to the reloaded deck
+        history = self.history
+        history.seal()
+        self.current_ppt = None
+        self.history = history
+        self._stored_digest = digest
+        self._blob_store = blob_store
+        return digest
+    
+    @METRICS.timed('reload')
+    def _reload(self):
+        digest, blob_store, history = self._stored_digest, self._blob_store, self.history
+        data = blob_store.get(digest)
+        self.current_ppt = bind_slides(open_presentation(data))
+        self.history = history
+        # Unchanged, so the stored bytes are also the next download
+        self._saver.prime(data)
+        self._stored_digest = digest
+        self._blob_store = blob_store
+    
+    def memory_usage(self):
+        """Approximate bytes this deck holds in memory: the loaded tree and the save cache"""
+        history = self.history.memory_bytes()
+        if self._current_ppt is None:
+            return {'deck': 0, 'save_cache': 0, 'history': history, 'total': history}
+        if self._memory_estimate is None:
+            self._memory_estimate = estimate_presentation_memory(self._current_ppt)
+        save_cache = self._saver.memory_bytes()
+        return {
+            'deck': self._memory_estimate,
+            'save_cache': save_cache,
+            'history': history,
+            'total': self._memory_estimate + save_cache + history,
+        }
+    
+    @property
+    def model(self):
+        return self.client.model
+    
+    @model.setter
+    def model(self, model):
+        # Swapping the model (e.g. for a fake one) must not touch the shared client
+        self.client = GeminiClient(model=model)
+    
+    @property
+    def response_cache(self):
+        return self.client.response_cache
+        
+    @METRICS.timed('deck_build')
+    def create_presentation(self, title, content_structure):
+        """Create a new PowerPoint presentation with professional design"""
+        prs = Presentation()
+        
+        # Create title slide with enhanced styling
+        self.create_title_slide(prs, title)
+        
+        # Add content slides based on structure
+        for i, slide_data in enumerate(content_structure):
+            self.add_content_slide(prs, slide_data, i)
+        
+        # Add conclusion slide
+        self.add_conclusion_slide(prs, title)
+            
+        self.current_ppt = prs
+        return prs
+    
+    def create_presentation_streaming(self, title, slide_stream, on_slide=None):
+        """Create a presentation from a stream of slides, building each slide as it arrives.
+
+        ``on_slide(index, slide_data)`` is called after every content slide is added
+        so the UI can show progress. Returns the presentation and the slides used.
+        """
+        prs = Presentation()
+        self.create_title_slide(prs, title)
+        
+        content_structure = []
+        for i, slide_data in enumerate(slide_stream):
+            self.add_content_slide(prs, slide_data, i)
+            content_structure.append(slide_data)
+            if on_slide:
+                on_slide(i, slide_data)
+        
+        self.add_conclusion_slide(prs, title)
+        
+        self.current_ppt = prs
+        return prs, content_structure
+    
+    @METRICS.timed('prompt_build')
+    def build_outline_prompt(self, topic, slide_count, requirements=""):
+        """Prompt for stage 1 of the pipeline: the slide titles only"""
+        return f"""
+        Create an outline for a professional presentation about "{topic}".
+        {requirements}
+        
+        Return the slide titles only, EXACTLY {slide_count} slides, one per line, formatted as:
+        
+        # Slide Title 1
+        # Slide Title 2
+        
+        Do not include bullet points or any other text.
+        """
+    
+    def generate_outline(self, topic, slide_count, requirements=""):
+        """Stage 1 of the pipeline: ask only for the slide titles"""
+        response_text = self.generate_text(self.build_outline_prompt(topic, slide_count, requirements))
+        
+        titles = []
+        for line in response_text.split('\n'):
+            line = line.strip()
+            if line.startswith('# ') or line.startswith('## '):
+                title = line.replace('# ', '').replace('## ', '').strip()
+                if title:
+                    titles.append(title)
+        return titles[:slide_count]
+    
+    @METRICS.timed('prompt_build')
+    def build_slide_prompt(self, topic, slide_title, outline=None):
+        """Prompt for stage 2 of the pipeline: the bullet points of one slide"""
+        other_titles = ", ".join(t for t in (outline or []) if t != slide_title)
+        return f"""
+        You are writing one slide of a presentation about "{topic}".
+        {f"Other slides in the deck: {other_titles}" if other_titles else ""}
+        
+        Write the bullet points for the slide titled "{slide_title}".
+        
+        Requirements:
+        - 3-5 bullet points
+        - Each bullet point is ONE clear, complete sentence of 10-25 words
+        - Do not repeat content that belongs on the other slides
+        
+        Format every bullet point as a line starting with "- ".
+        """
+    
+    def generate_slide_content(self, topic, slide_title, outline=None, retries=2):
+        """Stage 2 of the pipeline: generate the bullet points for one slide.
+
+        Retries up to ``retries`` extra times on errors or empty responses and
+        returns None if the slide still could not be generated.
+        """
+        slide_prompt = self.build_slide_prompt(topic, slide_title, outline)
+        
+        for attempt in range(retries + 1):
+            try:
+                response_text = self.generate_text(slide_prompt)
+            except Exception as e:
+                logger.warning("Error generating slide %r (attempt %d): %s", slide_title, attempt + 1, e)
+                continue
+            
+            parser = StreamingStructureParser()
+            parser.feed(f"# {slide_title}\n{response_text}")
+            parser.close()
+            content = [point for slide in parser.slides for point in slide['content']]
+            if content:
+                return {'title': slide_title, 'content': content[:5]}
+        
+        return None
+    
+    def create_presentation_pipeline(self, topic, slide_count, requirements="",
+                                     max_workers=4, retries=2, on_slide=None):
+        """Create a presentation with an outline call followed by concurrent per-slide calls.
+
+        Slides are generated on a bounded thread pool and assembled in outline order
+        as soon as each one (and every slide before it) is ready. Slides that still
+        fail after ``retries`` are skipped instead of failing the whole deck.
+        Returns the presentation, the slides used and the titles that failed.
+        """
+        outline = self.generate_outline(topic, slide_count, requirements)
+        if not outline:
+            return None, [], []
+        
+        failed_titles = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(self.generate_slide_content, topic, title, outline, retries)
+                for title in outline
+            ]
+            
+            def completed_slides():
+                for title, future in zip(outline, futures):
+                    slide_data = future.result()
+                    if slide_data:
+                        yield slide_data
+                    else:
+                        failed_titles.append(title)
+            
+            prs, content_structure = self.create_presentation_streaming(
+                topic, completed_slides(), on_slide=on_slide
+            )
+        
+        return prs, content_structure, failed_titles
+    
+    def create_title_slide(self, prs, title):
+        """Create an enhanced title slide with professional design"""
+        title_slide_layout = prs.slide_layouts[0]
+        slide = append_slide(prs, title_slide_layout)
+        
+        # Set slide background to professional blue gradient
+        background = slide.background
+        fill = background.fill
+        fill.gradient()
+        fill.gradient_stops[0].color.rgb = RGBColor(41, 98, 255)  # Light blue
+        fill.gradient_stops[1].color.rgb = RGBColor(0, 56, 168)   # Dark blue
+        
+        # Set title with enhanced styling
+        title_shape = slide.shapes.title
+        title_shape.text = title.upper()  # Make title uppercase for impact
+        
+        # Style the title
+        title_paragraph = title_shape.text_frame.paragraphs[0]
+        title_paragraph.font.size = Pt(48)
+        title_paragraph.font.bold = True
+        title_paragraph.font.color.rgb = RGBColor(255, 255, 255)  # White text
+        title_paragraph.alignment = PP_ALIGN.CENTER
+        
+        # Position title higher on slide
+        title_shape.top = Inches(2.5)
+        title_shape.left = Inches(1)
+        title_shape.width = Inches(8)
+        title_shape.height = Inches(2)
+        
+        # Add subtitle with professional styling
+        if len(slide.placeholders) > 1:
+            subtitle_shape = slide.placeholders[1]
+            subtitle_shape.text = "AI-Powered Presentation"
+            subtitle_paragraph = subtitle_shape.text_frame.paragraphs[0]
+            subtitle_paragraph.font.size = Pt(24)
+            subtitle_paragraph.font.color.rgb = RGBColor(200, 220, 255)  # Light blue text
+            subtitle_paragraph.alignment = PP_ALIGN.CENTER
+            
+            # Position subtitle
+            subtitle_shape.top = Inches(5)
+            subtitle_shape.left = Inches(1)
+            subtitle_shape.width = Inches(8)
+        
+        # Add decorative elements - blue accent bars
+        self.add_decorative_elements_title(slide)
+    
+    def add_decorative_elements_title(self, slide):
+        """Add decorative elements to title slide"""
+        # Add geometric shapes similar to the second image
+        # Left side decorative elements
+        for i in range(3):
+            left = Inches(0.5 + i * 0.3)
+            top = Inches(1 + i * 0.8)
+            width = Inches(0.2)
+            height = Inches(0.2)
+            
+            shape = slide.shapes.add_shape(
+                MSO_SHAPE.OVAL,
+                left, top, width, height
+            )
+            
+            fill = shape.fill
+            fill.solid()
+            fill.fore_color.rgb = RGBColor(100, 200, 255)  # Light blue circles
+            line = shape.line
+            line.fill.background()
+        
+        # Right side decorative elements
+        for i in range(3):
+            left = Inches(8.5 + i * 0.3)
+            top = Inches(1.5 + i * 0.6)
+            width = Inches(0.15)
+            height = Inches(0.15)
+            
+            shape = slide.shapes.add_shape(
+                MSO_SHAPE.OVAL,
+                left, top, width, height
+            )
+            
+            fill = shape.fill
+            fill.solid()
+            fill.fore_color.rgb = RGBColor(150, 220, 255)  # Lighter blue circles
+            line = shape.line
+            line.fill.background()
+
+    @staticmethod
+    def format_bullet_point(point):
+        """Clean a content point and make sure it carries a bullet marker"""
+        clean_point = str(point).strip()
+        if clean_point and not clean_point.startswith(('•', '-', '*')):
+            clean_point = f"• {clean_point}"
+        return clean_point
+    
+    @METRICS.timed('slide_build')
+    def add_content_slide(self, prs, slide_data, slide_index=0):
+        """Add a professionally styled content slide matching the blue theme.
+
+        Only the first content slide of a deck is styled property by property;
+        later ones are cloned from it by the slide factory and just get their text.
+        """
+        content = slide_data.get('content', [])
+        return get_slide_factory(prs).add_slide(
+            prs,
+            'content',
+            prs.slide_layouts[1],
+            slide_data.get('title', 'Slide Title').upper(),
+            [self.format_bullet_point(point) for point in content],
+            lambda: self._build_content_slide(prs, slide_data, slide_index),
+            refresh=self.scatter_decorative_dots
+        )
+    
+    @staticmethod
+    def scatter_decorative_dots(slide):
+        """Give a content slide's decorative dots random positions, sizes and shades.
+
+        Also called on every content slide cloned by the slide factory, so
+        each slide gets its own pattern instead of repeating the first one's.
+        """
+        # Straight on the XML: proxies for every shape would cost more than the clone saves
+        dots = [c_nv_pr.getparent().getparent() for c_nv_pr in slide._element.cSld.spTree.iter(qn('p:cNvPr'))
+                if c_nv_pr.get('name', '').startswith(DECORATIVE_DOT_NAME)]
+        for i, sp in enumerate(dots):
+            offset, extent = sp.find(f"{qn('p:spPr')}/{qn('a:xfrm')}")
+            offset.set('x', str(Inches(8.5 + random.uniform(-0.2, 0.3))))
+            offset.set('y', str(Inches(1 + i * 1.2 + random.uniform(-0.3, 0.3))))
+            extent.set('cx', str(Inches(0.1 + random.uniform(0, 0.1))))
+            extent.set('cy', str(Inches(0.1 + random.uniform(0, 0.1))))
+            alpha_values = [100, 150, 200]
+            blue_value = random.choice(alpha_values)
+            color = sp.find(f"{qn('p:spPr')}/{qn('a:solidFill')}/{qn('a:srgbClr')}")
+            color.set('val', str(RGBColor(blue_value, blue_value + 50, 255)))
+    
+    def _build_content_slide(self, prs, slide_data, slide_index=0):
+        """Style a content slide from scratch, returning the slide and its body shape"""
+        slide_layout = prs.slide_layouts[1]  # Title and Content layout
+        slide = append_slide(prs, slide_layout)
+        
+        # Set slide background with blue theme
+        background = slide.background
+        fill = background.fill
+        fill.gradient()
+        fill.gradient_stops[0].color.rgb = RGBColor(240, 248, 255)  # Very light blue
+        fill.gradient_stops[1].color.rgb = RGBColor(220, 240, 255)  # Light blue
+        
+        # Set title with enhanced styling to match theme
+        title_shape = slide.shapes.title
+        title_shape.text = slide_data.get('title', 'Slide Title').upper()
+        
+        # Style the title with blue theme
+        title_paragraph = title_shape.text_frame.paragraphs[0]
+        title_paragraph.font.size = Pt(40)
+        title_paragraph.font.bold = True
+        title_paragraph.font.color.rgb = RGBColor(0, 56, 168)  # Dark blue
+        title_paragraph.alignment = PP_ALIGN.LEFT
+        
+        # Position title (adjusted to ensure good spacing)
+        title_shape.top = Inches(0.8)
+        title_shape.left = Inches(0.6)  # Moved slightly right to clear the blue bar
+        title_shape.width = Inches(8.8)  # Made wider to use available space
+        title_shape.height = Inches(1.2)
+        
+        # Add content using the content placeholder (this is the key fix)
+        content = slide_data.get('content', [])
+        body_shape = None
+        if content and len(content) > 0:
+            # Use the built-in content placeholder
+            content_placeholder = None
+            for shape in slide.shapes:
+                if shape.is_placeholder:
+                    placeholder_format = shape.placeholder_format
+                    if placeholder_format.idx == 1:  # Content placeholder
+                        content_placeholder = shape
+                        break
+            
+            if content_placeholder:
+                body_shape = content_placeholder
+                
+                # Adjust content placeholder position to avoid blue bar overlap
+                content_placeholder.left = Inches(0.6)  # Move right to clear blue bar
+                content_placeholder.top = Inches(2.2)
+                content_placeholder.width = Inches(8.8)  # Use more available space
+                content_placeholder.height = Inches(4.5)
+                
+                # Clear and set up the text frame
+                text_frame = content_placeholder.text_frame
+                text_frame.clear()
+                
+                # Set text frame properties for better formatting
+                text_frame.margin_left = Inches(0.1)
+                text_frame.margin_right = Inches(0.1)
+                text_frame.margin_top = Inches(0.1)
+                text_frame.margin_bottom = Inches(0.1)
+                text_frame.word_wrap = True
+                
+                # Add each content point as a separate paragraph
+                for i, point in enumerate(content):
+                    # Create paragraph
+                    if i == 0:
+                        p = text_frame.paragraphs[0]
+                    else:
+                        p = text_frame.add_paragraph()
+                    
+                    # Clean up the content point
+                    clean_point = str(point).strip()
+                    if clean_point:
+                        # Ensure proper bullet formatting
+                        if not clean_point.startswith(('•', '-', '*')):
+                            clean_point = f"• {clean_point}"
+                        
+                        # Set the text
+                        p.text = clean_point
+                        p.level = 0
+                        
+                        # Apply formatting
+                        p.font.size = Pt(18)
+                        p.font.name = 'Calibri'
+                        p.font.color.rgb = RGBColor(51, 51, 51)  # Dark gray for readability
+                        p.space_after = Pt(12)
+                        p.space_before = Pt(6)
+                        p.alignment = PP_ALIGN.LEFT
+                        p.line_spacing = 1.15
+            else:
+                # Fallback: create a new text box if placeholder not found
+                left = Inches(0.6)  # Adjusted to clear the blue bar
+                top = Inches(2.2)
+                width = Inches(8.8)  # Made wider to use available space
+                height = Inches(4.5)
+                
+                text_box = slide.shapes.add_textbox(left, top, width, height)
+                body_shape = text_box
+                text_frame = text_box.text_frame
+                text_frame.clear()
+                
+                # Add content to text box
+                for i, point in enumerate(content):
+                    if i == 0:
+                        p = text_frame.paragraphs[0]
+                    else:
+                        p = text_frame.add_paragraph()
+                    
+                    clean_point = str(point).strip()
+                    if clean_point:
+                        if not clean_point.startswith(('•', '-', '*')):
+                            clean_point = f"• {clean_point}"
+                        
+                        p.text = clean_point
+                        p.level = 0
+                        p.font.size = Pt(18)
+                        p.font.name = 'Calibri'
+                        p.font.color.rgb = RGBColor(51, 51, 51)
+                        p.space_after = Pt(12)
+                        p.alignment = PP_ALIGN.LEFT
+        
+        # Add decorative blue accent bar (moved further left to avoid text overlap)
+        left = Inches(0.2)  # Moved much further left
+        top = Inches(0.8)
+        width = Inches(0.2)  # Made slightly wider for better visual impact
+        height = Inches(6)
+        
+        shape = slide.shapes.add_shape(
+            MSO_SHAPE.RECTANGLE,
+            left, top, width, height
+        )
+        
+        # Style the decorative element with blue gradient
+        fill = shape.fill
+        fill.gradient()
+        fill.gradient_stops[0].color.rgb = RGBColor(41, 98, 255)  # Light blue
+        fill.gradient_stops[1].color.rgb = RGBColor(0, 56, 168)   # Dark blue
+        
+        # Remove shape outline
+        line = shape.line
+        line.fill.background()
+        
+        # Add flowing decorative elements (circles and lines)
+        self.add_decorative_elements_content(slide)
+        
+        return slide, body_shape
+    
+    def add_decorative_elements_content(self, slide):
+        """Add flowing decorative elements to content slides"""
+        # Add flowing line elements (like in the second image)
+        
+        # Right side decorative flowing elements
+        for i in range(5):
+            shape = slide.shapes.add_shape(MSO_SHAPE.OVAL, 0, 0, 0, 0)
+            shape.name = f"{DECORATIVE_DOT_NAME} {i + 1}"
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = RGBColor(100, 150, 255)
+            line = shape.line
+            line.fill.background()
+        self.scatter_decorative_dots(slide)
+        
+        # Add connecting line elements
+        for i in range(3):
+            left = Inches(8.2)
+            top = Inches(2 + i * 1.5)
+            width = Inches(1.5)
+            height = Inches(0.05)
+            
+            shape = slide.shapes.add_shape(
+                MSO_SHAPE.RECTANGLE,
+                left, top, width, height
+            )
+            
+            fill = shape.fill
+            fill.solid()
+            fill.fore_color.rgb = RGBColor(150, 200, 255)  # Light blue lines
+            line = shape.line
+            line.fill.background()
+
+    def add_conclusion_slide(self, prs, title):
+        """Add a conclusion slide with blue theme"""
+        slide_layout = prs.slide_layouts[0]  # Title slide layout
+        slide = append_slide(prs, slide_layout)
+        
+        # Set slide background to professional blue gradient (same as title)
+        background = slide.background
+        fill = background.fill
+        fill.gradient()
+        fill.gradient_stops[0].color.rgb = RGBColor(41, 98, 255)  # Light blue
+        fill.gradient_stops[1].color.rgb = RGBColor(0, 56, 168)   # Dark blue
+        
+        # Set title
+        title_shape = slide.shapes.title
+        title_shape.text = "THANK YOU!"
+        
+        # Style the title
+        title_paragraph = title_shape.text_frame.paragraphs[0]
+        title_paragraph.font.size = Pt(54)
+        title_paragraph.font.bold = True
+        title_paragraph.font.color.rgb = RGBColor(255, 255, 255)  # White text
+        title_paragraph.alignment = PP_ALIGN.CENTER
+        
+        # Position title
+        title_shape.top = Inches(2.5)
+        title_shape.left = Inches(1)
+        title_shape.width = Inches(8)
+        title_shape.height = Inches(2)
+        
+        # Add subtitle
+        if len(slide.placeholders) > 1:
+            subtitle_shape = slide.placeholders[1]
+            subtitle_shape.text = f"Questions & Discussion\n\nPresentation: {title}"
+            subtitle_paragraph = subtitle_shape.text_frame.paragraphs[0]
+            subtitle_paragraph.font.size = Pt(24)
+            subtitle_paragraph.font.color.rgb = RGBColor(200, 220, 255)  # Light blue
+            subtitle_paragraph.alignment = PP_ALIGN.CENTER
+            
+            # Position subtitle
+            subtitle_shape.top = Inches(5)
+            subtitle_shape.left = Inches(1)
+            subtitle_shape.width = Inches(8)
+        
+        # Add decorative elements
+        self.add_decorative_elements_title(slide)
+    
+    @METRICS.timed('slide_edit')
+    def edit_slide_content(self, slide_index, new_content):
+        """Edit the content of a specific slide"""
+        if not self.current_ppt:
+            return False
+            
+        try:
+            slide = self.current_ppt.slides[slide_index]
+            self._begin_change(f"Edit slide {slide_index + 1}", slide)
+            
+            # Update title if provided
+            if 'title' in new_content:
+                slide.shapes.title.text = new_content['title']
+            
+            # Update content if provided
+            if 'content' in new_content:
+                # Find the content placeholder or text frame
+                content_updated = False
+                
+                for shape in slide.shapes:
+                    if shape.has_text_frame and shape != slide.shapes.title:
+                        text_frame = shape.text_frame
+                        text_frame.clear()
+                        
+                        # Add new content points
+                        for i, point in enumerate(new_content['content']):
+                            if point.strip():  # Only add non-empty content
+                                if i == 0:
+                                    p = text_frame.paragraphs[0]
+                                else:
+                                    p = text_frame.add_paragraph()
+                                
+                                # Clean and format the point
+                                clean_point = str(point).strip()
+                                if not clean_point.startswith(('•', '-', '*')):
+                                    clean_point = f"• {clean_point}"
+                                
+                                p.text = clean_point
+                                p.level = 0
+                                
+                                # Apply formatting
+                                p.font.size = Pt(18)
+                                p.font.name = 'Calibri'
+                                p.font.color.rgb = RGBColor(51, 51, 51)
+                        
+                        content_updated = True
+                        break
+                
+                # If no text frame found, create a new text box
+                if not content_updated:
+                    left = Inches(0.6)
+                    top = Inches(2.2)
+                    width = Inches(8.8)
+                    height = Inches(4.5)
+                    
+                    text_box = slide.shapes.add_textbox(left, top, width, height)
+                    text_frame = text_box.text_frame
+                    
+                    for i, point in enumerate(new_content['content']):
+                        if point.strip():
+                            if i == 0:
+                                p = text_frame.paragraphs[0]
+                            else:
+                                p = text_frame.add_paragraph()
+                            
+                            clean_point = str(point).strip()
+                            if not clean_point.startswith(('•', '-', '*')):
+                                clean_point = f"• {clean_point}"
+                            
+                            p.text = clean_point
+                            p.level = 0
+                            p.font.size = Pt(18)
+                            p.font.name = 'Calibri'
+                            p.font.color.rgb = RGBColor(51, 51, 51)
+            
+            self.mark_dirty(slide)
+            return True
+        except (IndexError, Exception):
+            logger.exception("Error editing slide %s", slide_index + 1)
+            self._abort_change()
+            return False
+
+    @staticmethod
+    def _body_text_frame(slide):
+        """The text frame holding a slide's bullet points (the one ``edit_slide_content`` rewrites)"""
+        title = slide.shapes.title
+        for shape in slide.shapes:
+            if shape.has_text_frame and shape != title:
+                return shape.text_frame
+        return None
+    
+    def _bullet_paragraphs(self, slide):
+        text_frame = self._body_text_frame(slide)
+        if text_frame is None:
+            return None, []
+        return text_frame, [p for p in text_frame.paragraphs if p.text.strip()]
+    
+    @staticmethod
+    def _set_paragraph_text(paragraph, text):
+        # Keep the first run and its font so the bullet looks like its neighbours
+        runs = paragraph.runs
+        if not runs:
+            paragraph.text = text
+            return
+        runs[0].text = text
+        for run in runs[1:]:
+            run._r.getparent().remove(run._r)
+    
+    @METRICS.timed('slide_edit')
+    def replace_bullet(self, slide_index, bullet_number, text):
+        """Replace the text of one bullet point, keeping its formatting"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            slide = self.current_ppt.slides[slide_index]
+            _, paragraphs = self._bullet_paragraphs(slide)
+            if not 1 <= bullet_number <= len(paragraphs):
+                return False
+            self._begin_change(f"Replace bullet {bullet_number} on slide {slide_index + 1}", slide)
+            self._set_paragraph_text(paragraphs[bullet_number - 1], self.format_bullet_point(text))
+            self.mark_dirty(slide)
+            return True
+        except Exception:
+            logger.exception("Error replacing bullet %s on slide %s", bullet_number, slide_index + 1)
+            self._abort_change()
+            return False
+    
+    @METRICS.timed('slide_edit')
+    def add_bullet(self, slide_index, text):
+        """Append a bullet point after the slide's last one, formatted like it"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            slide = self.current_ppt.slides[slide_index]
+            text_frame, paragraphs = self._bullet_paragraphs(slide)
+            if not paragraphs:
+                # Nothing to copy the formatting from: build the body the usual way
+                return self.edit_slide_content(slide_index, {'content': [text]})
+            self._begin_change(f"Add a bullet to slide {slide_index + 1}", slide)
+            last = paragraphs[-1]._p
+            new_p = copy.deepcopy(last)
+            last.addnext(new_p)
+            paragraph = next(p for p in text_frame.paragraphs if p._p is new_p)
+            self._set_paragraph_text(paragraph, self.format_bullet_point(text))
+            self.mark_dirty(slide)
+            return True
+        except Exception:
+            logger.exception("Error adding a bullet to slide %s", slide_index + 1)
+            self._abort_change()
+            return False
+    
+    @METRICS.timed('slide_edit')
+    def delete_bullet(self, slide_index, bullet_number):
+        """Remove one bullet point from a slide"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            slide = self.current_ppt.slides[slide_index]
+            text_frame, paragraphs = self._bullet_paragraphs(slide)
+            if not 1 <= bullet_number <= len(paragraphs):
+                return False
+            self._begin_change(f"Delete bullet {bullet_number} from slide {slide_index + 1}", slide)
+            p = paragraphs[bullet_number - 1]._p
+            if len(text_frame.paragraphs) > 1:
+                p.getparent().remove(p)
+            else:
+                # A text body needs at least one paragraph
+                self._set_paragraph_text(paragraphs[0], '')
+            self.mark_dirty(slide)
+            return True
+        except Exception:
+            logger.exception("Error deleting bullet %s from slide %s", bullet_number, slide_index + 1)
+            self._abort_change()
+            return False
+    
+    def move_slide(self, slide_index, new_index):
+        """Move a slide to ``new_index`` (0-based position in the final order)"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            sld_id_lst = self.current_ppt.slides._sldIdLst
+            sld_ids = list(sld_id_lst)
+            if not (0 <= slide_index < len(sld_ids) and 0 <= new_index < len(sld_ids)):
+                return False
+            self._begin_change(f"Move slide {slide_index + 1} to position {new_index + 1}")
+            sld_id = sld_ids[slide_index]
+            sld_id_lst.remove(sld_id)
+            sld_id_lst.insert(new_index, sld_id)
+            self.mark_dirty()
+            return True
+        except Exception:
+            logger.exception("Error moving slide %s", slide_index + 1)
+            self._abort_change()
+            return False
+    
+    def delete_slide(self, slide_index):
+        """Remove a slide; its part (and notes) drop out of the saved package"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            prs = self.current_ppt
+            sld_ids = list(prs.slides._sldIdLst)
+            if not 0 <= slide_index < len(sld_ids):
+                return False
+            self._begin_change(f"Delete slide {slide_index + 1}")
+            sld_id = sld_ids[slide_index]
+            prs.slides._sldIdLst.remove(sld_id)
+            prs.part.drop_rel(sld_id.rId)
+            self.mark_dirty()
+            return True
+        except Exception:
+            logger.exception("Error deleting slide %s", slide_index + 1)
+            self._abort_change()
+            return False
+    
+    @METRICS.timed('slide_build')
+    def duplicate_slide(self, slide_index):
+        """Copy a slide, pictures and charts included, to right after the original"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            prs = self.current_ppt
+            source = prs.slides[slide_index]
+            self._begin_change(f"Duplicate slide {slide_index + 1}")
+            duplicate = append_slide(prs, source.slide_layout, placeholders=False)
+            
+            # Relationships other than the layout (added above) and the notes
+            # (which point back at their own slide) carry over; media is shared
+            # and charts are cloned, since each chart owns its workbook
+            r_ids = {}
+            for rel in source.part.rels.values():
+                if rel.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE):
+                    continue
+                if rel.is_external:
+                    r_ids[rel.rId] = duplicate.part.rels.get_or_add_ext_rel(rel.reltype, rel.target_ref)
+                else:
+                    target = rel.target_part
+                    if rel.reltype == RT.CHART:
+                        target = self._clone_part(target)
+                    r_ids[rel.rId] = duplicate.part.rels.get_or_add(rel.reltype, target)
+            
+            element = duplicate._element
+            for child in list(element):
+                element.remove(child)
+            for child in source._element:
+                element.append(copy.deepcopy(child))
+            _remap_relationship_ids(element, r_ids)
+            
+            self.move_slide(len(prs.slides) - 1, slide_index + 1)
+            return True
+        except Exception:
+            logger.exception("Error duplicating slide %s", slide_index + 1)
+            self._abort_change()
+            return False
+    
+    def _clone_part(self, part):
+        """Copy a package part and everything it links to under fresh partnames"""
+        package = part.package
+        template = re.sub(r'\d*(\.\w+)$', r'%d\1', str(part.partname))
+        clone = type(part).load(package.next_partname(template), part.content_type, package, part.blob)
+        r_ids = {}
+        for rel in part.rels.values():
+            if rel.is_external:
+                r_ids[rel.rId] = clone.rels.get_or_add_ext_rel(rel.reltype, rel.target_ref)
+            else:
+                r_ids[rel.rId] = clone.rels.get_or_add(rel.reltype, self._clone_part(rel.target_part))
+        if r_ids and hasattr(clone, '_element'):
+            _remap_relationship_ids(clone._element, r_ids)
+        return clone
+
+    @METRICS.timed('prompt_build')
+    def build_batch_edit_prompt(self, request, slides):
+        """Build one edit prompt covering every ``{slide_number: current_content}`` in ``slides``"""
+        current = ""
+        for number, content in slides.items():
+            current += f"## Slide {number}\n"
+            current += f"Title: {content['title']}\n"
+            current += f"Content: {', '.join(content['content'])}\n\n"
+        
+        return f"""
+        The user wants to edit {len(slides)} slides of their presentation in one go.
+        
+        Current content of the slides to edit:
+        
+        {current}
+        User's editing request: "{request}"
+        
+        Generate new content for EVERY slide listed above based on the user's request.
+        Keep each slide's number exactly as given. Format your response as:
+        
+        # Slide <number>: New Slide Title
+        - Bullet point 1
+        - Bullet point 2
+        - Bullet point 3
+        - Bullet point 4
+        
+        Keep bullet points concise (10-25 words each) and professional.
+        """
+
+    def parse_batch_edit_response(self, ai_response, slide_numbers):
+        """Map a multi-slide edit response to ``{slide_number: new_content}``"""
+        parser = StreamingStructureParser()
+        parser.feed(ai_response)
+        parser.close()
+        
+        edits = {}
+        unnumbered = []
+        for slide in parser.slides:
+            match = BATCH_SLIDE_HEADING.match(slide['title'])
+            if match and int(match.group(1)) in slide_numbers:
+                new_content = {'content': slide['content']}
+                if match.group(2).strip():
+                    new_content['title'] = match.group(2).strip()
+                edits[int(match.group(1))] = new_content
+            else:
+                unnumbered.append(slide)
+        
+        # Sections without a usable "Slide N:" heading fill the remaining slides in order
+        remaining = [number for number in slide_numbers if number not in edits]
+        for number, slide in zip(remaining, unnumbered):
+            edits[number] = slide
+        return edits
+
+    def edit_slides_batch(self, slide_numbers, request):
+        """Edit several slides with a single model call.
+        
+        Returns ``(edits, missing)``: the applied ``{slide_number: new_content}``
+        and the requested slide numbers that do not exist or got no new content.
+        """
+        slides = {}
+        for number in slide_numbers:
+            content = self.get_slide_content(number)
+            if content:
+                slides[number] = content
+        if not slides:
+            return {}, list(slide_numbers)
+        
+        ai_response = self.generate_text(self.build_batch_edit_prompt(request, slides))
+        edits = self.parse_batch_edit_response(ai_response, list(slides))
+        
+        # Apply every edit in one pass (one undo step); the deck is serialized once, at download time
+        applied = {}
+        with self.history.group():
+            for number, new_content in edits.items():
+                if self.edit_slide_content(number - 1, new_content):
+                    applied[number] = new_content
+        
+        missing = [number for number in slide_numbers if number not in applied]
+        return applied, missing
+
+    @METRICS.timed('slide_build')
+    def add_new_slide(self, slide_content):
+        """Add a new slide to the existing presentation"""
+        if not self.current_ppt:
+            return False
+        
+        try:
+            prs = self.current_ppt
+            content = slide_content.get('content', [])
+            self._begin_change(f"Add slide: {slide_content.get('title', 'New Slide')}")
+            get_slide_factory(prs).add_slide(
+                prs,
+                'new',
+                prs.slide_layouts[1],
+                slide_content.get('title', 'New Slide').upper(),
+                [self.format_bullet_point(point) for point in content if point.strip()],
+                lambda: self._build_new_slide(prs, slide_content)
+            )
+            self.mark_dirty()
+            return True
+        except Exception:
+            logger.exception("Error adding new slide")
+            self._abort_change()
+            return False
+    
+    def _build_new_slide(self, prs, slide_content):
+        """Style an added slide from scratch, returning the slide and its body shape"""
+        # Use the content slide layout
+        slide_layout = prs.slide_layouts[1]  # Title and Content layout
+        slide = append_slide(prs, slide_layout)
+        
+        # Set slide background with blue theme
+        background = slide.background
+        fill = background.fill
+        fill.gradient()
+        fill.gradient_stops[0].color.rgb = RGBColor(240, 248, 255)  # Very light blue
+        fill.gradient_stops[1].color.rgb = RGBColor(220, 240, 255)  # Light blue
+        
+        # Set title
+        title_shape = slide.shapes.title
+        title_shape.text = slide_content.get('title', 'New Slide').upper()
+        
+        # Style the title
+        title_paragraph = title_shape.text_frame.paragraphs[0]
+        title_paragraph.font.size = Pt(40)
+        title_paragraph.font.bold = True
+        title_paragraph.font.color.rgb = RGBColor(0, 56, 168)  # Dark blue
+        title_paragraph.alignment = PP_ALIGN.LEFT
+        
+        # Position title
+        title_shape.top = Inches(0.8)
+        title_shape.left = Inches(0.6)
+        title_shape.width = Inches(8.8)
+        title_shape.height = Inches(1.2)
+        
+        # Add content
+        content = slide_content.get('content', [])
+        body_shape = None
+        if content:
+            # Find content placeholder
+            content_placeholder = None
+            for shape in slide.shapes:
+                if shape.is_placeholder:
+                    placeholder_format = shape.placeholder_format
+                    if placeholder_format.idx == 1:  # Content placeholder
+                        content_placeholder = shape
+                        break
+            
+            if content_placeholder:
+                body_shape = content_placeholder
+                
+                # Adjust content placeholder position
+                content_placeholder.left = Inches(0.6)
+                content_placeholder.top = Inches(2.2)
+                content_placeholder.width = Inches(8.8)
+                content_placeholder.height = Inches(4.5)
+                
+                text_frame = content_placeholder.text_frame
+                text_frame.clear()
+                
+                # Add content points
+                for i, point in enumerate(content):
+                    if point.strip():
+                        if i == 0:
+                            p = text_frame.paragraphs[0]
+                        else:
+                            p = text_frame.add_paragraph()
+                        
+                        clean_point = str(point).strip()
+                        if not clean_point.startswith(('•', '-', '*')):
+                            clean_point = f"• {clean_point}"
+                        
+                        p.text = clean_point
+                        p.level = 0
+                        p.font.size = Pt(18)
+                        p.font.name = 'Calibri'
+                        p.font.color.rgb = RGBColor(51, 51, 51)
+                        p.space_after = Pt(12)
+                        p.alignment = PP_ALIGN.LEFT
+        
+        # Add decorative blue accent bar
+        left = Inches(0.2)
+        top = Inches(0.8)
+        width = Inches(0.2)
+        height = Inches(5.5)
+        
+        accent_bar = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
+        fill = accent_bar.fill
+        fill.solid()
+        fill.fore_color.rgb = RGBColor(41, 98, 255)  # Blue accent
+        accent_bar.line.fill.background()
+        
+        
+        return slide, body_shape
+    
+    @METRICS.timed('chart_build')
+    def add_chart_slide(self, chart_data, chart_type="bar", dpi=None):
+        """Add a slide with a chart"""
+        if not self.current_ppt:
+            return False
+        
+        # Render the chart (cached by data, type, size and DPI) before the deck changes
+        png = get_chart_renderer().render(chart_data, chart_type, dpi=dpi)
+        
+        try:
+            self._begin_change(f"Add {chart_type} chart slide")
+            slide_layout = self.current_ppt.slide_layouts[5]  # Blank layout
+            slide = append_slide(self.current_ppt, slide_layout)
+            
+            # Add image to slide
+            left = Inches(1)
+            top = Inches(1)
+            width = Inches(8)
+            height = Inches(6)
+            
+            slide.shapes.add_picture(BytesIO(png), left, top, width, height)
+            self.mark_dirty()
+            return True
+        except Exception:
+            logger.exception("Error adding %s chart slide", chart_type)
+            self._abort_change()
+            return False
+    
+    @METRICS.timed('chart_build')
+    def add_native_chart_slide(self, chart_data, chart_type="bar"):
+        """Add a slide with an editable PowerPoint chart instead of a picture.
+
+        ``chart_data`` holds 'title', 'labels' and either 'values' (one series)
+        or 'series' ({name: values}) for multi-series charts, or a prepared
+        python-pptx ``CategoryChartData`` under 'chart_data'.
+        """
+        if not self.current_ppt:
+            return False
+        
+        pptx_chart_data = chart_data.get('chart_data')
+        if pptx_chart_data is None:
+            series = chart_data.get('series') or {chart_data.get('title', 'Series 1'): chart_data['values']}
+            pptx_chart_data = build_chart_data(chart_data['labels'], series)
+        
+        try:
+            self._begin_change(f"Add {chart_type} chart slide")
+            slide_layout = self.current_ppt.slide_layouts[5]  # Blank layout
+            slide = append_slide(self.current_ppt, slide_layout)
+            
+            add_native_chart(
+                slide, pptx_chart_data, chart_type, chart_data.get('title', 'Chart'),
+                Inches(1), Inches(1), Inches(8), Inches(6)
+            )
+            self.mark_dirty()
+            return True
+        except Exception:
+            logger.exception("Error adding native %s chart slide", chart_type)
+            self._abort_change()
+            return False
+    
+    def generate_text(self, prompt, generation_config=None, cache=True):
+        """Generate text with Gemini AI, serving repeated prompts from the response cache"""
+        return self.client.generate_text(prompt, generation_config, cache=cache)
+    
+    def generate_content_stream(self, prompt):
+        """Stream generated text from Gemini AI chunk by chunk"""
+        return self.client.generate_content_stream(prompt)
+    
+    def generate_content_with_ai(self, prompt):
+        """Generate content using Gemini AI"""
+        try:
+            return self.generate_text(prompt)
+        except Exception as e:
+            return f"Error generating content: {str(e)}"
+    
+    def extract_topic_from_prompt(self, prompt):
+        """Extract the main topic from user's presentation request."""
+        return extract_topic(prompt.lower().strip())
+
+    def extract_slide_count_from_prompt(self, prompt, default=DEFAULT_SLIDE_COUNT):
+        """Extract the number of slides requested from user's prompt; ``default`` if it names none."""
+        return extract_slide_count(prompt.lower(), default)
+
+    def extract_slide_number_from_prompt(self, prompt):
+        """Extract slide number from user's editing request."""
+        return extract_slide_number(prompt.lower())
+
+    def parse_presentation_structure(self, ai_response, outline=None):
+        """Parse AI response to extract presentation structure with proper formatting.
+        
+        Pass a list as ``outline`` to also receive every heading in order,
+        including slides dropped for having no bullet points (for ``repair_structure``).
+        """
+        PARSE_STATS.record('requests')
+        slides = self._parse_markdown(ai_response, outline)
+        
+        logger.debug("Parsed %d slides from a %d character response", len(slides), len(ai_response))
+        
+        # If no slides were parsed, create a default structure
+        if not slides:
+            logger.warning("No slides parsed, using the default structure")
+            PARSE_STATS.record('failures')
+            slides = [dict(slide, content=list(slide['content'])) for slide in DEFAULT_SLIDE_STRUCTURE]
+        else:
+            PARSE_STATS.record('markdown_parsed')
+        
+        return slides
+    
+    @METRICS.timed('parse')
+    def _parse_markdown(self, ai_response, outline=None):
+        parser = StreamingStructureParser()
+        parser.feed(ai_response)
+        parser.close()
+        if outline is not None:
+            outline.extend(parser.outline)
+        return parser.slides
+    
+    def generate_structure(self, prompt, retries=1, outline=None):
+        """Ask Gemini for a JSON deck description and validate it into slides.
+        
+        A response that does not match the schema is parsed as markdown
+        instead; if that finds no slides either, the request is repeated
+        (with the validation error) up to ``retries`` times before falling
+        back to the default structure. Pass a list as ``outline`` to accept
+        slides without bullet points instead of retrying: they are left out
+        of the result and listed in ``outline`` for ``repair_structure``.
+        """
+        PARSE_STATS.record('requests')
+        request = prompt + JSON_INSTRUCTIONS
+        for attempt in range(retries + 1):
+            if attempt:
+                PARSE_STATS.record('retries')
+            ai_response = self.generate_text(request, generation_config=JSON_GENERATION_CONFIG)
+            try:
+                with METRICS.time('parse'):
+                    slides = parse_deck_json(ai_response, allow_empty=outline is not None)
+                PARSE_STATS.record('json_parsed')
+                if outline is not None:
+                    outline.extend(slide.as_dict() for slide in slides)
+                return [slide.as_dict() for slide in slides if slide.content]
+            except DeckSchemaError as e:
+                error = e
+            
+            headings = []
+            slides = self._parse_markdown(ai_response, headings)
+            if slides:
+                PARSE_STATS.record('markdown_fallbacks')
+                if outline is not None:
+                    outline.extend(headings)
+                return slides
+            
+            # A changed prompt also keeps the retry from hitting the cached bad answer
+            request = f"{prompt}{JSON_INSTRUCTIONS}\nYour previous answer was rejected ({error}). Reply with valid JSON only.\n"
+        
+        PARSE_STATS.record('failures')
+        return [dict(slide, content=list(slide['content'])) for slide in DEFAULT_SLIDE_STRUCTURE]
+    
+    def iter_presentation_structure(self, chunks, outline=None):
+        """Yield slides from streamed AI text chunks as soon as each one is complete"""
+        PARSE_STATS.record('requests')
+        parser = StreamingStructureParser()
+        for chunk in chunks:
+            for slide in parser.feed(chunk):
+                yield slide
+        for slide in parser.close():
+            yield slide
+        
+        logger.debug("Streamed %d slides", len(parser.slides))
+        if outline is not None:
+            outline.extend(parser.outline)
+        
+        # If no slides were parsed, fall back to the default structure
+        if parser.slides:
+            PARSE_STATS.record('markdown_parsed')
+        else:
+            logger.warning("No slides parsed, using the default structure")
+            PARSE_STATS.record('failures')
+            for slide in DEFAULT_SLIDE_STRUCTURE:
+                yield dict(slide, content=list(slide['content']))
+    
+    def repair_structure(self, topic, slides, slide_count, requirements="", outline=None):
+        """Regenerate only the missing and short slides of a parsed answer, in one model call.
+        
+        ``outline`` (from ``parse_presentation_structure``) lets headings whose
+        bullet points went missing keep their title and place. With no
+        ``slide_count`` (the prompt set none) a deck is never padded, only its
+        short slides are regenerated. Returns the
+        completed slides and the ``(position, gap)`` of every slide filled in.
+        """
+        if not slides or slides == DEFAULT_SLIDE_STRUCTURE:
+            # Nothing usable came back; the placeholder deck is not worth completing
+            return slides, []
+        
+        plan = RepairPlan(outline or slides, slide_count)
+        if not plan.gaps:
+            return slides, []
+        
+        PARSE_STATS.record('repairs')
+        numbers = [gap.number for gap in plan.gaps]
+        try:
+            with METRICS.time('repair'):
+                response_text = self.generate_text(build_repair_prompt(topic, plan, requirements))
+                repaired = self.parse_batch_edit_response(response_text, numbers)
+        except Exception:
+            logger.exception("Error repairing slides %s", numbers)
+            repaired = {}
+        
+        slides, filled = plan.merge(repaired)
+        PARSE_STATS.record('repaired_slides', len(filled))
+        logger.info("Repaired %d of %d incomplete slides", len(filled), len(numbers))
+        return slides, filled
+    
+    def fill_presentation_gaps(self, slides, filled, on_slide=None):
+        """Put slides from ``repair_structure`` into the current (streamed) deck"""
+        if not filled:
+            return
+        prs = self.current_ppt
+        with self.history.group():
+            self._begin_change("Fill in missing slides")
+            # In position order, so every earlier slide is already in place; the title slide is at index 0
+            for position, gap in filled:
+                slide_data = slides[position - 1]
+                if gap.kind == GAP_SHORT:
+                    self.edit_slide_content(position, {'content': slide_data['content']})
+                else:
+                    self.add_content_slide(prs, slide_data, position - 1)
+                    self.move_slide(len(prs.slides) - 1, position)
+                if on_slide:
+                    on_slide(position - 1, slide_data)
+    
+    @METRICS.timed('save')
+    def get_pptx_bytes(self):
+        """Serialize the current presentation, reusing unchanged parts from the last save.
+
+        Nothing is serialized until this is called (e.g. when a download is
+        requested), and repeated calls without edits return the cached bytes.
+        """
+        if not self.current_ppt:
+            return None
+        return self._saver.save(self.current_ppt)
+    
+    def save_presentation(self, filename):
+        """Save the current presentation"""
+        if self.current_ppt:
+            return BytesIO(self.get_pptx_bytes())
+        return None
+
+    @METRICS.timed('load')
+    def load_presentation(self, source, use_mmap=None):
+        """Load a presentation from a file path, file object, bytes or memoryview"""
+        try:
+            self.current_ppt = open_presentation(source, use_mmap=use_mmap)
+            # Index every slide once up front; later turns only read the index
+            self.slide_index.entries()
+            return True
+        except Exception:
+            logger.exception("Error loading presentation")
+            return False
+
+    def get_slide_content(self, slide_number):
+        """Get content from a specific slide"""
+        try:
+            if not self.current_ppt or slide_number < 1:
+                return None
+            
+            entry = self.slide_index.entry(slide_number)
+            if entry is None:
+                return None
+            
+            return {
+                'title': entry.title if entry.title is not None else f"Slide {slide_number}",
+                'content': list(entry.paragraphs)
+            }
+        except Exception:
+            logger.exception("Error getting slide %s content", slide_number)
+            return None
+
+    def find_slide(self, query):
+        """Return the number of the slide that best matches ``query``, or None"""
+        if not self.current_ppt or not query:
+            return None
+        
+        try:
+            matches = self.slide_index.search(query, limit=1)
+            return matches[0][0] if matches else None
+        except Exception:
+            logger.exception("Error searching slides for %r", query)
+            return None
+
+    def get_presentation_summary(self):
+        """Get a summary of the current presentation"""
+        if not self.current_ppt:
+            return None
+        
+        try:
+            return self.slide_index.summary()
+        except Exception:
+            logger.exception("Error getting presentation summary")
+            return None
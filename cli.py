@@ -0,0 +1,234 @@
+"""Command line entry point: build and edit decks without the Streamlit UI.
+
+    python cli.py create "Digital Marketing Strategy" --slides 6 -o marketing.pptx
+    python cli.py edit marketing.pptx "make it more concise" --slide 3
+    python cli.py add marketing.pptx "a slide about budget allocation"
+    python cli.py view marketing.pptx --query pricing
+    python cli.py run -o deck.pptx "create a presentation about solar power" "edit slide 2 to focus on costs"
+    python cli.py bulk clients.csv --out-dir decks --rpm 60
+    python cli.py serve --port 8765
+
+``run`` applies chat prompts (arguments, or one per line from ``--file``)
+to one deck in order, exactly like the chat page. ``bulk`` builds one deck
+per row of a job list (see ``bulk_jobs.py``) and can be re-run to resume.
+Results are printed as JSON. ``--mock`` answers with ``MockGeminiModel``
+instead of Gemini, for trying things out offline.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from deck_service import DeckService, ServiceError, MODES, MODE_SINGLE
+from intent_router import DEFAULT_SLIDE_COUNT
+
+
+def make_client(mock=False, **overrides):
+    """The shared Gemini client, or a dedicated one when settings such as the rate limit are overridden"""
+    from gemini_client import GeminiClient, get_shared_client
+    if mock:
+        from mock_model import MockGeminiModel
+        return GeminiClient(model=MockGeminiModel(), **overrides)
+    if overrides:
+        from response_cache import ResponseCache
+        return GeminiClient.from_env(response_cache=ResponseCache.from_env(), **overrides)
+    return get_shared_client()
+
+
+def slide_list(text):
+    """``"1,3,5"`` or ``"2-4"`` -> tuple of slide numbers"""
+    numbers = []
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        numbers.extend(range(int(first), int(last or first) + 1))
+    return tuple(numbers)
+
+
+def emit(result):
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+def cmd_create(service, args):
+    result = service.create(args.topic, args.slides, request=args.request)
+    out = args.output or f"{args.topic.replace(' ', '_')}.pptx"
+    return dict(result, output=out, bytes=service.save(out))
+
+
+def cmd_edit(service, args):
+    service.load(args.deck)
+    if args.title is not None or args.content is not None:
+        result = service.set_slide(args.slide, title=args.title, content=args.content)
+    else:
+        if not args.request:
+            raise ServiceError("Give a request, or --title / --content for a direct edit")
+        result = service.edit(args.request, slide_number=args.slide, slide_query=args.query,
+                              slide_numbers=args.slides or ())
+    out = args.output or args.deck
+    return dict(result, output=out, bytes=service.save(out))
+
+
+def cmd_add(service, args):
+    service.load(args.deck)
+    result = service.add_slide(args.request)
+    out = args.output or args.deck
+    return dict(result, output=out, bytes=service.save(out))
+
+
+def cmd_view(service, args):
+    service.load(args.deck)
+    return service.view(args.slide, args.query)
+
+
+def cmd_run(service, args):
+    if args.deck:
+        service.load(args.deck)
+    prompts = list(args.prompts)
+    if args.file:
+        with (sys.stdin if args.file == '-' else open(args.file, encoding='utf-8')) as f:
+            prompts.extend(line.strip() for line in f if line.strip())
+
+    results = []
+    for prompt in prompts:
+        try:
+            results.append(dict(service.handle(prompt), prompt=prompt))
+        except ServiceError as e:
+            results.append({'prompt': prompt, 'error': str(e)})
+            if not args.keep_going:
+                break
+    summary = {'results': results}
+    if service.deck is not None and (args.output or args.deck):
+        out = args.output or args.deck
+        summary.update(output=out, bytes=service.save(out))
+    return summary
+
+
+def cmd_bulk(service, args):
+    from bulk_jobs import BulkRunner, JobError, load_jobs
+    try:
+        jobs = load_jobs(args.jobs, default_mode=service.mode)
+    except JobError as e:
+        raise ServiceError(str(e)) from e
+
+    finished = 0
+
+    def progress(event, job, details):
+        nonlocal finished
+        if event in ('done', 'failed', 'skipped'):
+            finished += 1
+        if event == 'generated':
+            message = f"{details['slides']} slides generated in {details['seconds']:.1f}s"
+        elif event == 'done':
+            message = f"saved {details['output']} ({details['bytes']} bytes, built in {details['seconds']:.1f}s)"
+        elif event == 'failed':
+            message = f"FAILED during {details['stage']}: {details['error']}"
+        else:
+            message = f"already done: {details['output']}"
+        print(f"[{finished}/{len(jobs)}] {job.id}: {message}", file=sys.stderr)
+
+    runner = BulkRunner(service.chatbot, args.out_dir, concurrency=args.concurrency,
+                        processes=args.processes, checkpoint_path=args.checkpoint, progress=progress)
+    summary = runner.run(jobs)
+    if summary['failed']:
+        print(f"{summary['failed']} job(s) failed; run the same command again to retry them", file=sys.stderr)
+    return summary
+
+
+def cmd_serve(service, args):
+    from deck_api import make_server
+    server = make_server(args.port, args.host, client=service.chatbot.client, mode=service.mode,
+                         max_decks=args.max_decks)
+    print(f"Serving the deck API on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=MODES, default=MODE_SINGLE, help="how deck structures are generated")
+    parser.add_argument('--mock', action='store_true', help="use the offline mock model instead of Gemini")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    create = commands.add_parser('create', help="generate a new deck")
+    create.add_argument('topic')
+    create.add_argument('-n', '--slides', type=int, default=DEFAULT_SLIDE_COUNT)
+    create.add_argument('-r', '--request', default="", help="extra requirements for the content")
+    create.add_argument('-o', '--output', help="output .pptx (default: <topic>.pptx)")
+    create.set_defaults(run=cmd_create)
+
+    edit = commands.add_parser('edit', help="rewrite slides of an existing deck")
+    edit.add_argument('deck')
+    edit.add_argument('request', nargs='?', default="")
+    target = edit.add_mutually_exclusive_group()
+    target.add_argument('-s', '--slide', type=int)
+    target.add_argument('-q', '--query', help="edit the slide that best matches this text")
+    target.add_argument('--slides', type=slide_list, help="several slides, e.g. 1,3,5 or 2-4")
+    edit.add_argument('--title', help="set the title directly (no model call)")
+    edit.add_argument('--content', nargs='*', help="set the bullet points directly (no model call)")
+    edit.add_argument('-o', '--output', help="output .pptx (default: overwrite the deck)")
+    edit.set_defaults(run=cmd_edit)
+
+    add = commands.add_parser('add', help="append a generated slide")
+    add.add_argument('deck')
+    add.add_argument('request')
+    add.add_argument('-o', '--output', help="output .pptx (default: overwrite the deck)")
+    add.set_defaults(run=cmd_add)
+
+    view = commands.add_parser('view', help="print one slide or the deck summary")
+    view.add_argument('deck')
+    view.add_argument('-s', '--slide', type=int)
+    view.add_argument('-q', '--query', help="show the slide that best matches this text")
+    view.set_defaults(run=cmd_view)
+
+    run = commands.add_parser('run', help="apply chat prompts to one deck in order")
+    run.add_argument('prompts', nargs='*')
+    run.add_argument('-f', '--file', help="file with one prompt per line ('-' for stdin)")
+    run.add_argument('-d', '--deck', help="start from this deck instead of an empty session")
+    run.add_argument('-o', '--output', help="where to save the deck (default: --deck)")
+    run.add_argument('-k', '--keep-going', action='store_true', help="continue after a failed prompt")
+    run.set_defaults(run=cmd_run)
+
+    bulk = commands.add_parser('bulk', help="generate one deck per row of a CSV/JSONL job list")
+    bulk.add_argument('jobs', help="job list with topic (and optional id, slides, request, mode, output)")
+    bulk.add_argument('-o', '--out-dir', default='decks')
+    bulk.add_argument('-c', '--concurrency', type=int, default=4, help="model requests in flight")
+    bulk.add_argument('-p', '--processes', type=int, help="deck assembly processes (default: CPU count)")
+    bulk.add_argument('--rpm', type=float, help="requests per minute limit (default: GEMINI_RPM)")
+    bulk.add_argument('--checkpoint', help="progress file (default: <out-dir>/.checkpoint.jsonl)")
+    bulk.set_defaults(run=cmd_bulk)
+
+    serve = commands.add_parser('serve', help="run the local HTTP API")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--max-decks', type=int, default=32, help="decks kept in memory")
+    serve.set_defaults(run=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    load_dotenv()
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    args = build_parser().parse_args(argv)
+    overrides = {'requests_per_minute': args.rpm} if getattr(args, 'rpm', None) else {}
+    service = DeckService(client=make_client(args.mock, **overrides), mode=args.mode)
+    try:
+        result = args.run(service, args)
+    except ServiceError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if result is not None:
+        emit(result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Chunked CSV ingestion for chart data.
+
+Reading a whole export with ``pd.read_csv`` and converting columns to Python
+lists costs several times the file size in memory. ``aggregate_csv`` reads
+only the label and value columns, with explicit dtypes, a chunk at a time,
+and folds every chunk into running per-label totals. Peak memory is bounded
+by the chunk size and the number of distinct labels, not by the file size.
+
+pandas and NumPy are imported by the functions that read CSVs, so the app
+can import the option lists below without paying for them at startup.
+"""
+AGGREGATIONS = ["sum", "mean", "count"]
+
+# Label for "no time bucketing" plus pandas period aliases
+TIME_BUCKETS = {
+    "None": None,
+    "Day": "D",
+    "Week": "W",
+    "Month": "M",
+    "Quarter": "Q",
+    "Year": "Y",
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def read_csv_preview(file, nrows=5):
+    """Read just the first rows of an upload for the preview and column list"""
+    import pandas as pd
+
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    preview = pd.read_csv(file, nrows=nrows)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    return preview
+
+
+def aggregate_csv(file, label_column, value_columns, agg="sum", top_n=None,
+                  time_bucket=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream ``file`` in chunks and aggregate the value columns per label.
+
+    ``agg`` is one of "sum", "mean" or "count". ``time_bucket`` is a pandas
+    period alias ("D", "W", "M", "Q", "Y") that parses the label column as
+    dates and groups by period. ``top_n`` keeps only the largest labels by
+    the first value column (time buckets are always kept in date order).
+    Returns ``(labels, {column: values})`` as NumPy arrays ready for
+    ``add_chart_slide``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    value_columns = list(value_columns)
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation: {agg}")
+
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+    dtypes = {column: 'float64' for column in value_columns}
+    if not time_bucket:
+        dtypes[label_column] = 'str'
+
+    sums = None
+    counts = None
+    reader = pd.read_csv(
+        file,
+        usecols=[label_column] + value_columns,
+        dtype=dtypes,
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        labels = chunk[label_column]
+        if time_bucket:
+            dates = pd.to_datetime(labels, errors='coerce')
+            labels = dates.dt.to_period(time_bucket).dt.start_time
+        grouped = chunk[value_columns].groupby(labels.rename(label_column), sort=False)
+
+        chunk_sums = grouped.sum()
+        chunk_counts = grouped.count()
+        sums = chunk_sums if sums is None else sums.add(chunk_sums, fill_value=0)
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+    if sums is None:
+        return np.array([]), {column: np.array([], dtype='float64') for column in value_columns}
+
+    if agg == "sum":
+        result = sums
+    elif agg == "mean":
+        result = sums / counts.replace(0, np.nan)
+    else:
+        result = counts
+
+    if time_bucket:
+        result = result.sort_index()
+        labels = result.index.strftime('%Y-%m-%d').to_numpy()
+    else:
+        if top_n:
+            result = result.sort_values(value_columns[0], ascending=False).head(top_n)
+        labels = result.index.to_numpy()
+
+    return labels, {column: result[column].to_numpy(dtype='float64') for column in value_columns}
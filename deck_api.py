@@ -0,0 +1,231 @@
+"""Local HTTP API over ``DeckService``.
+
+Each deck lives in its own service, keyed by an id returned on creation;
+the least recently used decks are dropped beyond ``max_decks``. Requests
+and responses are JSON except for ``.pptx`` uploads and downloads.
+
+    POST   /decks                  {"topic", "slides", "request", "mode"} or a .pptx body
+    GET    /decks                  ids and slide counts
+    GET    /decks/<id>             deck summary
+    GET    /decks/<id>/slides/<n>  one slide
+    POST   /decks/<id>/edit        {"request", "slide" | "query" | "slides": [...]}
+    POST   /decks/<id>/slides      {"request"}: add a slide
+    POST   /decks/<id>/chat        {"prompt"}: route a chat prompt like the Streamlit chat
+    GET    /decks/<id>/history     versions, oldest first, and the current one
+    POST   /decks/<id>/undo        {"steps"?}; /redo likewise
+    POST   /decks/<id>/checkout    {"version"}: restore any version
+    GET    /decks/<id>/pptx        download
+    DELETE /decks/<id>
+"""
+import json
+import logging
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from deck_service import DeckService, ServiceError
+from intent_router import DEFAULT_SLIDE_COUNT
+
+logger = logging.getLogger(__name__)
+
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+_DECK_PATH = re.compile(r'^/decks/([0-9a-f]{32})(?:/(slides|edit|chat|pptx|history|undo|redo|checkout)(?:/(\d+))?)?/?$')
+
+
+class NotFound(LookupError):
+    """Unknown deck id or path"""
+
+
+def _number(value, name):
+    """``value`` (a JSON integer or a string of digits) as an int, else a client error naming ``name``"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and re.fullmatch(r'\s*-?\d+\s*', value):
+        return int(value)
+    raise ServiceError(f"'{name}' must be a whole number")
+
+
+def _optional_number(data, name, default=None):
+    value = data.get(name)
+    return default if value is None or value == '' else _number(value, name)
+
+
+class DeckStore:
+    """Services by deck id, dropping the least recently used beyond ``max_decks``"""
+
+    def __init__(self, client=None, mode='single', max_decks=32):
+        self.client = client
+        self.mode = mode
+        self.max_decks = max_decks
+        self._services = OrderedDict()
+        self._lock = threading.Lock()
+
+    def new(self):
+        service = DeckService(client=self.client, mode=self.mode)
+        deck_id = uuid.uuid4().hex
+        with self._lock:
+            self._services[deck_id] = service
+            while len(self._services) > self.max_decks:
+                self._services.popitem(last=False)
+        return deck_id, service
+
+    def get(self, deck_id):
+        with self._lock:
+            service = self._services.get(deck_id)
+            if service is None:
+                raise NotFound(f"No deck {deck_id}")
+            self._services.move_to_end(deck_id)
+            return service
+
+    def delete(self, deck_id):
+        with self._lock:
+            if self._services.pop(deck_id, None) is None:
+                raise NotFound(f"No deck {deck_id}")
+
+    def list(self):
+        with self._lock:
+            items = list(self._services.items())
+        return [
+            {'id': deck_id, 'slides': len(service.deck.slides) if service.deck is not None else 0}
+            for deck_id, service in items
+        ]
+
+
+class _DeckHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _json_body(self):
+        body = self._body()
+        try:
+            data = json.loads(body) if body else {}
+        except json.JSONDecodeError as e:
+            raise ServiceError(f"Request body is not valid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise ServiceError("Request body must be a JSON object")
+        return data
+
+    def _send(self, status, body, content_type='application/json'):
+        if content_type == 'application/json':
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, handler):
+        try:
+            status, body, *content_type = handler()
+            self._send(status, body, *content_type)
+        except NotFound as e:
+            self._send(404, {'error': str(e)})
+        except ServiceError as e:
+            self._send(400, {'error': str(e)})
+        except Exception as e:
+            logger.exception("Error handling %s %s", self.command, self.path)
+            self._send(500, {'error': str(e)})
+
+    def do_GET(self):
+        self._dispatch(self._get)
+
+    def do_POST(self):
+        self._dispatch(self._post)
+
+    def do_DELETE(self):
+        self._dispatch(self._delete)
+
+    def _route(self):
+        match = _DECK_PATH.match(self.path)
+        if match is None:
+            raise NotFound(f"No route for {self.path}")
+        deck_id, action, number = match.groups()
+        return self.server.store.get(deck_id), action, int(number) if number else None
+
+    def _get(self):
+        if self.path in ('/health', '/health/'):
+            return 200, {'status': 'ok'}
+        if self.path in ('/decks', '/decks/'):
+            return 200, {'decks': self.server.store.list()}
+        service, action, number = self._route()
+        if action is None:
+            return 200, service.summary()
+        if action == 'slides' and number is not None:
+            return 200, service.view(number)
+        if action == 'pptx':
+            return 200, service.to_bytes(), PPTX_MIME
+        if action == 'history':
+            return 200, service.history()
+        raise NotFound(f"No route for GET {self.path}")
+
+    def _post(self):
+        store = self.server.store
+        if self.path in ('/decks', '/decks/'):
+            if self.headers.get('Content-Type', '').startswith(PPTX_MIME):
+                body = self._body()
+                deck_id, service = store.new()
+                result = service.load(body)
+            else:
+                data = self._json_body()
+                if not data.get('topic'):
+                    raise ServiceError("'topic' is required")
+                deck_id, service = store.new()
+                result = service.create(
+                    data['topic'], _optional_number(data, 'slides') or DEFAULT_SLIDE_COUNT,
+                    request=data.get('request', ''), mode=data.get('mode')
+                )
+            return 201, dict(result, id=deck_id)
+
+        service, action, number = self._route()
+        data = self._json_body()
+        if action == 'edit':
+            if not data.get('request'):
+                raise ServiceError("'request' is required")
+            slides = data.get('slides') or ()
+            if not isinstance(slides, (list, tuple)):
+                raise ServiceError("'slides' must be a list of slide numbers")
+            return 200, service.edit(
+                data['request'], slide_number=_optional_number(data, 'slide'), slide_query=data.get('query'),
+                slide_numbers=tuple(_number(slide, 'slides') for slide in slides), mode=data.get('mode')
+            )
+        if action == 'slides' and number is None:
+            if not data.get('request'):
+                raise ServiceError("'request' is required")
+            return 201, service.add_slide(data['request'], mode=data.get('mode'))
+        if action == 'chat':
+            if not data.get('prompt'):
+                raise ServiceError("'prompt' is required")
+            return 200, service.handle(data['prompt'], mode=data.get('mode'))
+        if action == 'undo':
+            return 200, service.undo(_optional_number(data, 'steps', 1))
+        if action == 'redo':
+            return 200, service.redo(_optional_number(data, 'steps', 1))
+        if action == 'checkout':
+            if data.get('version') is None:
+                raise ServiceError("'version' is required")
+            return 200, service.checkout(_number(data['version'], 'version'))
+        raise NotFound(f"No route for POST {self.path}")
+
+    def _delete(self):
+        match = _DECK_PATH.match(self.path)
+        if match is None or match.group(2):
+            raise NotFound(f"No route for DELETE {self.path}")
+        self.server.store.delete(match.group(1))
+        return 200, {'deleted': match.group(1)}
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(port=8765, host='127.0.0.1', client=None, mode='single', max_decks=32):
+    """Create (but do not start) the API server; ``serve_forever`` runs it"""
+    server = ThreadingHTTPServer((host, port), _DeckHandler)
+    server.daemon_threads = True
+    server.store = DeckStore(client=client, mode=mode, max_decks=max_decks)
+    return server
@@ -0,0 +1,113 @@
+"""Loading presentations from memory or disk without intermediate copies.
+
+Uploads already live in memory (Streamlit's ``UploadedFile.getbuffer()`` is a
+memoryview), so writing them to a temp file only to read them back costs a
+full disk round trip and lets two users uploading the same filename clobber
+each other. ``open_presentation`` reads buffers in place through
+``BufferReader``, and large files given by path are memory-mapped so the
+zip reader pages in only the members it touches instead of buffering the
+whole archive.
+"""
+import io
+import mmap
+import os
+from contextlib import contextmanager
+
+from pptx import Presentation
+
+# Files at least this large are memory-mapped when loaded by path
+MMAP_THRESHOLD = int(os.getenv("PPTX_MMAP_THRESHOLD", str(16 * 1024 * 1024)))
+
+
+class BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like object, without copying it"""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        # Same semantics as BytesIO: relative seeks before the start clamp to 0
+        if whence == io.SEEK_SET:
+            if offset < 0:
+                raise ValueError(f"Negative seek position {offset}")
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = max(self._pos + offset, 0)
+        elif whence == io.SEEK_END:
+            position = max(len(self._view) + offset, 0)
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self._pos = position
+        return position
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b''
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        # Release the view so an underlying mmap can be closed
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@contextmanager
+def open_source(source, use_mmap=None):
+    """Yield a seekable binary file for ``source``.
+
+    ``source`` may be a path, a bytes-like object (bytes, bytearray,
+    memoryview) or an open binary file. Paths are memory-mapped when
+    ``use_mmap`` is true, or when it is None and the file is at least
+    ``MMAP_THRESHOLD`` bytes.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if use_mmap is None:
+                use_mmap = size >= MMAP_THRESHOLD
+            if not use_mmap or size == 0:
+                yield f
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                reader = BufferReader(mapped)
+                try:
+                    yield reader
+                finally:
+                    reader.close()
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        reader = BufferReader(source)
+        try:
+            yield reader
+        finally:
+            reader.close()
+    else:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        yield source
+
+
+def open_presentation(source, use_mmap=None):
+    """Open a ``Presentation`` from a path, bytes-like object or file.
+
+    python-pptx reads every part while opening, so nothing here needs to
+    outlive the call and the mapping is closed before returning.
+    """
+    with open_source(source, use_mmap=use_mmap) as f:
+        return Presentation(f)
@@ -0,0 +1,143 @@
+"""Targeted repair of incomplete deck structures.
+
+A model answer can stop before the requested number of slides, or contain
+headings whose bullet points never arrived (the parser drops slides without
+content). Regenerating the whole deck for that repeats every slide that was
+fine. ``RepairPlan`` compares the parsed answer with the requested slide
+count, keeps the headings whose points went missing as titled gaps in
+their original place, and marks slides with too few points as short.
+``build_repair_prompt`` then asks for exactly those slides, by number, with
+only their neighbours' titles as context, so the repair request and answer
+grow with the number of gaps rather than the size of the deck.
+"""
+from dataclasses import dataclass
+
+# Slides with fewer points than this are regenerated; the prompts ask for 3-5
+MIN_SLIDE_POINTS = 2
+
+# Repaired slides are capped like pipeline slides
+MAX_SLIDE_POINTS = 5
+
+GAP_MISSING = 'missing'
+GAP_SHORT = 'short'
+
+
+@dataclass(frozen=True)
+class Gap:
+    """One slide to (re)generate; ``number`` is its 1-based position among the content slides"""
+    number: int
+    kind: str
+    title: str = None  # None when the answer stopped before this slide
+    points: tuple = ()  # what a short slide already has
+
+
+class RepairPlan:
+    """The slides of one answer, in order, and the gaps among them"""
+
+    def __init__(self, outline, slide_count, min_points=MIN_SLIDE_POINTS):
+        # ``outline`` is every heading of the answer in order, including
+        # those the parser dropped for having no bullet points
+        complete = sum(1 for slide in outline if slide.get('content'))
+        # No ``slide_count`` means no target: the deck is complete at any length
+        shortfall = max(0, slide_count - complete) if slide_count else 0
+        self.slides = []
+        self.gaps = []
+        for slide in outline:
+            content = slide.get('content') or []
+            if not content:
+                # Only while the deck is short: an empty "# Deck Title" heading
+                # above the slides is not a missing slide
+                if shortfall:
+                    shortfall -= 1
+                    self._add_gap(GAP_MISSING, slide, slide.get('title') or None)
+                continue
+            if len(content) < min_points:
+                self._add_gap(GAP_SHORT, slide, slide.get('title'), tuple(content))
+            else:
+                self.slides.append(slide)
+        for _ in range(shortfall):
+            self._add_gap(GAP_MISSING, {'title': None, 'content': []}, None)
+
+    def _add_gap(self, kind, slide, title, points=()):
+        self.slides.append(slide)
+        self.gaps.append(Gap(len(self.slides), kind, title, points))
+
+    def _title(self, number):
+        if 1 <= number <= len(self.slides):
+            return self.slides[number - 1].get('title')
+        return None
+
+    def context(self):
+        """Titles of the slides next to each gap, ``{number: title}``"""
+        gap_numbers = {gap.number for gap in self.gaps}
+        context = {}
+        for gap in self.gaps:
+            for number in (gap.number - 1, gap.number + 1):
+                title = self._title(number)
+                if number not in gap_numbers and title:
+                    context[number] = title
+        return dict(sorted(context.items()))
+
+    def merge(self, repaired):
+        """Fill the gaps from ``{number: {'title'?, 'content'}}``.
+
+        Returns ``(slides, filled)``: the slides in order and the final
+        positions (1-based) that were filled, each with its gap. Missing slides
+        that got no content are left out; short ones keep what they had.
+        """
+        gaps = {gap.number: gap for gap in self.gaps}
+        slides = []
+        filled = []
+        for number, slide in enumerate(self.slides, 1):
+            gap = gaps.get(number)
+            if gap is None:
+                slides.append(slide)
+                continue
+            new = repaired.get(number) or {}
+            content = [point for point in new.get('content') or [] if point.strip()][:MAX_SLIDE_POINTS]
+            if len(content) > len(gap.points):
+                title = gap.title or new.get('title') or f"Slide {number}"
+                slides.append({'title': title, 'content': content})
+                filled.append((len(slides), gap))
+            elif gap.kind == GAP_SHORT:
+                slides.append(slide)
+        return slides, filled
+
+
+def build_repair_prompt(topic, plan, requirements=""):
+    """Prompt for the gap slides of ``plan`` only, in the batch ``# Slide N: Title`` format"""
+    context = "\n".join(f"Slide {number}: {title}" for number, title in plan.context().items())
+    wanted = ""
+    for gap in plan.gaps:
+        wanted += f"## Slide {gap.number}\n"
+        if gap.title:
+            wanted += f"Title: {gap.title} (keep this title)\n"
+        else:
+            wanted += "Title: choose one that fits between the neighbouring slides\n"
+        if gap.points:
+            wanted += f"Current content (too short, write the complete slide): {', '.join(gap.points)}\n"
+        wanted += "\n"
+
+    return f"""
+    You are completing a presentation about "{topic}". Some slides came back
+    missing or incomplete and need to be written now.
+    {requirements}
+
+    Neighbouring slides, for context only (do not write them):
+    {context or "(none)"}
+
+    Write ONLY these slides:
+
+    {wanted}
+    Requirements:
+    - 3-5 bullet points per slide
+    - Each bullet point is ONE clear, complete sentence of 10-25 words
+    - Keep each slide's number exactly as given
+
+    Format your response as:
+
+    # Slide <number>: Slide Title
+    - Bullet point 1
+    - Bullet point 2
+    - Bullet point 3
+    """
@@ -0,0 +1,136 @@
+"""Structured (JSON) deck descriptions.
+
+Instead of parsing free-form markdown, Gemini can be asked for JSON that
+matches ``DECK_RESPONSE_SCHEMA``. ``parse_deck_json`` validates that JSON
+into ``SlideSpec`` objects, and ``ParseStats`` counts how often a
+structure request needed the markdown fallback, a retry, or produced
+nothing usable, so wasted model calls show up in the sidebar.
+"""
+import json
+import re
+import threading
+from dataclasses import dataclass
+
+DECK_RESPONSE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'slides': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'title': {'type': 'string'},
+                    'content': {'type': 'array', 'items': {'type': 'string'}},
+                    'notes': {'type': 'string'},
+                },
+                'required': ['title', 'content'],
+            },
+        },
+    },
+    'required': ['slides'],
+}
+
+JSON_GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'response_schema': DECK_RESPONSE_SCHEMA,
+}
+
+# Appended to structure prompts that were written for markdown output
+JSON_INSTRUCTIONS = """
+Return the slides as JSON instead of markdown: an object with a "slides" array,
+where each slide has a "title" string and a "content" array of bullet point strings.
+"""
+
+_CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+_BULLET_PREFIX_RE = re.compile(r'^(?:[-*•]\s+)+')
+
+
+class DeckSchemaError(ValueError):
+    """Raised when a structured response does not describe a usable deck"""
+
+
+@dataclass(frozen=True)
+class SlideSpec:
+    """One validated slide of a structured deck description"""
+    title: str
+    content: tuple
+    notes: str = ''
+
+    def as_dict(self):
+        """Return the ``{'title', 'content'}`` dict the slide builders take"""
+        return {'title': self.title, 'content': list(self.content)}
+
+
+def parse_deck_json(text, allow_empty=False):
+    """Validate a JSON deck description into a list of ``SlideSpec``.
+
+    With ``allow_empty``, slides without bullet points are kept (with empty
+    content) for the caller to repair, as long as at least one slide has some.
+    """
+    try:
+        data = json.loads(_CODE_FENCE_RE.sub('', text or ''))
+    except json.JSONDecodeError as e:
+        raise DeckSchemaError(f"Response is not valid JSON: {e}") from e
+
+    # Accept a bare array of slides as well as {"slides": [...]}
+    slides = data.get('slides') if isinstance(data, dict) else data
+    if not isinstance(slides, list) or not slides:
+        raise DeckSchemaError("Response has no 'slides' array")
+
+    specs = []
+    for i, slide in enumerate(slides, 1):
+        if not isinstance(slide, dict):
+            raise DeckSchemaError(f"Slide {i} is not an object")
+        title = slide.get('title')
+        if not isinstance(title, str) or not title.strip():
+            raise DeckSchemaError(f"Slide {i} has no title")
+        content = slide.get('content', [])
+        if isinstance(content, str):
+            content = [content]
+        if not isinstance(content, list) or not all(isinstance(point, str) for point in content):
+            raise DeckSchemaError(f"Slide {i} content is not a list of strings")
+        points = tuple(
+            point for point in (_BULLET_PREFIX_RE.sub('', point).strip() for point in content) if point
+        )
+        if not points and not allow_empty:
+            raise DeckSchemaError(f"Slide {i} has no content")
+        notes = slide.get('notes', '')
+        specs.append(SlideSpec(title.strip(), points, notes.strip() if isinstance(notes, str) else ''))
+    if not any(spec.content for spec in specs):
+        raise DeckSchemaError("No slide has any content")
+    return specs
+
+
+class ParseStats:
+    """Process-wide counters for structure parsing outcomes"""
+
+    FIELDS = (
+        'requests', 'json_parsed', 'markdown_parsed', 'markdown_fallbacks', 'retries', 'failures',
+        'repairs', 'repaired_slides',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def record(self, field, amount=1):
+        with self._lock:
+            self._counts[field] += amount
+
+    def stats(self):
+        """Return the counters plus the failure, fallback and retry rates"""
+        with self._lock:
+            counts = dict(self._counts)
+        requests = counts['requests'] or 1
+        counts['failure_rate'] = round(counts['failures'] / requests, 4)
+        counts['fallback_rate'] = round(counts['markdown_fallbacks'] / requests, 4)
+        counts['retry_rate'] = round(counts['retries'] / requests, 4)
+        counts['repair_rate'] = round(counts['repairs'] / requests, 4)
+        return counts
+
+
+PARSE_STATS = ParseStats()
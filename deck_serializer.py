@@ -0,0 +1,178 @@
+"""Incremental .pptx serialization.
+
+``Presentation.save`` re-serializes and re-deflates every part on every
+call, so saving a 200-slide deck after a one-word edit costs as much as the
+first save. ``IncrementalSaver`` keeps the compressed zip member of every
+part from the previous save and only re-serializes parts that were marked
+dirty (plus the small structural parts: presentation.xml, rels and content
+types, which are re-used too when their bytes did not change). Binary
+parts are reused while their blob is the same object, and already
+compressed media is stored rather than deflated again.
+"""
+import struct
+import threading
+import weakref
+import zlib
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import XmlPart
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.parts.presentation import PresentationPart
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Formats that are already compressed; deflating them again only costs time
+STORED_EXTENSIONS = {
+    'jpg', 'jpeg', 'gif', 'mp3', 'mp4', 'm4a', 'm4v', 'mov', 'wmv',
+    'avi', 'wma', 'xlsx', 'docx', 'pptx', 'zip',
+}
+
+# MS-DOS timestamp of 1980-01-01 00:00, so identical decks produce identical bytes
+_DOS_DATE = (0 << 9) | (1 << 5) | 1
+_DOS_TIME = 0
+
+
+class ZipMember:
+    """One compressed zip entry, reusable across saves"""
+    __slots__ = ('raw', 'data', 'crc', 'size', 'method')
+
+    def __init__(self, raw, data, crc, size, method):
+        self.raw = raw  # uncompressed bytes, kept only for small structural members
+        self.data = data
+        self.crc = crc
+        self.size = size
+        self.method = method
+
+    @classmethod
+    def compress(cls, blob, method=ZIP_DEFLATED, keep_raw=False):
+        if method == ZIP_DEFLATED:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            data = compressor.compress(blob) + compressor.flush()
+        else:
+            data = blob
+        return cls(blob if keep_raw else None, data, zlib.crc32(blob), len(blob), method)
+
+
+def write_zip(members):
+    """Build a zip archive from ``[(name, ZipMember), ...]`` without recompressing"""
+    chunks = []
+    central = []
+    offset = 0
+    for name, member in members:
+        name_bytes = name.encode('utf-8')
+        header = struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 20, 0, member.method, _DOS_TIME, _DOS_DATE,
+            member.crc, len(member.data), member.size, len(name_bytes), 0
+        )
+        chunks.append(header)
+        chunks.append(name_bytes)
+        chunks.append(member.data)
+        central.append(struct.pack(
+            '<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0, member.method, _DOS_TIME, _DOS_DATE,
+            member.crc, len(member.data), member.size, len(name_bytes), 0, 0, 0, 0, 0, offset
+        ) + name_bytes)
+        offset += len(header) + len(name_bytes) + len(member.data)
+
+    central_bytes = b''.join(central)
+    end = struct.pack(
+        '<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central), len(central_bytes), offset, 0
+    )
+    return b''.join(chunks) + central_bytes + end
+
+
+class IncrementalSaver:
+    """Serializes one presentation, reusing unchanged members from the last save"""
+
+    def __init__(self):
+        self._parts = weakref.WeakKeyDictionary()  # part -> (blob, ZipMember)
+        self._structural = {}  # member name -> ZipMember (raw kept for comparison)
+        self._dirty = weakref.WeakSet()
+        self._output = None
+        self._lock = threading.Lock()
+        self.stats = {'saves': 0, 'cached_saves': 0, 'members_reused': 0, 'members_compressed': 0}
+
+    def touch(self, part=None):
+        """Record a change; ``part`` is the XML part whose content changed, if any"""
+        with self._lock:
+            self._output = None
+            if part is not None:
+                self._dirty.add(part)
+
+    def prime(self, output):
+        """Start from ``output``, the already serialized bytes of the unchanged deck"""
+        with self._lock:
+            self._output = output
+
+    def memory_bytes(self):
+        """Bytes held by the cached members and the last output"""
+        with self._lock:
+            total = len(self._output or b'')
+            for blob, member in list(self._parts.values()):
+                if member.data is not blob:
+                    total += len(member.data)
+            for member in self._structural.values():
+                total += len(member.data) + len(member.raw or b'')
+            return total
+
+    def save(self, prs):
+        """Return the .pptx bytes for ``prs``, serializing only what changed"""
+        with self._lock:
+            if self._output is not None:
+                self.stats['cached_saves'] += 1
+                return self._output
+
+            package = prs.part.package
+            parts = tuple(package.iter_parts())
+            members = [
+                (CONTENT_TYPES_URI.membername, self._structural_member(
+                    CONTENT_TYPES_URI, serialize_part_xml(_ContentTypesItem.xml_for(parts))
+                )),
+                (PACKAGE_URI.rels_uri.membername, self._structural_member(
+                    PACKAGE_URI.rels_uri, package._rels.xml
+                )),
+            ]
+            for part in parts:
+                members.append((part.partname.membername, self._part_member(part)))
+                if part._rels:
+                    rels_uri = part.partname.rels_uri
+                    members.append((rels_uri.membername, self._structural_member(rels_uri, part.rels.xml)))
+
+            self._dirty = weakref.WeakSet()
+            self._output = write_zip(members)
+            self.stats['saves'] += 1
+            return self._output
+
+    def _part_member(self, part):
+        cached = self._parts.get(part)
+        if isinstance(part, XmlPart):
+            if isinstance(part, PresentationPart):
+                # The slide list lives here and changes with every added slide
+                return self._structural_member(part.partname, part.blob)
+            if cached is not None and part not in self._dirty:
+                self.stats['members_reused'] += 1
+                return cached[1]
+            blob = part.blob
+            member = ZipMember.compress(blob)
+            self._parts[part] = (None, member)
+        else:
+            blob = part.blob
+            if cached is not None and cached[0] is blob:
+                self.stats['members_reused'] += 1
+                return cached[1]
+            method = ZIP_STORED if part.partname.ext.lower() in STORED_EXTENSIONS else ZIP_DEFLATED
+            member = ZipMember.compress(blob, method)
+            self._parts[part] = (blob, member)
+        self.stats['members_compressed'] += 1
+        return member
+
+    def _structural_member(self, name, blob):
+        cached = self._structural.get(name)
+        if cached is not None and cached.raw == blob:
+            self.stats['members_reused'] += 1
+            return cached
+        member = ZipMember.compress(blob, keep_raw=True)
+        self._structural[name] = member
+        self.stats['members_compressed'] += 1
+        return member
@@ -0,0 +1,531 @@
+"""Headless create / edit / add / view flows around ``PowerPointChatbot``.
+
+The Streamlit chat, the batch CLI (``cli.py``) and the local HTTP API
+(``deck_api.py``) all go through ``DeckService``, so decks can be built
+and edited from scripts and cron jobs without a Streamlit rerun per
+interaction. Methods return plain, JSON-ready dicts and raise
+``ServiceError`` for requests that cannot be carried out.
+"""
+import threading
+
+from chatbot import PowerPointChatbot
+from edit_commands import (
+    COMMAND_STATS, LAST, PLACE_AFTER, PLACE_BEFORE, parse_edit_command,
+    ACTION_RETITLE, ACTION_REPLACE_BULLET, ACTION_ADD_BULLET, ACTION_DELETE_BULLET,
+    ACTION_MOVE_SLIDE, ACTION_DELETE_SLIDE, ACTION_DUPLICATE_SLIDE, ACTION_SWAP_SLIDES,
+    ACTION_UNDO, ACTION_REDO, HISTORY_ACTIONS
+)
+from intent_router import (
+    IntentRouter, INTENT_CREATE, INTENT_EDIT, INTENT_ADD_SLIDE, INTENT_VIEW, DEFAULT_SLIDE_COUNT
+)
+
+# How a deck structure is generated, matching the sidebar's generation modes
+MODE_SINGLE = 'single'
+MODE_STREAMING = 'streaming'
+MODE_PARALLEL = 'parallel'
+MODE_JSON = 'json'
+MODES = (MODE_SINGLE, MODE_STREAMING, MODE_PARALLEL, MODE_JSON)
+
+# Chat intent matcher, compiled once at import
+INTENT_ROUTER = IntentRouter()
+
+
+class ServiceError(ValueError):
+    """Raised when a request cannot be carried out (no deck, unknown slide, unusable answer)"""
+
+
+def build_requirements(request):
+    """The line passing a user's request on to structure, outline and repair prompts"""
+    return f'Extract any specific requirements from this user request: "{request}"' if request else ""
+
+
+def build_create_prompt(topic, slide_count, request=""):
+    """Prompt for a whole deck structure in the markdown outline format"""
+    requirements = build_requirements(request)
+    return f"""
+    Create a detailed and professional presentation structure about "{topic}".
+    {requirements}
+
+    Requirements:
+    - Create EXACTLY {slide_count} slides with clear, concise content
+    - Each slide should have 3-5 bullet points maximum
+    - Each bullet point should be ONE clear, complete sentence (not paragraphs)
+    - Use professional language and terminology
+    - Make each bullet point specific and actionable
+    - Keep bullet points between 10-25 words each
+
+    Generate EXACTLY {slide_count} slides following this structure pattern:
+
+    # Slide Title 1
+    - Bullet point 1 (10-25 words)
+    - Bullet point 2 (10-25 words)
+    - Bullet point 3 (10-25 words)
+    - Bullet point 4 (10-25 words)
+
+    # Slide Title 2
+    - Bullet point 1 (10-25 words)
+    - Bullet point 2 (10-25 words)
+    - Bullet point 3 (10-25 words)
+    - Bullet point 4 (10-25 words)
+
+    Continue this pattern for all {slide_count} slides. Make sure each slide has a clear, descriptive title and 3-5 bullet points.
+    """
+
+
+def build_edit_prompt(slide_number, current_slide, request):
+    """Prompt for the new content of one existing slide"""
+    return f"""
+    The user wants to edit slide {slide_number} of their presentation.
+
+    Current slide content:
+    Title: {current_slide['title']}
+    Content: {', '.join(current_slide['content'])}
+
+    User's editing request: "{request}"
+
+    Generate new content for this slide based on the user's request.
+    Format your response as:
+
+    # New Slide Title
+    - Bullet point 1
+    - Bullet point 2
+    - Bullet point 3
+    - Bullet point 4
+
+    Keep bullet points concise (10-25 words each) and professional.
+    """
+
+
+def build_add_slide_prompt(request):
+    """Prompt for the content of a slide appended to the deck"""
+    return f"""
+    The user wants to add a new slide to their presentation.
+    User's request: "{request}"
+
+    Create content for this new slide based on the user's request.
+
+    Format your response as:
+
+    # Slide Title (extract from user's request)
+    - Bullet point 1 (10-25 words)
+    - Bullet point 2 (10-25 words)
+    - Bullet point 3 (10-25 words)
+    - Bullet point 4 (10-25 words)
+
+    Keep bullet points concise, professional, and relevant to the topic.
+    """
+
+
+def build_chat_prompt(request):
+    """Prompt for a general answer when the request is not a deck operation"""
+    return f"""
+    You are a PowerPoint presentation assistant. The user said: "{request}"
+
+    Provide a helpful response about PowerPoint presentations, slide creation, or presentation tips.
+    If they're asking about creating presentations, guide them to use phrases like "create a presentation about [topic]".
+    If they're asking about editing, guide them to upload a file first using the + button.
+
+    Keep your response friendly, professional, and focused on PowerPoint assistance.
+    """
+
+
+class DeckService:
+    """One deck and the operations on it; calls are serialized per service"""
+
+    def __init__(self, chatbot=None, client=None, mode=MODE_SINGLE, max_workers=4, retries=2):
+        if mode not in MODES:
+            raise ValueError(f"Unknown generation mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.chatbot = chatbot if chatbot is not None else PowerPointChatbot(client=client)
+        self.mode = mode
+        self.max_workers = max_workers
+        self.retries = retries
+        self.lock = threading.RLock()
+
+    @property
+    def deck(self):
+        return self.chatbot.current_ppt
+
+    def _require_deck(self):
+        if self.deck is None:
+            raise ServiceError("No presentation loaded; create or load one first")
+
+    def _resolve_slide(self, slide_number=None, slide_query=None):
+        # "the slide about pricing" resolves through the local search index
+        number = slide_number or self.chatbot.find_slide(slide_query)
+        if number and not 1 <= number <= len(self.deck.slides):
+            raise ServiceError(f"Slide {number} not found; the presentation has {len(self.deck.slides)} slides")
+        return number
+
+    def _mode(self, mode):
+        mode = mode or self.mode
+        if mode not in MODES:
+            raise ServiceError(f"Unknown generation mode {mode!r}, expected one of {', '.join(MODES)}")
+        return mode
+
+    def _generate_slide(self, prompt, mode):
+        """Ask for one slide and return its ``{'title', 'content'}``, or None"""
+        if mode == MODE_JSON:
+            structure = self.chatbot.generate_structure(prompt)
+        else:
+            structure = self.chatbot.parse_presentation_structure(self.chatbot.generate_text(prompt))
+        return structure[0] if structure else None
+
+    def create(self, topic, slide_count=DEFAULT_SLIDE_COUNT, request="", prompt=None, mode=None, on_slide=None):
+        """Generate a new deck about ``topic``, replacing the current one.
+
+        ``prompt`` overrides the default structure prompt; pass ``slide_count``
+        None when that prompt leaves the count open, so a shorter answer is
+        not treated as incomplete. ``on_slide(index,
+        slide_data)`` is called as slides are built in the streaming and
+        parallel modes. Slides missing from the answer, or with too few points,
+        are regenerated with one extra request for just those slides. Returns
+        the topic, the slides used, the titles that failed to generate and the
+        positions of repaired slides.
+        """
+        mode = self._mode(mode)
+        target = slide_count or DEFAULT_SLIDE_COUNT
+        prompt = prompt or build_create_prompt(topic, target, request)
+        requirements = build_requirements(request)
+        failed = []
+        filled = []
+        with self.lock:
+            if mode == MODE_PARALLEL:
+                # Per-slide requests already retry individually
+                prs, structure, failed = self.chatbot.create_presentation_pipeline(
+                    topic, target, requirements=requirements,
+                    max_workers=self.max_workers, retries=self.retries, on_slide=on_slide
+                )
+            elif mode == MODE_STREAMING:
+                outline = []
+                chunks = self.chatbot.generate_content_stream(prompt)
+                prs, structure = self.chatbot.create_presentation_streaming(
+                    topic, self.chatbot.iter_presentation_structure(chunks, outline), on_slide=on_slide
+                )
+                # The streamed slides are already built; repaired ones are slotted in
+                structure, filled = self.chatbot.repair_structure(topic, structure, slide_count, requirements, outline)
+                self.chatbot.fill_presentation_gaps(structure, filled, on_slide=on_slide)
+            else:
+                outline = []
+                if mode == MODE_JSON:
+                    # Schema-validated JSON, with the markdown parser as fallback
+                    structure = self.chatbot.generate_structure(prompt, outline=outline)
+                else:
+                    structure = self.chatbot.parse_presentation_structure(self.chatbot.generate_text(prompt), outline)
+                structure, filled = self.chatbot.repair_structure(topic, structure, slide_count, requirements, outline)
+                prs = self.chatbot.create_presentation(topic, structure) if structure else None
+
+            if not structure or prs is None:
+                raise ServiceError(f"Could not generate a presentation about {topic!r}")
+            # Every builder above has already made ``prs`` the current deck; the
+            # streamed one also holds the history of its filled-in slides
+            return {'topic': topic, 'slides': structure, 'failed': failed,
+                    'repaired': [position for position, _ in filled]}
+
+    def edit(self, request, slide_number=None, slide_query=None, slide_numbers=(), mode=None):
+        """Rewrite one slide, or several with one model call, from a natural language request.
+
+        Returns ``{'edited': {slide_number: new_content}, 'missing': [...]}``, or
+        the ``apply_command`` result when the request is a simple edit command
+        that needs no model call.
+        """
+        mode = self._mode(mode)
+        with self.lock:
+            local = self.try_command(request)
+            if local is not None:
+                return local
+            self._require_deck()
+            COMMAND_STATS.record_model()
+            if len(slide_numbers) > 1:
+                # "slides 1, 3 and 5" / "slides 2-6": one model call for all of them
+                edited, missing = self.chatbot.edit_slides_batch(slide_numbers, request)
+                if not edited:
+                    raise ServiceError(f"Couldn't update slides {', '.join(str(n) for n in slide_numbers)}")
+                return {'edited': edited, 'missing': missing}
+
+            number = self._resolve_slide(slide_number, slide_query)
+            if not number:
+                raise ServiceError("Which slide should be edited? Give a slide number or describe the slide")
+            current_slide = self.chatbot.get_slide_content(number)
+            if not current_slide:
+                raise ServiceError(f"Slide {number} not found")
+
+            new_content = self._generate_slide(build_edit_prompt(number, current_slide, request), mode)
+            if not new_content:
+                raise ServiceError("Couldn't parse new content for the slide from the model's answer")
+            if not self.chatbot.edit_slide_content(number - 1, new_content):
+                raise ServiceError(f"Failed to update slide {number}")
+            return {'edited': {number: new_content}, 'missing': []}
+
+    def _command_slide(self, number, what="Slide"):
+        total = len(self.deck.slides)
+        number = total if number == LAST else number
+        if not 1 <= number <= total:
+            raise ServiceError(f"{what} {number} not found; the presentation has {total} slides")
+        return number
+
+    def _command_bullet(self, slide_number, number):
+        slide = self.chatbot.get_slide_content(slide_number) or {'content': []}
+        count = len(slide['content'])
+        number = count if number == LAST else number
+        if not 1 <= number <= count:
+            raise ServiceError(f"Bullet {number} not found; slide {slide_number} has {count} bullet points")
+        return number
+
+    def try_command(self, request):
+        """Carry out ``request`` locally if it is a simple edit command, else return None"""
+        command = parse_edit_command(request)
+        if command is None:
+            return None
+        result = self.apply_command(command)
+        COMMAND_STATS.record_local(command.action)
+        return result
+
+    def apply_command(self, command):
+        """Apply a parsed ``EditCommand`` directly to the deck, without a model call.
+
+        Returns ``{'command', 'message', 'slide_number', 'slide', 'total_slides'}``
+        where ``slide_number``/``slide`` describe the slide as it is afterwards
+        (None for a deleted slide).
+        """
+        with self.lock:
+            self._require_deck()
+            if command.action in HISTORY_ACTIONS:
+                return self._apply_history_command(command)
+            chatbot = self.chatbot
+            action = command.action
+            number = self._command_slide(command.slide)
+            index = number - 1
+            result_number = number
+
+            if action == ACTION_RETITLE:
+                done = chatbot.edit_slide_content(index, {'title': command.text})
+                message = f'Renamed slide {number} to "{command.text}"'
+            elif action == ACTION_REPLACE_BULLET:
+                bullet = self._command_bullet(number, command.target)
+                done = chatbot.replace_bullet(index, bullet, command.text)
+                message = f"Replaced bullet {bullet} on slide {number}"
+            elif action == ACTION_ADD_BULLET:
+                done = chatbot.add_bullet(index, command.text)
+                message = f"Added a bullet point to slide {number}"
+            elif action == ACTION_DELETE_BULLET:
+                bullet = self._command_bullet(number, command.target)
+                done = chatbot.delete_bullet(index, bullet)
+                message = f"Deleted bullet {bullet} from slide {number}"
+            elif action == ACTION_DELETE_SLIDE:
+                if len(self.deck.slides) == 1:
+                    raise ServiceError("Can't delete the only slide of the presentation")
+                done = chatbot.delete_slide(index)
+                message = f"Deleted slide {number}"
+                result_number = None
+            elif action == ACTION_DUPLICATE_SLIDE:
+                done = chatbot.duplicate_slide(index)
+                result_number = number + 1
+                message = f"Duplicated slide {number} as slide {result_number}"
+            elif action == ACTION_MOVE_SLIDE:
+                if command.place in (PLACE_BEFORE, PLACE_AFTER):
+                    other = self._command_slide(command.target)
+                    if other == number:
+                        raise ServiceError(f"Slide {number} can't be moved {command.place} itself")
+                    # Positions count after the slide is taken out of the order
+                    if command.place == PLACE_AFTER:
+                        result_number = other if number < other else other + 1
+                    else:
+                        result_number = other - 1 if number < other else other
+                else:
+                    result_number = self._command_slide(command.target, what="Position")
+                done = chatbot.move_slide(index, result_number - 1)
+                message = f"Moved slide {number} to position {result_number}"
+            elif action == ACTION_SWAP_SLIDES:
+                other = self._command_slide(command.target)
+                if other == number:
+                    raise ServiceError(f"Slide {number} can't be swapped with itself")
+                first, second = sorted((number, other))
+                with chatbot.history.group():
+                    done = chatbot.move_slide(first - 1, second - 1) and chatbot.move_slide(second - 2, first - 1)
+                message = f"Swapped slides {first} and {second}"
+                result_number = other
+            else:
+                raise ServiceError(f"Unknown edit command {action!r}")
+
+            if not done:
+                raise ServiceError(f"Couldn't carry out the command on slide {number}")
+            return {
+                'command': action,
+                'message': message,
+                'slide_number': result_number,
+                'slide': chatbot.get_slide_content(result_number) if result_number else None,
+                'total_slides': len(self.deck.slides),
+            }
+
+    def _apply_history_command(self, command):
+        history = self.chatbot.history
+        labels = {version['number']: version['label'] for version in history.versions()}
+        before = history.position
+        if command.action == ACTION_UNDO:
+            result = self.undo(command.target)
+            steps = before - result['version']
+            message = f'Undid "{labels[before]}"' if steps == 1 else f"Undid {steps} changes"
+        elif command.action == ACTION_REDO:
+            result = self.redo(command.target)
+            steps = result['version'] - before
+            message = f'Redid "{result["label"]}"' if steps == 1 else f"Redid {steps} changes"
+        else:
+            result = self.checkout(history.first if command.target is None else command.target)
+            message = f'Restored version {result["version"]} ("{result["label"]}")'
+        return {
+            'command': command.action,
+            'message': message,
+            'slide_number': None,
+            'slide': None,
+            'total_slides': result['total_slides'],
+            'version': result['version'],
+        }
+
+    def history(self):
+        """Return ``{'position', 'versions': [{'number', 'label', 'parts', 'current', 'created'}], 'memory_bytes'}``"""
+        with self.lock:
+            self._require_deck()
+            history = self.chatbot.history
+            return {'position': history.position, 'versions': history.versions(), 'memory_bytes': history.memory_bytes()}
+
+    def checkout(self, version):
+        """Restore the deck to a version of its history; returns ``{'version', 'label', 'total_slides'}``"""
+        with self.lock:
+            self._require_deck()
+            history = self.chatbot.history
+            if not history.first <= version <= history.last:
+                raise ServiceError(f"Version {version} not found; versions {history.first}-{history.last} exist")
+            self.chatbot.checkout(version)
+            label = next(entry['label'] for entry in history.versions() if entry['number'] == version)
+            return {'version': version, 'label': label, 'total_slides': len(self.deck.slides)}
+
+    def undo(self, steps=1):
+        """Go back ``steps`` versions"""
+        with self.lock:
+            self._require_deck()
+            history = self.chatbot.history
+            if steps < 1:
+                raise ServiceError("Steps must be at least 1")
+            if not history.can_undo:
+                raise ServiceError("Nothing to undo")
+            return self.checkout(max(history.first, history.position - steps))
+
+    def redo(self, steps=1):
+        """Re-apply ``steps`` undone versions"""
+        with self.lock:
+            self._require_deck()
+            history = self.chatbot.history
+            if steps < 1:
+                raise ServiceError("Steps must be at least 1")
+            if not history.can_redo:
+                raise ServiceError("Nothing to redo")
+            return self.checkout(min(history.last, history.position + steps))
+
+    def set_slide(self, slide_number, title=None, content=None):
+        """Replace a slide's title and/or bullet points directly, without a model call"""
+        new_content = {}
+        if title is not None:
+            new_content['title'] = title
+        if content is not None:
+            new_content['content'] = list(content)
+        with self.lock:
+            self._require_deck()
+            number = self._resolve_slide(slide_number)
+            if not number:
+                raise ServiceError("A slide number is required")
+            if not new_content or not self.chatbot.edit_slide_content(number - 1, new_content):
+                raise ServiceError(f"Failed to update slide {number}")
+            return {'edited': {number: new_content}, 'missing': []}
+
+    def add_slide(self, request, mode=None):
+        """Append a slide generated from ``request``; returns its number and content"""
+        mode = self._mode(mode)
+        with self.lock:
+            self._require_deck()
+            new_content = self._generate_slide(build_add_slide_prompt(request), mode)
+            if not new_content:
+                raise ServiceError("Couldn't understand what content to add to the new slide")
+            if not self.chatbot.add_new_slide(new_content):
+                raise ServiceError("Failed to add the new slide")
+            return {'slide_number': len(self.deck.slides), 'slide': new_content}
+
+    def add_chart(self, chart_data, chart_type="bar", native=False):
+        """Append a chart slide from ``{'title', 'labels', 'values'}``"""
+        with self.lock:
+            self._require_deck()
+            if native:
+                added = self.chatbot.add_native_chart_slide(chart_data, chart_type)
+            else:
+                added = self.chatbot.add_chart_slide(chart_data, chart_type)
+            if not added:
+                raise ServiceError("Failed to add the chart")
+            return {'slide_number': len(self.deck.slides)}
+
+    def view(self, slide_number=None, slide_query=None):
+        """Return one slide's content, or the deck summary when no slide is given"""
+        with self.lock:
+            self._require_deck()
+            number = self._resolve_slide(slide_number, slide_query)
+            if not number:
+                return self.summary()
+            slide = self.chatbot.get_slide_content(number)
+            if slide is None:
+                raise ServiceError(f"Slide {number} not found")
+            return {'slide_number': number, 'slide': slide}
+
+    def summary(self):
+        """Return ``{'total_slides', 'slides': [{'number', 'title', 'content_points'}]}``"""
+        with self.lock:
+            self._require_deck()
+            summary = self.chatbot.get_presentation_summary()
+            if summary is None:
+                raise ServiceError("Could not read the presentation structure")
+            return summary
+
+    def chat(self, request):
+        """Answer a request that is not a deck operation"""
+        # Not cached: the same question asked after the deck changed deserves a fresh answer
+        return {'reply': self.chatbot.generate_text(build_chat_prompt(request), cache=False)}
+
+    def handle(self, prompt, mode=None):
+        """Route a chat prompt to create / edit / add / view / chat and run it.
+
+        Simple edit commands ("delete slide 3", "rename slide 2 to ...") are
+        applied locally before routing. Returns the operation's result with the
+        routed ``'intent'`` added.
+        """
+        local = self.try_command(prompt)
+        if local is not None:
+            return dict(local, intent=INTENT_EDIT)
+        route = INTENT_ROUTER.route(prompt)
+        if route.intent == INTENT_CREATE:
+            result = self.create(route.topic, route.slide_count, request=prompt, mode=mode)
+        elif route.intent == INTENT_EDIT:
+            result = self.edit(prompt, route.slide_number, route.slide_query, route.slide_numbers, mode=mode)
+        elif route.intent == INTENT_ADD_SLIDE:
+            result = self.add_slide(prompt, mode=mode)
+        elif route.intent == INTENT_VIEW:
+            result = self.view(route.slide_number, route.slide_query)
+        else:
+            result = self.chat(prompt)
+        return dict(result, intent=route.intent)
+
+    def load(self, source):
+        """Load a deck from a path, file object, bytes or memoryview"""
+        with self.lock:
+            if not self.chatbot.load_presentation(source):
+                raise ServiceError("Failed to load the presentation; is it a valid .pptx file?")
+            return self.chatbot.get_presentation_summary()
+
+    def to_bytes(self):
+        """Serialize the deck (incrementally, reusing parts unchanged since the last save)"""
+        with self.lock:
+            self._require_deck()
+            return self.chatbot.get_pptx_bytes()
+
+    def save(self, path):
+        """Write the deck to ``path`` and return the number of bytes written"""
+        data = self.to_bytes()
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
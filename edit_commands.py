@@ -0,0 +1,243 @@
+"""Local fast path for simple edit commands.
+
+"Edit slide 2 title to New Marketing Strategy" needs no model: the new
+title is right there in the request. ``parse_edit_command`` matches a small
+grammar of such commands (retitle a slide; replace, add or delete a bullet;
+move, delete, duplicate or swap slides; undo, redo or restore a version of
+the deck) and returns an ``EditCommand`` that
+``DeckService.apply_command`` carries out directly on the deck, in
+microseconds instead of a model round trip. Anything the grammar does not
+match in full, such as "make slide 3 more concise", returns None and goes
+to the model as before.
+
+``COMMAND_STATS`` counts edit requests served locally versus by the model.
+"""
+import re
+import threading
+from dataclasses import dataclass
+
+from intent_router import ORDINALS
+
+ACTION_RETITLE = 'retitle'
+ACTION_REPLACE_BULLET = 'replace_bullet'
+ACTION_ADD_BULLET = 'add_bullet'
+ACTION_DELETE_BULLET = 'delete_bullet'
+ACTION_MOVE_SLIDE = 'move_slide'
+ACTION_DELETE_SLIDE = 'delete_slide'
+ACTION_DUPLICATE_SLIDE = 'duplicate_slide'
+ACTION_SWAP_SLIDES = 'swap_slides'
+ACTION_UNDO = 'undo'
+ACTION_REDO = 'redo'
+ACTION_CHECKOUT = 'checkout'
+
+# Commands on the deck's version history rather than on one slide
+HISTORY_ACTIONS = (ACTION_UNDO, ACTION_REDO, ACTION_CHECKOUT)
+
+# Slide and bullet references resolve to 1-based numbers; LAST is "the last one"
+LAST = -1
+
+# Where a moved slide goes relative to ``EditCommand.target``
+PLACE_AT = 'at'
+PLACE_BEFORE = 'before'
+PLACE_AFTER = 'after'
+
+
+@dataclass(frozen=True)
+class EditCommand:
+    """A parsed edit command; ``target`` is a bullet number, a position, a second slide,
+    a number of undo/redo steps or a version; ``slide`` is None for history commands"""
+    action: str
+    slide: int
+    target: int = None
+    text: str = None
+    place: str = PLACE_AT
+
+
+_ORDINAL = '|'.join(list(ORDINALS) + ['last'])
+_POLITE = r'(?:(?:please|can you|could you|would you)\s+)*'
+_END = r'\s*[.!]?\s*$'
+# "change the title to something catchier" describes the text instead of giving it;
+# only whole phrasings like these count, so "Better Outcomes" is still a title
+_QUALITY = (r'(?:better|shorter|longer|catchier|catchy|clearer|clear|simpler|punchier|snappier|concise|'
+            r'engaging|interesting|exciting|compelling|professional|formal|casual|descriptive|specific|wordy)')
+_VAGUE_TEXT = re.compile(
+    rf'^(?:(?:something|anything)(?:\s+else)?|(?:be|sound|look|read)|a|an)?\s*'
+    rf'(?:(?:a\s+(?:bit|little)\s+|much\s+|even\s+)?(?:more|less)\s+)?{_QUALITY}?'
+    rf'(?:\s+(?:one|title|version|heading|wording|text|bullet|point))?\s*[.!]?$',
+    re.IGNORECASE
+)
+_BULLET_NOUN = r'(?:bullet(?:\s+point)?|point|line)'
+
+
+def _slide(name):
+    """``slide 3`` / ``slide #3`` / ``the third slide`` / ``the last slide``"""
+    return (rf'(?:the\s+)?(?:slide\s+(?:number\s+|no\.?\s*|#)?(?P<{name}>\d+|last)'
+            rf'|(?P<{name}_ord>{_ORDINAL})\s+slide)')
+
+
+def _bullet(name):
+    """``bullet 2`` / ``point #2`` / ``the 2nd bullet`` / ``the last bullet point``"""
+    return (rf'(?:the\s+)?(?:{_BULLET_NOUN}\s+(?:number\s+|no\.?\s*|#)?(?P<{name}>\d+)'
+            rf'|(?:(?P<{name}_num>\d+)(?:st|nd|rd|th)|(?P<{name}_ord>{_ORDINAL}))\s+{_BULLET_NOUN})')
+
+
+_TEXT = r'(?P<text>.+)'
+_SLIDE = _slide('slide')
+_BULLET = _bullet('bullet')
+
+# (action, pattern) in match order; every pattern must match the whole request
+_GRAMMAR = [
+    (ACTION_RETITLE, (
+        rf"(?:edit|change|update|set)\s+{_SLIDE}(?:'s)?\s+title\s+(?:to|as)\s+{_TEXT}",
+        rf"(?:edit|change|update|set)\s+the\s+title\s+(?:of|on|for)\s+{_SLIDE}\s+(?:to|as)\s+{_TEXT}",
+        rf"(?:rename|retitle)\s+{_SLIDE}\s+(?:to|as)\s+{_TEXT}",
+    )),
+    (ACTION_REPLACE_BULLET, (
+        rf"(?:replace|change|edit|update|set|rewrite|make)\s+{_BULLET}\s+(?:on|of|in)\s+{_SLIDE}\s+(?:to|with|into|as)\s+{_TEXT}",
+        rf"(?:replace|change|edit|update|set|rewrite|make)\s+{_SLIDE}(?:'s)?\s+{_BULLET}\s+(?:to|with|into|as)\s+{_TEXT}",
+    )),
+    (ACTION_ADD_BULLET, (
+        rf"(?:add|append|insert)\s+(?:a\s+|another\s+|one\s+more\s+)?(?:new\s+)?{_BULLET_NOUN}\s+(?:to|on|in)\s+{_SLIDE}"
+        rf"\s*(?::|saying|that\s+says|reading|with(?:\s+the\s+text)?)?\s*{_TEXT}",
+        rf"(?:add|append)\s+[\"“](?P<quoted>.+)[\"”]\s+(?:to|on)\s+{_SLIDE}",
+    )),
+    (ACTION_DELETE_BULLET, (
+        rf"(?:delete|remove|drop)\s+{_BULLET}\s+(?:from|on|of|in)\s+{_SLIDE}",
+        rf"(?:delete|remove|drop)\s+{_SLIDE}(?:'s)?\s+{_BULLET}",
+    )),
+    (ACTION_DELETE_SLIDE, (
+        rf"(?:delete|remove|drop)\s+{_SLIDE}",
+    )),
+    (ACTION_DUPLICATE_SLIDE, (
+        rf"(?:duplicate|copy|clone)\s+{_SLIDE}",
+    )),
+    (ACTION_MOVE_SLIDE, (
+        rf"move\s+{_SLIDE}\s+(?:to\s+)?(?:(?:position|slot|place)\s+)?(?P<position>\d+)(?:st|nd|rd|th)?(?:\s+(?:position|place))?",
+        rf"move\s+{_SLIDE}\s+to\s+the\s+(?P<end>end|back|start|beginning|front)(?:\s+of\s+the\s+(?:deck|presentation))?",
+        rf"move\s+{_SLIDE}\s+(?P<place>before|after)\s+{_slide('other')}",
+    )),
+    (ACTION_SWAP_SLIDES, (
+        r"(?:swap|switch|exchange)\s+slides?\s+(?P<slide>\d+)\s+(?:and|with)\s+(?:slide\s+)?(?P<other>\d+)",
+    )),
+    (ACTION_UNDO, (
+        r"undo(?:\s+(?:that|it|this|the\s+last\s+(?:change|edit)|my\s+last\s+(?:change|edit)))?",
+        r"undo\s+(?:the\s+last\s+)?(?P<steps>\d+)\s+(?:changes|edits|steps)",
+    )),
+    (ACTION_REDO, (
+        r"redo(?:\s+(?:that|it|this|the\s+last\s+(?:change|edit)))?",
+        r"redo\s+(?P<steps>\d+)\s+(?:changes|edits|steps)",
+    )),
+    (ACTION_CHECKOUT, (
+        r"(?:restore|revert\s+to|go\s+back\s+to|return\s+to|switch\s+to|check\s*out)\s+version\s+(?:#|number\s+)?(?P<version>\d+)",
+        r"(?:restore|revert\s+to|go\s+back\s+to|return\s+to)\s+the\s+original(?:\s+(?:version|deck|presentation))?",
+    )),
+]
+
+_COMPILED = [
+    (action, [re.compile(rf'^{_POLITE}{pattern}{_END}', re.IGNORECASE) for pattern in patterns])
+    for action, patterns in _GRAMMAR
+]
+
+
+def _number(groups, name):
+    """Resolve a slide/bullet reference from its digit, ordinal or ``last`` group"""
+    for key in (name, f'{name}_num', f'{name}_ord'):
+        value = groups.get(key)
+        if value:
+            value = value.lower()
+            if value == 'last':
+                return LAST
+            return int(value) if value.isdigit() else ORDINALS[value]
+    return None
+
+
+_QUOTES = '"\'“”‘’'
+
+
+def _clean_text(text):
+    text = text.strip()
+    if len(text) > 1 and text[-1] in '.!' and text[-2] in _QUOTES:
+        text = text[:-1]  # 'Q3 Results'.
+    return text.strip(_QUOTES).strip()
+
+
+def parse_edit_command(prompt):
+    """Return the ``EditCommand`` for ``prompt``, or None if it needs the model"""
+    prompt = ' '.join(prompt.split())
+    for action, patterns in _COMPILED:
+        for pattern in patterns:
+            match = pattern.match(prompt)
+            if match is None:
+                continue
+            groups = match.groupdict()
+            slide = _number(groups, 'slide')
+            text = groups.get('text') or groups.get('quoted')
+            if text is not None:
+                text = _clean_text(text)
+                if not text or _VAGUE_TEXT.match(text):
+                    continue
+                if action == ACTION_RETITLE:
+                    text = text.rstrip('.')
+
+            if action in (ACTION_REPLACE_BULLET, ACTION_DELETE_BULLET):
+                return EditCommand(action, slide, target=_number(groups, 'bullet'), text=text)
+            if action == ACTION_MOVE_SLIDE:
+                if groups.get('position'):
+                    return EditCommand(action, slide, target=int(groups['position']))
+                if groups.get('end'):
+                    end = groups['end'].lower()
+                    return EditCommand(action, slide, target=LAST if end in ('end', 'back') else 1)
+                return EditCommand(action, slide, target=_number(groups, 'other'), place=groups['place'].lower())
+            if action == ACTION_SWAP_SLIDES:
+                return EditCommand(action, slide, target=_number(groups, 'other'))
+            if action in (ACTION_UNDO, ACTION_REDO):
+                return EditCommand(action, None, target=int(groups.get('steps') or 1))
+            if action == ACTION_CHECKOUT:
+                # No version number: the original deck
+                version = groups.get('version')
+                return EditCommand(action, None, target=int(version) if version else None)
+            return EditCommand(action, slide, text=text)
+    return None
+
+
+class CommandStats:
+    """How many edit requests were served locally versus by the model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.local = 0
+        self.model = 0
+        self.by_action = {}
+
+    def record_local(self, action):
+        with self._lock:
+            self.local += 1
+            self.by_action[action] = self.by_action.get(action, 0) + 1
+
+    def record_model(self):
+        with self._lock:
+            self.model += 1
+
+    @property
+    def requests(self):
+        return self.local + self.model
+
+    @property
+    def local_share(self):
+        return self.local / self.requests if self.requests else 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'local': self.local,
+                'model': self.model,
+                'local_share': round(self.local_share, 4),
+                'by_action': dict(self.by_action),
+            }
+
+
+COMMAND_STATS = CommandStats()
@@ -0,0 +1,198 @@
+"""Process-wide Gemini model client.
+
+Creating a ``GenerativeModel`` and configuring the SDK is done once per
+process and shared by every Streamlit session, instead of once per
+``PowerPointChatbot``. The client holds no per-session state, so it is
+safe to use from Streamlit's worker threads concurrently.
+
+Every model call goes through the same flow control: an optional
+requests-per-minute token bucket, a cap on concurrent requests, coalescing
+of identical in-flight prompts and jittered backoff on 429/5xx errors.
+"""
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+from metrics import METRICS
+from rate_limit import SingleFlight, TokenBucket, call_with_backoff
+from response_cache import ResponseCache, make_cache_key
+
+DEFAULT_MODEL_NAME = 'gemini-2.5-flash'
+
+_configure_lock = threading.Lock()
+_configured = False
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def configure_gemini(api_key=None, transport=None):
+    """Configure the Gemini SDK once per process"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        options = {'api_key': api_key or os.getenv("GEMINI_API_KEY")}
+        transport = transport or os.getenv("GEMINI_TRANSPORT")
+        if transport:
+            options['transport'] = transport
+        # The SDK takes seconds to import, so it is loaded on first model use
+        import google.generativeai as genai
+        genai.configure(**options)
+        _configured = True
+
+
+class GeminiClient:
+    """Thread-safe wrapper around a Gemini model and its response cache"""
+
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, model=None, response_cache=None,
+                 requests_per_minute=None, max_concurrency=None, max_retries=3,
+                 base_delay=0.5, max_delay=20.0, coalesce=True):
+        if model is None:
+            import google.generativeai as genai
+            configure_gemini()
+            model = genai.GenerativeModel(model_name)
+        self.model = model
+        self.model_name = getattr(model, 'model_name', model_name)
+        self.response_cache = response_cache
+
+        self.rate_limiter = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._single_flight = SingleFlight() if coalesce else None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'retries': 0, 'coalesced': 0, 'errors': 0, 'throttled_seconds': 0.0}
+
+    @classmethod
+    def from_env(cls, response_cache=None, **overrides):
+        """Create a client limited by GEMINI_RPM / GEMINI_MAX_CONCURRENCY / GEMINI_MAX_RETRIES"""
+        settings = dict(
+            response_cache=response_cache,
+            requests_per_minute=float(os.getenv("GEMINI_RPM", "0")) or None,
+            max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")) or None,
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "3")),
+        )
+        settings.update(overrides)
+        return cls(**settings)
+
+    def _cache_key(self, prompt, generation_config=None):
+        return make_cache_key(prompt, self.model_name, generation_config)
+
+    def _record(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        """Return request, retry, coalescing and throttling counters"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _slot(self):
+        return self._slots if self._slots is not None else nullcontext()
+
+    def _throttled(self, call, stage='model'):
+        # Wait for the rate limiter, then make the request
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+            self._record('throttled_seconds', waited)
+            METRICS.observe('rate_limit_wait', waited)
+        self._record('requests')
+        with METRICS.time(stage):
+            return call()
+
+    def _with_retries(self, attempt):
+        try:
+            return call_with_backoff(
+                attempt, self.max_retries, self.base_delay, self.max_delay,
+                on_retry=lambda error, delay: self._record('retries'),
+            )
+        except Exception:
+            self._record('errors')
+            raise
+
+    def _send(self, call):
+        """Run one model request under the rate limit and concurrency cap, with retries"""
+        def attempt():
+            # The slot is released while backing off, so waiting retries don't block others
+            with self._slot():
+                return self._throttled(call)
+
+        return self._with_retries(attempt)
+
+    def generate_text(self, prompt, generation_config=None, cache=True):
+        """Generate text with Gemini AI, serving repeated prompts from the response cache.
+
+        Pass ``cache=False`` for free-form answers that should not be replayed
+        later, such as chat replies.
+        """
+        key = self._cache_key(prompt, generation_config)
+        if cache and self.response_cache is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        def request():
+            if generation_config:
+                response = self._send(lambda: self.model.generate_content(prompt, generation_config=generation_config))
+            else:
+                response = self._send(lambda: self.model.generate_content(prompt))
+            text = response.text
+            if cache and self.response_cache is not None and text:
+                self.response_cache.set(key, text)
+            return text
+
+        if self._single_flight is None:
+            return request()
+        # Identical prompts already in flight (from any session) share one request
+        text, shared = self._single_flight.do(key, request)
+        if shared:
+            self._record('coalesced')
+        return text
+
+    def generate_content_stream(self, prompt):
+        """Stream generated text from Gemini AI chunk by chunk"""
+        key = self._cache_key(prompt)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                # A cached outline is complete, so it arrives as a single chunk
+                yield cached
+                return
+
+        # Retries cover opening the stream; a stream that fails halfway is not replayed.
+        # The concurrency slot is held until the stream is consumed.
+        with self._slot():
+            start = time.perf_counter()
+            response = self._with_retries(
+                lambda: self._throttled(lambda: self.model.generate_content(prompt, stream=True), 'model_stream_open')
+            )
+            parts = []
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. safety metadata) carry no content
+                    continue
+                if text:
+                    if not parts:
+                        METRICS.observe('model_first_chunk', time.perf_counter() - start)
+                    parts.append(text)
+                    yield text
+
+        # Only cache streams that ran to completion
+        if self.response_cache is not None and parts:
+            self.response_cache.set(key, "".join(parts))
+
+
+def get_shared_client():
+    """Return the process-wide client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = GeminiClient.from_env(response_cache=ResponseCache.from_env())
+    return _shared_client
@@ -0,0 +1,240 @@
+"""Chat intent routing.
+
+Every chat turn used to lowercase the prompt several times and scan four
+keyword lists one ``in`` test at a time, then re-run the topic, slide count
+and slide number extractors (each lowercasing again and compiling its own
+regexes). ``IntentRouter`` compiles each intent's keywords into one regex
+at startup and returns intent, topic, slide count and slide number from
+one call on a prompt that is lowercased once.
+"""
+import re
+from dataclasses import dataclass
+
+# Intents in priority order: when a prompt matches several, the first wins
+INTENT_CREATE = 'create'
+INTENT_EDIT = 'edit'
+INTENT_ADD_SLIDE = 'add_slide'
+INTENT_VIEW = 'view'
+INTENT_CHAT = 'chat'
+
+# Only these handlers look slides up by subject or by a list of numbers
+SLIDE_REFERENCE_INTENTS = (INTENT_EDIT, INTENT_VIEW)
+
+INTENT_KEYWORDS = {
+    INTENT_CREATE: [
+        "create a presentation", "make a presentation", "generate a presentation",
+        "create presentation", "make presentation", "generate presentation",
+        "create ppt", "make ppt", "generate ppt", "create powerpoint",
+        "presentation on", "presentation about", "slides about", "slides on"
+    ],
+    INTENT_EDIT: [
+        "edit slide", "modify slide", "change slide", "update slide",
+        "edit content", "modify content", "change content", "update content",
+        "edit presentation", "modify presentation", "update presentation",
+        "edit the slide", "modify the slide", "change the slide", "update the slide",
+        "rename slide", "retitle slide"
+    ],
+    INTENT_ADD_SLIDE: [
+        "add slide", "add new slide", "create slide", "insert slide",
+        "add a slide", "create new slide", "new slide about"
+    ],
+    INTENT_VIEW: [
+        "show me slide", "view slide", "display slide", "what's in slide",
+        "slide content", "content of slide", "show slide",
+        "show me the slide", "show the slide", "view the slide", "display the slide",
+        "find the slide", "which slide"
+    ],
+}
+
+TOPIC_INDICATORS = [
+    "presentation on", "presentation about", "about", "on",
+    "slides about", "slides on", "ppt on", "ppt about",
+    "create a presentation on", "create a presentation about",
+    "make a presentation on", "make a presentation about"
+]
+
+SLIDE_COUNT_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(\d+)\s*slides?',
+    r'include\s*(\d+)\s*slides?',
+    r'with\s*(\d+)\s*slides?',
+    r'want\s*(\d+)\s*slides?',
+    r'need\s*(\d+)\s*slides?',
+    r'make\s*(\d+)\s*slides?'
+]]
+
+SLIDE_NUMBER_PATTERNS = [re.compile(pattern) for pattern in [
+    r'slide\s*(\d+)',
+    r'slide\s*number\s*(\d+)',
+    r'(\d+)(?:st|nd|rd|th)?\s*slide',
+]]
+
+# "slides 1, 3 and 5", "slides 2-6", "slide 1 and 2"
+SLIDE_LIST_PATTERN = re.compile(
+    r"\bslides?\s+(?:number\s*)?"
+    r"(\d+(?:\s*(?:,\s*(?:and\s+)?|and|&|-|–|to|through|thru)\s*\d+)*)"
+)
+SLIDE_RANGE_PATTERN = re.compile(r"(\d+)\s*(?:-|–|to|through|thru)\s*(\d+)|(\d+)")
+
+# Ranges larger than this are treated as typos rather than expanded
+MAX_SLIDE_RANGE = 100
+
+# "the slide about pricing" -> "pricing"
+SLIDE_QUERY_PATTERN = re.compile(
+    r"\bslides?\s+(?:that|which)?\s*"
+    r"(?:about|on|regarding|covering|covers|discussing|discusses|talks about|mentioning|mentions|with)\s+"
+    r"(?!\d)(.+)"
+)
+
+ORDINALS = {
+    'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5,
+    'sixth': 6, 'seventh': 7, 'eighth': 8, 'ninth': 9, 'tenth': 10
+}
+
+DEFAULT_SLIDE_COUNT = 5
+
+
+def extract_topic(clean_prompt):
+    """Extract the main topic from a lowercased, stripped presentation request."""
+    # Find the topic after common indicators
+    for indicator in TOPIC_INDICATORS:
+        if indicator in clean_prompt:
+            # Split by the indicator and take the part after it
+            parts = clean_prompt.split(indicator, 1)
+            if len(parts) > 1:
+                topic = parts[1].strip()
+                # Remove common words at the beginning
+                topic = topic.replace("the ", "").replace("a ", "").replace("an ", "")
+                # Remove trailing requests like "and i want 5 slides"
+                if " and " in topic:
+                    topic = topic.split(" and ")[0]
+                if " with " in topic:
+                    topic = topic.split(" with ")[0]
+                return topic.strip()
+
+    # If no specific indicator found, try to extract from common patterns
+    if "create" in clean_prompt or "make" in clean_prompt or "generate" in clean_prompt:
+        # Look for words after "presentation" or "ppt"
+        words = clean_prompt.split()
+        for i, word in enumerate(words):
+            if word in ["presentation", "ppt", "powerpoint", "slides"]:
+                if i + 1 < len(words) and words[i + 1] in ["on", "about"]:
+                    # Get everything after "on/about"
+                    remaining = " ".join(words[i + 2:])
+                    if " and " in remaining:
+                        remaining = remaining.split(" and ")[0]
+                    if " with " in remaining:
+                        remaining = remaining.split(" with ")[0]
+                    return remaining.strip()
+
+    # Fallback: return a cleaned version of the prompt
+    fallback = clean_prompt.replace("create", "").replace("make", "").replace("generate", "")
+    fallback = fallback.replace("presentation", "").replace("ppt", "").replace("powerpoint", "")
+    fallback = fallback.replace("a ", "").replace("the ", "").strip()
+
+    return fallback if fallback else "General Topic"
+
+
+def extract_slide_count(lowered_prompt, default=DEFAULT_SLIDE_COUNT):
+    """Extract the number of slides requested from a lowercased prompt, or ``default`` when it names none."""
+    for pattern in SLIDE_COUNT_PATTERNS:
+        match = pattern.search(lowered_prompt)
+        if match:
+            count = int(match.group(1))
+            # Reasonable range check
+            if 2 <= count <= 15:
+                return count
+
+    return default
+
+
+def extract_slide_number(lowered_prompt):
+    """Extract a slide number from a lowercased editing request."""
+    for pattern in SLIDE_NUMBER_PATTERNS:
+        match = pattern.search(lowered_prompt)
+        if match:
+            return int(match.group(1))
+
+    # Look for ordinal words
+    for word, num in ORDINALS.items():
+        if word in lowered_prompt:
+            return num
+
+    return None
+
+
+def extract_slide_numbers(lowered_prompt):
+    """Extract every slide number and range from a lowercased request, in order."""
+    numbers = []
+    for match in SLIDE_LIST_PATTERN.finditer(lowered_prompt):
+        for start, end, single in SLIDE_RANGE_PATTERN.findall(match.group(1)):
+            if single:
+                numbers.append(int(single))
+                continue
+            start, end = int(start), int(end)
+            if start > end:
+                start, end = end, start
+            if end - start < MAX_SLIDE_RANGE:
+                numbers.extend(range(start, end + 1))
+    # Keep first mention order, drop repeats
+    return tuple(dict.fromkeys(numbers))
+
+
+def extract_slide_query(lowered_prompt):
+    """Extract what a slide is about from "... the slide about X" phrasing."""
+    match = SLIDE_QUERY_PATTERN.search(lowered_prompt)
+    if not match:
+        return None
+    query = match.group(1).strip(" .!?\"'")
+    # Drop trailing politeness and the edit instruction that follows the subject
+    for separator in (" please", " to ", " so ", " and "):
+        if separator in query:
+            query = query.split(separator, 1)[0]
+    return query.strip() or None
+
+
+@dataclass(frozen=True)
+class Route:
+    """Everything the chat handlers need to know about one prompt"""
+    intent: str
+    topic: str
+    slide_count: int
+    slide_number: object  # int or None
+    # Extracted for SLIDE_REFERENCE_INTENTS only
+    slide_query: object = None  # str or None, e.g. "pricing" in "the slide about pricing"
+    slide_numbers: tuple = ()  # every slide mentioned, ranges expanded, e.g. (2, 3, 4)
+
+
+class IntentRouter:
+    """One compiled matcher per intent, tried in priority order"""
+
+    def __init__(self, intent_keywords=None):
+        self.intent_keywords = intent_keywords or INTENT_KEYWORDS
+        self.intents = list(self.intent_keywords)
+        # A search per intent stops at the first intent that matches, and is
+        # about three times faster than one lookahead over every keyword at
+        # every position
+        self._matchers = [
+            (intent, re.compile('|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))))
+            for intent, keywords in self.intent_keywords.items()
+        ]
+
+    def match_intent(self, lowered_prompt):
+        """Return the highest-priority intent whose keywords occur in the prompt"""
+        for intent, matcher in self._matchers:
+            if matcher.search(lowered_prompt):
+                return intent
+        return INTENT_CHAT
+
+    def route(self, prompt):
+        """Classify a chat prompt and extract topic, slide count and slide references"""
+        lowered = prompt.lower()
+        intent = self.match_intent(lowered)
+        references = intent in SLIDE_REFERENCE_INTENTS
+        return Route(
+            intent=intent,
+            topic=extract_topic(lowered.strip()),
+            slide_count=extract_slide_count(lowered),
+            slide_number=extract_slide_number(lowered),
+            slide_query=extract_slide_query(lowered) if references else None,
+            slide_numbers=extract_slide_numbers(lowered) if references else (),
+        )
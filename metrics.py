@@ -0,0 +1,169 @@
+"""Per-stage timing and counters.
+
+Stages (prompt build, model call, parse, slide build, save, ...) record
+their durations into fixed-bucket histograms, like Prometheus histograms,
+plus a window of recent samples for p50/p90/p99. ``METRICS`` is
+process-wide. It can be read as JSON (``snapshot``), rendered in the
+Prometheus text format, or served over HTTP by ``serve_metrics``.
+"""
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, from sub-millisecond parsing to slow model calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class StageHistogram:
+    """Bucketed durations for one stage plus a window of recent samples"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=2048):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        self.bucket_counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self):
+        samples = sorted(self.recent)
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(percentile(samples, 0.50) * 1000, 3),
+            'p90_ms': round(percentile(samples, 0.90) * 1000, 3),
+            'p99_ms': round(percentile(samples, 0.99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and counters"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=2048):
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._counters = {}
+
+    def observe(self, stage, seconds):
+        """Record one duration for ``stage``"""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = StageHistogram(self.buckets, self.window)
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1):
+        """Add ``amount`` to counter ``name``"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def time(self, stage):
+        """Time the body of a ``with`` block as ``stage`` (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator that times every call of the function as ``stage``"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Return ``{'stages': {stage: percentiles}, 'counters': {...}}``"""
+        with self._lock:
+            return {
+                'stages': {stage: histogram.snapshot() for stage, histogram in sorted(self._stages.items())},
+                'counters': dict(sorted(self._counters.items())),
+            }
+
+    def render_prometheus(self, prefix='pptbot'):
+        """Render every stage and counter in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per processing stage",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._stages.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float('inf'),), histogram.bucket_counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            for name, value in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = self.server.metrics.render_prometheus().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4'
+        elif self.path in ('/stats', '/stats.json'):
+            body = json.dumps(self.server.metrics.snapshot(), indent=2).encode('utf-8')
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host='127.0.0.1', metrics=METRICS):
+    """Serve ``/metrics`` (Prometheus) and ``/stats.json`` from a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
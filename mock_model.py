@@ -0,0 +1,147 @@
+"""Deterministic stand-in for ``genai.GenerativeModel``.
+
+Used to benchmark and exercise the generation paths offline. Responses are
+derived from the prompt (same prompt, same answer) and latency is simulated
+as a fixed per-call cost plus a per-output-line cost, so longer answers take
+longer just like the real model.
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+
+_COUNT_RE = re.compile(r'EXACTLY\s+(\d+)\s+slides', re.IGNORECASE)
+_SLIDE_TITLE_RE = re.compile(r'slide titled "([^"]+)"', re.IGNORECASE)
+_TOPIC_RE = re.compile(r'about "([^"]+)"', re.IGNORECASE)
+_BATCH_SLIDE_RE = re.compile(r'^\s*## Slide (\d+)\s*$', re.MULTILINE)
+
+_WORDS = [
+    'strategy', 'growth', 'customers', 'platform', 'insights', 'automation',
+    'revenue', 'adoption', 'quality', 'efficiency', 'roadmap', 'analytics',
+    'innovation', 'security', 'teams', 'markets', 'investment', 'delivery',
+]
+
+
+class MockResponse:
+    """Minimal response/chunk object exposing ``.text`` like the SDK"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class MockGeminiModel:
+    """Fake Gemini model with deterministic output and simulated latency"""
+
+    def __init__(self, latency=0.0, latency_per_line=0.0, seed=0, fail_every=0,
+                 malformed_every=0, incomplete_every=0, model_name='mock-gemini'):
+        self.latency = latency
+        self.latency_per_line = latency_per_line
+        self.seed = seed
+        self.fail_every = fail_every
+        self.malformed_every = malformed_every
+        self.incomplete_every = incomplete_every
+        self.model_name = model_name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False, generation_config=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+        if self.fail_every and call_number % self.fail_every == 0:
+            time.sleep(self.latency)
+            raise RuntimeError("Mock model transient failure")
+
+        text = self.respond(prompt)
+        if self.incomplete_every and call_number % self.incomplete_every == 0:
+            text = self._cut_short(text)
+        wants_json = (generation_config or {}).get('response_mime_type') == 'application/json'
+        if wants_json:
+            text = self.as_json(text)
+        if self.malformed_every and call_number % self.malformed_every == 0:
+            text = self._malform(text, wants_json)
+        lines = text.splitlines(keepends=True)
+        if not stream:
+            time.sleep(self.latency + self.latency_per_line * len(lines))
+            return MockResponse(text)
+        return self._stream(lines)
+
+    def _stream(self, lines):
+        # The first chunk pays the request latency, later lines trickle in
+        time.sleep(self.latency)
+        for line in lines:
+            time.sleep(self.latency_per_line)
+            yield MockResponse(line)
+
+    def respond(self, prompt):
+        """Return the deterministic answer for ``prompt``"""
+        rng = random.Random(self.seed ^ zlib.crc32(prompt.encode('utf-8')))
+        topic_match = _TOPIC_RE.search(prompt)
+        topic = topic_match.group(1) if topic_match else 'the topic'
+
+        batch_numbers = _BATCH_SLIDE_RE.findall(prompt)
+        if batch_numbers:
+            # Batch edit: one "# Slide N: Title" section per requested slide
+            blocks = []
+            for number in batch_numbers:
+                title = f"# Slide {number}: {rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()}"
+                blocks.append(f"{title}\n{self._bullets(rng, title)}")
+            return "\n\n".join(blocks) + "\n"
+
+        title_match = _SLIDE_TITLE_RE.search(prompt)
+        if title_match:
+            return self._bullets(rng, title_match.group(1)) + "\n"
+
+        count_match = _COUNT_RE.search(prompt)
+        count = int(count_match.group(1)) if count_match else 1
+
+        if 'titles only' in prompt.lower():
+            return "\n".join(self._title(rng, topic, i) for i in range(count)) + "\n"
+
+        blocks = []
+        for i in range(count):
+            title = self._title(rng, topic, i)
+            blocks.append(f"{title}\n{self._bullets(rng, title)}")
+        return "\n\n".join(blocks) + "\n"
+
+    @staticmethod
+    def as_json(text):
+        """Convert a markdown answer to the JSON deck schema"""
+        slides = []
+        for line in text.splitlines():
+            if line.startswith('# '):
+                slides.append({'title': line[2:].strip(), 'content': []})
+            elif line.startswith('- ') and slides:
+                slides[-1]['content'].append(line[2:].strip())
+        return json.dumps({'slides': slides}, indent=1) + "\n"
+
+    @staticmethod
+    def _malform(text, wants_json):
+        # What real models occasionally do: truncated JSON, headings without '#'
+        if wants_json:
+            return text[:len(text) // 2]
+        return text.replace('# ', '').replace('- ', '')
+
+    @staticmethod
+    def _cut_short(text):
+        # What an answer that hit the output limit looks like: the last third
+        # of the slides is gone and one slide lost its bullet points
+        blocks = text.strip().split("\n\n")
+        if len(blocks) < 3:
+            return text
+        blocks = blocks[:len(blocks) - len(blocks) // 3]
+        middle = len(blocks) // 2
+        blocks[middle] = blocks[middle].split("\n", 1)[0]
+        return "\n\n".join(blocks) + "\n"
+
+    def _title(self, rng, topic, index):
+        return f"# {topic.title()}: {rng.choice(_WORDS).title()} {index + 1}"
+
+    def _bullets(self, rng, title):
+        bullets = []
+        for _ in range(rng.randint(3, 5)):
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(10, 18))]
+            bullets.append(f"- {' '.join(words).capitalize()} for {title.lstrip('# ').lower()}.")
+        return "\n".join(bullets)
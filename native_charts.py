@@ -0,0 +1,98 @@
+"""Native PowerPoint charts built from pandas DataFrames.
+
+A native chart stores its numbers in a small embedded workbook instead of a
+multi-megabyte PNG, and stays editable in PowerPoint. Large frames are
+reduced to at most ``max_points`` categories first, since a chart with
+thousands of bars is unreadable and slow to open. pandas and python-pptx's
+chart data (with xlsxwriter) are imported on first use, not at startup.
+"""
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+
+NATIVE_CHART_TYPES = {
+    'bar': XL_CHART_TYPE.COLUMN_CLUSTERED,
+    'line': XL_CHART_TYPE.LINE_MARKERS,
+    'pie': XL_CHART_TYPE.PIE,
+}
+
+DEFAULT_MAX_POINTS = 50
+
+
+def downsample_frame(df, label_column, value_columns, chart_type="bar",
+                     max_points=DEFAULT_MAX_POINTS, agg="sum"):
+    """Reduce ``df`` to at most ``max_points`` rows of label + value columns.
+
+    Repeated labels are aggregated first. Line charts are then bucketed into
+    evenly sized runs of consecutive rows (keeping the shape of the series);
+    bar and pie charts keep the largest categories and fold the rest into
+    "Other".
+    """
+    import pandas as pd  # already loaded by whoever built ``df``
+
+    frame = df[[label_column] + list(value_columns)]
+    if frame[label_column].duplicated().any():
+        frame = frame.groupby(label_column, sort=False, as_index=False)[list(value_columns)].agg(agg)
+
+    if len(frame) <= max_points:
+        return frame
+
+    if chart_type == "line":
+        bucket = -(-len(frame) // max_points)  # ceiling division
+        frame = frame.reset_index(drop=True)
+        groups = frame.index // bucket
+        values = frame.groupby(groups)[list(value_columns)].mean()
+        values.insert(0, label_column, frame.groupby(groups)[label_column].first())
+        return values.reset_index(drop=True)
+
+    ranked = frame.sort_values(value_columns[0], ascending=False)
+    top = ranked.head(max_points - 1)
+    rest = ranked.iloc[max_points - 1:]
+    other = {label_column: "Other"}
+    for column in value_columns:
+        other[column] = rest[column].sum()
+    return pd.concat([top, pd.DataFrame([other])], ignore_index=True)
+
+
+def build_chart_data(labels, series):
+    """Build python-pptx ``CategoryChartData`` from labels and ``{name: values}``"""
+    # Pulls in xlsxwriter for the embedded workbook, so only on first chart
+    from pptx.chart.data import CategoryChartData
+
+    chart_data = CategoryChartData()
+    chart_data.categories = [str(label) for label in labels]
+    for name, values in series.items():
+        chart_data.add_series(str(name), [float(value) for value in values])
+    return chart_data
+
+
+def frame_to_chart_data(frame, label_column, value_columns):
+    """Build ``CategoryChartData`` straight from DataFrame columns"""
+    return build_chart_data(
+        frame[label_column].tolist(),
+        {column: frame[column].tolist() for column in value_columns}
+    )
+
+
+def add_native_chart(slide, chart_data, chart_type, title, left, top, width, height):
+    """Add an editable chart to ``slide`` and style its title and legend"""
+    graphic_frame = slide.shapes.add_chart(
+        NATIVE_CHART_TYPES.get(chart_type, XL_CHART_TYPE.COLUMN_CLUSTERED),
+        left, top, width, height, chart_data
+    )
+    chart = graphic_frame.chart
+
+    chart.has_title = True
+    chart.chart_title.text_frame.text = title
+
+    series_count = len(list(chart.plots[0].series))
+    chart.has_legend = chart_type == "pie" or series_count > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    if chart_type == "pie":
+        plot = chart.plots[0]
+        plot.has_data_labels = True
+        plot.data_labels.number_format = '0.0%'
+        plot.data_labels.show_percentage = True
+        plot.data_labels.show_value = False
+
+    return chart
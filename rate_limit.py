@@ -0,0 +1,124 @@
+"""Flow control for model calls: rate limit, coalescing, backoff.
+
+``TokenBucket`` spaces requests to stay under a requests-per-minute quota,
+``SingleFlight`` lets identical prompts that are already in flight share
+one call, and ``call_with_backoff`` retries quota (429) and server (5xx)
+errors with jittered exponential backoff. ``GeminiClient`` combines them
+with a semaphore that caps concurrent requests.
+"""
+import random
+import threading
+import time
+
+# HTTP statuses worth retrying: quota exhausted and transient server errors
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def error_status(error):
+    """Return the HTTP status of an API error, if it carries one"""
+    for attribute in ('code', 'status_code', 'status'):
+        value = getattr(error, attribute, None)
+        if value is None:
+            continue
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(error):
+    """True for quota and transient server errors (google.api_core errors carry ``code``)"""
+    return error_status(error) in RETRYABLE_STATUS
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)  # tokens per second
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute, burst=None):
+        return cls(requests_per_minute / 60.0, burst)
+
+    def acquire(self):
+        """Take one token, sleeping as long as needed; returns the time waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now (possibly going negative) so waiters are served in order
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class _Flight:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run one call per key at a time; concurrent callers with the same key share its result"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Return ``(result, shared)``; ``shared`` is True when another caller's call was reused"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+
+def backoff_delay(attempt, base_delay=0.5, max_delay=20.0, rng=random):
+    """Full-jitter exponential backoff delay for retry number ``attempt`` (0-based)"""
+    return rng.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_backoff(fn, max_retries=3, base_delay=0.5, max_delay=20.0, retryable=is_retryable,
+                      on_retry=None, sleep=time.sleep):
+    """Call ``fn()``, retrying retryable errors up to ``max_retries`` times"""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not retryable(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            if on_retry is not None:
+                on_retry(e, delay)
+            sleep(delay)
+            attempt += 1
@@ -0,0 +1,195 @@
+"""Content-addressed cache for Gemini responses.
+
+Responses are keyed on the normalized prompt, the model name and the
+generation config, so the same deck request from different users is only
+sent to the API once. Only deck structure and edit prompts are cached; chat
+replies are not, since the same question can deserve a different answer
+once the deck has changed. Entries live in an in-memory LRU tier and, when a
+path is configured, in an on-disk SQLite tier that survives restarts.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so indentation differences don't change the key"""
+    return _WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+def make_cache_key(prompt, model_name, generation_config=None):
+    """Build a stable SHA-256 key from the prompt, model and generation config"""
+    payload = json.dumps(
+        {
+            'prompt': normalize_prompt(prompt),
+            'model': model_name,
+            'config': generation_config or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) response cache with TTL.
+
+    Any object with the same ``get``/``set``/``stats``/``clear`` methods can be
+    plugged into ``PowerPointChatbot`` instead.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024, ttl_seconds=3600,
+                 sqlite_path=None, max_disk_entries=10000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self.max_disk_entries = max_disk_entries
+
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls):
+        """Create a cache configured by RESPONSE_CACHE_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")),
+            max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+            sqlite_path=os.getenv("RESPONSE_CACHE_PATH") or None,
+        )
+
+    def _expired(self, stored_at, now):
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        """Return the cached response for ``key`` or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if not self._expired(stored_at, now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return value
+                self._remove(key)
+                self.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, stored_at = row
+                    if not self._expired(stored_at, now):
+                        self._db.execute(
+                            "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                        )
+                        self._db.commit()
+                        # Promote disk hits into the memory tier
+                        self._store(key, value, stored_at)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.expirations += 1
+
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Store a response in every configured tier"""
+        now = time.time()
+        with self._lock:
+            self._store(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, stored_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                # Trim the least recently used rows beyond the disk limit
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+                self._db.commit()
+
+    def _store(self, key, value, stored_at):
+        if key in self._entries:
+            self._remove(key)
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            # Never let a single huge response flush the whole memory tier
+            return
+        self._entries[key] = (value, stored_at)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value.encode('utf-8'))
+
+    def clear(self):
+        """Drop every cached response and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+            self.hits = self.misses = self.memory_hits = self.disk_hits = 0
+            self.evictions = self.expirations = 0
+
+    def stats(self):
+        """Return hit/miss counters and current tier sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'memory_entries': len(self._entries),
+                'memory_bytes': self._bytes,
+            }
+            if self._db is not None:
+                stats['disk_entries'] = self._db.execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+            return stats
@@ -0,0 +1,304 @@
+"""Per-session deck memory budget with a disk-backed, content-addressed store.
+
+Every Streamlit session keeps a live python-pptx ``Presentation`` (an lxml
+tree of every slide), the incremental saver's compressed members and the
+slide index for as long as the browser tab exists, idle or not.
+``SessionStore`` tracks the sessions of a worker process, and when they
+together exceed ``memory_budget`` (or one has been idle for
+``idle_seconds``) it serializes the least recently used decks into a
+``BlobStore`` and drops them from memory. A deck is reloaded the next
+time its session touches ``chatbot.current_ppt``. Blobs are named by the
+SHA-256 of their bytes, so identical decks share a file and offloading an
+unchanged deck again writes nothing.
+"""
+import gc
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from pptx.opc.package import XmlPart
+
+# Measured RSS per lxml element of a loaded deck (tree node, attributes,
+# text and python-pptx's per-part objects, averaged over a 200-slide deck)
+ELEMENT_BYTES = 300
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_IDLE_SECONDS = 600
+DEFAULT_MAX_MESSAGES = 200
+
+
+def estimate_presentation_memory(prs):
+    """Approximate bytes a loaded presentation holds: its XML trees plus binary parts"""
+    total = 0
+    for part in prs.part.package.iter_parts():
+        if isinstance(part, XmlPart):
+            total += ELEMENT_BYTES * sum(1 for _ in part._element.iter())
+        else:
+            total += len(part.blob)
+    return total
+
+
+def trim_messages(messages, limit=DEFAULT_MAX_MESSAGES):
+    """Drop the oldest chat messages beyond ``limit``, in place"""
+    if limit and len(messages) > limit:
+        del messages[:len(messages) - limit]
+    return messages
+
+
+def _messages_bytes(messages):
+    return sum(len(message.get('content', '')) for message in messages or ())
+
+
+class BlobStore:
+    """Content-addressed files under ``root``: a blob's name is the SHA-256 of its bytes"""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, data):
+        """Store ``data`` (once per distinct content) and return its digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest):
+        with open(self._path(digest), 'rb') as f:
+            return f.read()
+
+    def delete(self, digest):
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def disk_bytes(self):
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+        return total
+
+
+class _Session:
+    __slots__ = ('chatbot', 'messages', 'last_used', 'busy', 'offloading', 'digest')
+
+    def __init__(self, chatbot):
+        self.chatbot = chatbot  # weakref; the session's own state keeps the chatbot alive
+        self.messages = None
+        self.last_used = time.monotonic()
+        self.busy = 0
+        self.offloading = False  # being written to the blob store, outside the lock
+        self.digest = None  # blob this session holds a reference on
+
+
+class SessionStore:
+    """Keeps the decks of all sessions in a process within a memory budget"""
+
+    def __init__(self, blob_store, memory_budget=DEFAULT_MEMORY_BUDGET, idle_seconds=DEFAULT_IDLE_SECONDS,
+                 max_messages=DEFAULT_MAX_MESSAGES):
+        self.blobs = blob_store
+        self.memory_budget = memory_budget
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self._sessions = OrderedDict()  # session id -> _Session, least recently used first
+        self._refcounts = {}  # digest -> sessions referencing the blob
+        self._ended = []  # ids of sessions whose chatbot was garbage collected
+        self._lock = threading.RLock()
+        self._offloaded = threading.Condition(self._lock)
+        self.offloads = 0
+        self.offloaded_bytes = 0
+
+    @classmethod
+    def from_env(cls):
+        """Create a store configured by SESSION_* environment variables"""
+        root = os.getenv("SESSION_STORE_DIR")
+        if not root:
+            # A private directory per process, removed at exit
+            root = tempfile.mkdtemp(prefix='ppt-chatbot-sessions-')
+            weakref.finalize(cls, shutil.rmtree, root, True)
+        return cls(
+            BlobStore(root),
+            memory_budget=int(float(os.getenv("SESSION_MEMORY_BUDGET_MB", "256")) * 1024 * 1024),
+            idle_seconds=float(os.getenv("SESSION_IDLE_SECONDS", str(DEFAULT_IDLE_SECONDS))),
+            max_messages=int(os.getenv("SESSION_MAX_MESSAGES", str(DEFAULT_MAX_MESSAGES))),
+        )
+
+    @contextmanager
+    def session(self, session_id, chatbot, messages=None):
+        """Use one session's deck for the duration of a script run.
+
+        The session cannot be offloaded while inside the block (entering
+        waits for an offload of this session already under way); on exit it
+        becomes the most recently used one, its chat history is trimmed to
+        ``max_messages`` and the budget is enforced.
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.chatbot() is not chatbot:
+                if entry is not None:
+                    self._release(entry)
+                entry = _Session(weakref.ref(chatbot, lambda _, session_id=session_id: self._ended.append(session_id)))
+                self._sessions[session_id] = entry
+            while entry.offloading:
+                self._offloaded.wait()
+            entry.messages = messages
+            entry.busy += 1
+            self._sessions.move_to_end(session_id)
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.busy -= 1
+                entry.last_used = time.monotonic()
+                if messages is not None:
+                    trim_messages(messages, self.max_messages)
+            self.enforce()
+
+    def _release(self, entry):
+        digest, entry.digest = entry.digest, None
+        if digest is None:
+            return
+        self._refcounts[digest] -= 1
+        if not self._refcounts[digest]:
+            del self._refcounts[digest]
+            self.blobs.delete(digest)
+
+    def _hold(self, entry, digest):
+        if entry.digest == digest:
+            return
+        self._release(entry)
+        if digest is not None:
+            self._refcounts[digest] = self._refcounts.get(digest, 0) + 1
+            entry.digest = digest
+
+    def _drop_ended(self):
+        while self._ended:
+            entry = self._sessions.pop(self._ended.pop(), None)
+            if entry is not None and entry.chatbot() is None:
+                self._release(entry)
+
+    def _victims(self):
+        """Idle sessions, then the least recently used ones until the rest fit the budget"""
+        now = time.monotonic()
+        victims = []
+        resident = []
+        for session_id, entry in self._sessions.items():
+            chatbot = entry.chatbot()
+            if chatbot is None or not chatbot.deck_resident or entry.offloading:
+                continue
+            # An edited deck no longer matches the blob it was loaded from
+            self._hold(entry, chatbot.stored_digest)
+            if entry.busy:
+                continue
+            if self.idle_seconds is not None and now - entry.last_used > self.idle_seconds:
+                victims.append((session_id, entry, chatbot))
+            else:
+                resident.append((session_id, entry, chatbot))
+
+        total = self.resident_bytes() - sum(chatbot.memory_usage()['total'] for _, _, chatbot in victims)
+        for victim in resident:
+            if total <= self.memory_budget:
+                break
+            total -= victim[2].memory_usage()['total']
+            victims.append(victim)
+        return victims
+
+    def _offload(self, session_id, entry, chatbot):
+        """Write one reserved session's deck to the blob store; called without the lock"""
+        freed = chatbot.memory_usage()['total']
+        digest = None
+        try:
+            digest = chatbot.offload(self.blobs)
+        finally:
+            with self._lock:
+                entry.offloading = False
+                self._offloaded.notify_all()
+                if digest is not None:
+                    if self._sessions.get(session_id) is entry:
+                        self._hold(entry, digest)
+                    elif digest not in self._refcounts:
+                        # The session was replaced meanwhile; nothing else uses this blob
+                        self.blobs.delete(digest)
+                    self.offloads += 1
+                    self.offloaded_bytes += freed
+
+    def enforce(self):
+        """Offload idle sessions, then the least recently used ones until the rest fit the budget.
+
+        Victims are picked and reserved under the lock but written to disk
+        outside it, so other sessions never wait for a deck to be serialized.
+        """
+        with self._lock:
+            self._drop_ended()
+            victims = self._victims()
+            for _, entry, _ in victims:
+                entry.offloading = True
+
+        for victim in victims:
+            self._offload(*victim)
+        if victims:
+            # Parts and their package reference each other, so a dropped
+            # deck is only freed by the cyclic collector
+            gc.collect()
+
+    def resident_bytes(self):
+        """Estimated bytes of all decks currently in memory"""
+        with self._lock:
+            total = 0
+            for entry in self._sessions.values():
+                chatbot = entry.chatbot()
+                if chatbot is not None:
+                    total += chatbot.memory_usage()['total']
+            return total
+
+    def usage(self, session_id):
+        """Memory report for one session"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            chatbot = entry.chatbot() if entry is not None else None
+            if chatbot is None:
+                return None
+            usage = chatbot.memory_usage()
+            return dict(
+                usage,
+                resident=chatbot.deck_resident,
+                offloaded=chatbot.deck_offloaded,
+                messages=len(entry.messages or ()),
+                message_bytes=_messages_bytes(entry.messages),
+                idle_seconds=round(time.monotonic() - entry.last_used, 1),
+            )
+
+    def stats(self, per_session=True):
+        """Totals across sessions, optionally with a per-session breakdown"""
+        with self._lock:
+            self._drop_ended()
+            sessions = {session_id: self.usage(session_id) for session_id in self._sessions}
+            sessions = {session_id: usage for session_id, usage in sessions.items() if usage is not None}
+            stats = {
+                'sessions': len(sessions),
+                'resident_sessions': sum(1 for usage in sessions.values() if usage['resident']),
+                'resident_bytes': sum(usage['total'] for usage in sessions.values()),
+                'memory_budget': self.memory_budget,
+                'blobs': len(self._refcounts),
+                'disk_bytes': self.blobs.disk_bytes(),
+                'offloads': self.offloads,
+                'offloaded_bytes': self.offloaded_bytes,
+            }
+            if per_session:
+                stats['per_session'] = sessions
+            return stats
@@ -0,0 +1,158 @@
+"""Template-cloning slide factory.
+
+Styling a slide through python-pptx proxies (gradient background, fonts,
+positions, accent shapes) costs hundreds of small XML operations per slide.
+``SlideFactory`` lets the first slide of each kind be styled the slow way,
+keeps a deep copy of its background and shape tree, and builds every later
+slide of that kind by cloning the XML and filling in only the text (and
+whatever else a kind's ``refresh`` hook varies per slide).
+"""
+import copy
+import weakref
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.parts.slide import SlidePart
+
+
+def next_slide_partname(prs_part):
+    """First free ``slideN.xml``.
+
+    python-pptx numbers a new slide by the slide count, which after a slide
+    is deleted names a slide that is still in the deck; the incremental
+    saver and the version history both need unique partnames.
+    """
+    used = {str(rel.target_part.partname) for rel in prs_part.rels.values() if rel.reltype == RT.SLIDE}
+    number = len(used) + 1
+    while f"/ppt/slides/slide{number}.xml" in used:
+        number += 1
+    return PackURI(f"/ppt/slides/slide{number}.xml")
+
+
+def append_slide(prs, layout, placeholders=True):
+    """``prs.slides.add_slide(layout)`` under a partname no other slide uses.
+
+    With ``placeholders=False`` the layout's placeholders are not copied,
+    for callers that fill in the shape tree themselves.
+    """
+    slide_part = SlidePart.new(next_slide_partname(prs.part), prs.part.package, layout.part)
+    r_id = prs.part.relate_to(slide_part, RT.SLIDE)
+    slide = slide_part.slide
+    if placeholders:
+        slide.shapes.clone_layout_placeholders(layout)
+    prs.slides._sldIdLst.add_sldId(r_id)
+    return slide
+
+
+class SlidePrototype:
+    """Captured XML of a fully styled slide plus where its text goes"""
+    __slots__ = ('background', 'shapes', 'title_index', 'body_index', 'paragraph')
+
+    def __init__(self, background, shapes, title_index, body_index, paragraph):
+        self.background = background
+        self.shapes = shapes
+        self.title_index = title_index
+        self.body_index = body_index
+        self.paragraph = paragraph
+
+
+class SlideFactory:
+    """Clones pre-styled slides into a single presentation"""
+
+    def __init__(self):
+        self._prototypes = {}
+
+    def add_slide(self, prs, kind, layout, title, lines, build, refresh=None):
+        """Add a slide of ``kind`` with ``title`` and one paragraph per entry in ``lines``.
+
+        The first slide of each kind (and with/without body text) is created by
+        ``build()``, which must add the styled slide and return ``(slide, body_shape)``.
+        Every later slide of that kind is a clone of it, passed to ``refresh(slide)``
+        when given, for styling that should differ from slide to slide.
+        """
+        key = (kind, bool(lines))
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            slide, body_shape = build()
+            self._prototypes[key] = self._capture(slide, body_shape)
+            return slide
+        slide = self._clone(prs, prototype, layout, title, lines)
+        if refresh is not None:
+            refresh(slide)
+        return slide
+
+    def _capture(self, slide, body_shape):
+        c_sld = slide._element.cSld
+        shapes = list(c_sld.spTree)
+
+        title_shape = slide.shapes.title
+        title_index = shapes.index(title_shape._element) if title_shape is not None else None
+
+        body_index = None
+        paragraph = None
+        if body_shape is not None and body_shape.has_text_frame:
+            body_index = shapes.index(body_shape._element)
+            paragraph = copy.deepcopy(body_shape.text_frame.paragraphs[0]._p)
+
+        background = copy.deepcopy(c_sld.bg) if c_sld.bg is not None else None
+        return SlidePrototype(
+            background, [copy.deepcopy(shape) for shape in shapes],
+            title_index, body_index, paragraph
+        )
+
+    def _clone(self, prs, prototype, layout, title, lines):
+        # Without the layout placeholders, which the prototype's shape tree replaces anyway
+        slide = append_slide(prs, layout, placeholders=False)
+
+        c_sld = slide._element.cSld
+        if prototype.background is not None:
+            c_sld.insert(0, copy.deepcopy(prototype.background))
+
+        sp_tree = c_sld.spTree
+        for child in list(sp_tree):
+            sp_tree.remove(child)
+        shapes = [copy.deepcopy(shape) for shape in prototype.shapes]
+        sp_tree.extend(shapes)
+
+        if prototype.title_index is not None:
+            paragraphs = shapes[prototype.title_index].findall(f"{qn('p:txBody')}/{qn('a:p')}")
+            for extra in paragraphs[1:]:
+                extra.getparent().remove(extra)
+            if paragraphs:
+                self._set_text(paragraphs[0], title)
+
+        if prototype.body_index is not None:
+            tx_body = shapes[prototype.body_index].find(qn('p:txBody'))
+            for p in tx_body.findall(qn('a:p')):
+                tx_body.remove(p)
+            # A text body needs at least one paragraph, even when empty
+            for line in lines or ['']:
+                if line:
+                    p = copy.deepcopy(prototype.paragraph)
+                    self._set_text(p, line)
+                else:
+                    # Blank points stay unformatted, as the slow path leaves them
+                    p = OxmlElement('a:p')
+                tx_body.append(p)
+
+        return slide
+
+    @staticmethod
+    def _set_text(p, text):
+        for child in p.content_children:
+            p.remove(child)
+        p.append_text(text)
+
+
+# Keyed by presentation part (Presentation itself is unhashable) and dropped with it
+_factories = weakref.WeakKeyDictionary()
+
+
+def get_slide_factory(prs):
+    """Return the factory for ``prs``, creating it on first use"""
+    factory = _factories.get(prs.part)
+    if factory is None:
+        factory = _factories[prs.part] = SlideFactory()
+    return factory
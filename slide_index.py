@@ -0,0 +1,189 @@
+"""Per-slide text index for the current presentation.
+
+Summaries and "show me slide N" requests used to walk every shape and
+paragraph of the deck on every chat turn. ``SlideIndex`` walks each slide
+once, keeps its title, non-empty paragraph text and shape kinds in a slotted
+entry, and re-indexes a slide only after it was marked changed. Adding or
+removing slides re-syncs the slide list but keeps the entries of slides
+that did not change. The same entries feed a BM25 index for finding a
+slide by what it is about.
+"""
+from array import array
+
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from slide_search import BM25Index
+
+# Compact shape kind codes stored per slide
+SHAPE_KINDS = {
+    MSO_SHAPE_TYPE.PICTURE: 'picture',
+    MSO_SHAPE_TYPE.CHART: 'chart',
+    MSO_SHAPE_TYPE.TABLE: 'table',
+    MSO_SHAPE_TYPE.GROUP: 'group',
+    MSO_SHAPE_TYPE.TEXT_BOX: 'text',
+    MSO_SHAPE_TYPE.PLACEHOLDER: 'placeholder',
+    MSO_SHAPE_TYPE.AUTO_SHAPE: 'shape',
+}
+
+class SlideEntry:
+    """Indexed text of one slide"""
+    __slots__ = ('part', 'title', 'paragraphs', 'shape_kinds', 'notes')
+
+    def __init__(self, part, title, paragraphs, shape_kinds, notes):
+        self.part = part
+        self.title = title  # None when the slide has no title placeholder
+        self.paragraphs = paragraphs  # stripped, non-empty body paragraphs
+        self.shape_kinds = shape_kinds
+        self.notes = notes
+
+    @property
+    def point_count(self):
+        return len(self.paragraphs)
+
+
+def index_slide(slide):
+    """Walk one slide's shapes once and return its ``SlideEntry``"""
+    title_shape = slide.shapes.title
+    title_element = title_shape._element if title_shape is not None else None
+
+    paragraphs = []
+    kinds = []
+    for shape in slide.shapes:
+        try:
+            kind = SHAPE_KINDS.get(shape.shape_type, 'other')
+        except NotImplementedError:
+            # python-pptx cannot classify some graphic frames and connectors
+            kind = 'other'
+        if shape._element is title_element:
+            kind = 'title'
+        kinds.append(kind)
+
+        if shape.has_text_frame and shape._element is not title_element:
+            for paragraph in shape.text_frame.paragraphs:
+                text = paragraph.text.strip()
+                if text:
+                    paragraphs.append(text)
+
+    notes = ''
+    if slide.has_notes_slide and slide.notes_slide.notes_text_frame is not None:
+        notes = slide.notes_slide.notes_text_frame.text.strip()
+
+    return SlideEntry(
+        slide.part,
+        title_shape.text if title_shape is not None else None,
+        tuple(paragraphs),
+        tuple(kinds),
+        notes,
+    )
+
+
+class SlideIndex:
+    """Slide entries of one presentation, kept in sync with edits"""
+
+    def __init__(self, prs):
+        self._prs = prs
+        self._entries = []
+        self._positions = {}  # slide part -> 0-based position
+        self._stale = set()  # positions whose slide changed since it was indexed
+        self._point_counts = array('I')
+        self._summary = None
+        self._synced = False
+        self._search = BM25Index()
+
+    def __len__(self):
+        self._sync()
+        return len(self._entries)
+
+    def touch(self, part=None):
+        """Record a change to the slide in ``part``, or to the slide list when None"""
+        self._summary = None
+        if part is None:
+            self._synced = False
+            return
+        position = self._positions.get(part)
+        if position is None:
+            self._synced = False
+        else:
+            self._stale.add(position)
+
+    def entry(self, slide_number):
+        """Return the ``SlideEntry`` for 1-based ``slide_number``, or None"""
+        self._sync()
+        position = slide_number - 1
+        if position < 0 or position >= len(self._entries):
+            return None
+        if position in self._stale:
+            self._reindex(position)
+        return self._entries[position]
+
+    def entries(self):
+        """Return every entry in slide order"""
+        self._sync()
+        for position in sorted(self._stale):
+            self._reindex(position)
+        return self._entries
+
+    def point_counts(self):
+        """Return the non-empty body paragraph count of every slide"""
+        self.entries()
+        return self._point_counts
+
+    def search(self, query, limit=5):
+        """Return up to ``limit`` ``(slide_number, score)`` pairs matching ``query``, best first"""
+        self.entries()
+        return [
+            (self._positions[part] + 1, score)
+            for part, score in self._search.search(query, limit)
+        ]
+
+    def summary(self):
+        """Return the presentation summary, rebuilt only after a change"""
+        if self._summary is None:
+            entries = self.entries()
+            self._summary = {
+                'total_slides': len(entries),
+                'slides': [
+                    {
+                        'number': number,
+                        'title': entry.title.strip() if entry.title and entry.title.strip() else 'Untitled Slide',
+                        'content_points': self._point_counts[number - 1],
+                    }
+                    for number, entry in enumerate(entries, 1)
+                ],
+            }
+        return self._summary
+
+    def _reindex(self, position):
+        entry = self._entries[position] = self._index(self._entries[position].part.slide)
+        self._point_counts[position] = entry.point_count
+        self._stale.discard(position)
+
+    def _index(self, slide):
+        entry = index_slide(slide)
+        self._search.add(entry.part, entry.title or '', entry.paragraphs + (entry.notes,))
+        return entry
+
+    def _sync(self):
+        if self._synced:
+            return
+        # Reuse entries of slides that are still there and unchanged
+        previous = {
+            entry.part: entry for position, entry in enumerate(self._entries)
+            if position not in self._stale
+        }
+        entries = []
+        for slide in self._prs.slides:
+            entry = previous.get(slide.part)
+            entries.append(entry if entry is not None else self._index(slide))
+
+        # Slides that are gone drop out of the search index too
+        current = {entry.part for entry in entries}
+        for entry in self._entries:
+            if entry.part not in current:
+                self._search.remove(entry.part)
+
+        self._entries = entries
+        self._positions = {entry.part: position for position, entry in enumerate(entries)}
+        self._point_counts = array('I', (entry.point_count for entry in entries))
+        self._stale = set()
+        self._synced = True
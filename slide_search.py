@@ -0,0 +1,100 @@
+"""BM25 full-text search over slide titles, bullets and notes.
+
+Resolves prompts like "edit the slide about pricing" to a slide number
+locally, without asking the model which slide is meant. Documents are
+keyed by slide part, so reordering slides does not invalidate postings and
+an edited slide is re-indexed on its own.
+"""
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+their this to was were will with about slide slides me show
+""".split())
+
+# Title terms count this many times as often as bullet and note terms
+TITLE_WEIGHT = 3
+
+
+def tokenize(text):
+    """Lowercase ``text`` into searchable terms (stopwords dropped, plural 's' stripped)"""
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class BM25Index:
+    """Inverted index with Okapi BM25 scoring and incremental updates"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}  # term -> {doc_id: term frequency}
+        self._doc_terms = {}  # doc_id -> Counter of its terms
+        self._doc_lengths = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id, title='', body=()):
+        """Index (or re-index) ``doc_id`` from its title and body texts"""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+
+        terms = Counter(tokenize(title))
+        for term in terms:
+            terms[term] *= TITLE_WEIGHT
+        for text in body:
+            terms.update(tokenize(text))
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def remove(self, doc_id):
+        """Drop ``doc_id`` from the index, if present"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query, limit=5):
+        """Return up to ``limit`` ``(doc_id, score)`` pairs, best first"""
+        doc_count = len(self._doc_terms)
+        if not doc_count:
+            return []
+        average_length = self._total_length / doc_count or 1
+
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,93 @@
+"""Bulk runs resume from their checkpoint without repeating model calls for unchanged jobs."""
+import json
+import os
+
+import pytest
+
+from bulk_jobs import BulkRunner, Job, JobError, load_jobs
+from chatbot import PowerPointChatbot
+from gemini_client import GeminiClient
+from mock_model import MockGeminiModel
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def model():
+    return MockGeminiModel(latency=0)
+
+
+@pytest.fixture
+def runner(model, tmp_path):
+    chatbot = PowerPointChatbot(client=GeminiClient(model=model, response_cache=ResponseCache(max_entries=0)))
+    return BulkRunner(chatbot, str(tmp_path / 'decks'), processes=1)
+
+
+JOBS = [Job('solar', "Solar power", 4, '', 'single', 'solar.pptx'), Job('wind', "Wind power", 4, '', 'single', 'wind.pptx')]
+
+
+def test_rerun_skips_done_jobs(runner, model):
+    assert runner.run(JOBS)['done'] == 2
+    calls = model.calls
+    summary = runner.run(JOBS)
+    assert (summary['skipped'], summary['done']) == (2, 0)
+    assert model.calls == calls
+
+
+@pytest.mark.parametrize('changed', [
+    Job('solar', "Solar power", 6, '', 'single', 'solar.pptx'),
+    Job('solar', "Solar power", 4, 'focus on rooftops', 'single', 'solar.pptx'),
+    Job('solar', "Solar energy", 4, '', 'single', 'solar.pptx'),
+    Job('solar', "Solar power", 4, '', 'json', 'solar.pptx'),
+])
+def test_changed_job_is_generated_again(runner, model, changed):
+    runner.run(JOBS)
+    calls = model.calls
+    summary = runner.run([changed, JOBS[1]])
+    assert (summary['skipped'], summary['done'], summary['resumed']) == (1, 1, 0)
+    assert model.calls > calls
+
+
+def test_failed_build_resumes_without_a_model_call(runner, model):
+    # A directory where the deck should go makes the build fail after generation
+    blocked = os.path.join(runner.out_dir, 'solar.pptx')
+    os.makedirs(blocked)
+    summary = runner.run(JOBS)
+    assert summary['failed'] == 1 and summary['errors']['solar'].startswith('build:')
+    failed = runner.checkpoint.load()['solar']
+    assert failed['stage'] == 'failed' and failed['slides']
+
+    os.rmdir(blocked)
+    calls = model.calls
+    summary = runner.run(JOBS)
+    assert (summary['resumed'], summary['done'], summary['skipped']) == (1, 1, 1)
+    assert model.calls == calls
+    assert os.path.isfile(blocked)
+
+
+def write_jobs(tmp_path, *rows):
+    path = tmp_path / 'jobs.jsonl'
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding='utf-8')
+    return str(path)
+
+
+def test_load_jobs_defaults_and_unique_ids(tmp_path):
+    jobs = load_jobs(write_jobs(tmp_path, {'topic': "Solar Power"}, {'topic': "Solar Power", 'slides': "6"}))
+    assert [(job.id, job.slides, job.output) for job in jobs] == [
+        ('solar_power', 5, 'solar_power.pptx'), ('solar_power_2', 6, 'solar_power_2.pptx')
+    ]
+
+
+@pytest.mark.parametrize('output', ['../escape.pptx', '/tmp/escape.pptx', 'sub/deck.pptx', '..'])
+def test_load_jobs_rejects_output_paths(tmp_path, output):
+    with pytest.raises(JobError, match="'output' must be a file name"):
+        load_jobs(write_jobs(tmp_path, {'topic': "Solar", 'output': output}))
+
+
+@pytest.mark.parametrize('row, error', [
+    ({'slides': 4}, "'topic' is required"),
+    ({'topic': "Solar", 'mode': 'streaming'}, "mode must be one of"),
+    ({'topic': "Solar", 'slides': "many"}, "'slides' must be a number"),
+])
+def test_load_jobs_rejects_bad_rows(tmp_path, row, error):
+    with pytest.raises(JobError, match=error):
+        load_jobs(write_jobs(tmp_path, row))
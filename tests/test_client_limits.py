@@ -0,0 +1,104 @@
+"""GeminiClient flow control against the local fake model server from bench_client_limits."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from benchmarks.bench_client_limits import FakeModelServer, HttpModel
+from gemini_client import GeminiClient
+from response_cache import ResponseCache
+
+
+@pytest.fixture
+def server():
+    server = FakeModelServer(latency=0.05, rpm=10_000, window=1.0, max_in_flight=100, error_rate=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server, **limits):
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    limits.setdefault('max_retries', 0)
+    return GeminiClient(model=HttpModel(url), response_cache=ResponseCache(max_entries=0), **limits)
+
+
+def send_all(client, prompts, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(client.generate_text, prompts))
+
+
+def test_token_bucket_never_exceeds_rate(server):
+    rate = 20  # per second, so the bucket holds a burst of 20
+    client = make_client(server, requests_per_minute=rate * 60, coalesce=False)
+    send_all(client, [f"Prompt {i}" for i in range(50)], threads=10)
+
+    arrivals = sorted(server.arrivals)
+    assert len(arrivals) == 50
+    # Tokens available up to each arrival: the initial burst plus what refilled since the first
+    for i, arrival in enumerate(arrivals):
+        assert i + 1 <= rate + rate * (arrival - arrivals[0]) + 1
+    assert arrivals[-1] - arrivals[0] >= (50 - rate) / rate - 0.1
+
+
+def test_identical_in_flight_prompts_make_one_upstream_call(server):
+    server.latency = 0.3
+    client = make_client(server)
+    start = threading.Barrier(8)
+
+    def call(_):
+        start.wait()
+        return client.generate_text("Write a slide titled \"Shared\"")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(call, range(8)))
+
+    assert len(set(results)) == 1
+    assert server.counts['received'] == 1
+    assert client.stats()['coalesced'] == 7
+
+
+def test_quota_and_server_errors_are_retried_with_backoff(server):
+    server.scripted.extend([429, 503, 429])
+    base_delay = 0.05
+    client = make_client(server, max_retries=5, base_delay=base_delay, max_delay=1.0)
+
+    # Take the top of every jitter range, so each delay is exactly the backoff cap
+    with mock.patch('random.uniform', side_effect=lambda low, high: high):
+        text = client.generate_text("Write a slide titled \"Retried\"")
+
+    assert text
+    assert server.counts['received'] == 4
+    assert (server.counts['429'], server.counts['503'], server.counts['ok']) == (2, 1, 1)
+    assert client.stats()['retries'] == 3
+    gaps = [later - earlier for earlier, later in zip(server.arrivals, server.arrivals[1:])]
+    for attempt, gap in enumerate(gaps):
+        assert gap >= base_delay * 2 ** attempt - 0.005
+
+
+def test_retries_give_up_after_max_retries(server):
+    server.scripted.extend([503] * 3)
+    client = make_client(server, max_retries=2, base_delay=0.01)
+    with pytest.raises(Exception) as error:
+        client.generate_text("Write a slide titled \"Failing\"")
+    assert getattr(error.value, 'code', None) == 503
+    assert server.counts['received'] == 3
+    assert client.stats()['errors'] == 1
+
+
+def test_concurrency_cap_is_never_exceeded(server):
+    server.latency = 0.1
+    server.max_in_flight = 3  # the server answers 429 beyond this
+    client = make_client(server, max_concurrency=3)
+    start = time.perf_counter()
+    results = send_all(client, [f"Prompt {i}" for i in range(12)], threads=12)
+
+    assert all(results)
+    assert server.counts['429'] == 0
+    assert server.counts['max_in_flight'] == 3
+    # 12 requests, 3 at a time
+    assert time.perf_counter() - start >= 4 * server.latency
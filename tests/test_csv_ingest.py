@@ -0,0 +1,75 @@
+"""aggregate_csv gives the same answer chunk by chunk as pandas does on the whole file."""
+import io
+
+import numpy as np
+import pytest
+
+from csv_ingest import aggregate_csv, read_csv_preview
+
+CSV = """region,date,revenue,units
+North,2024-01-05,100,1
+South,2024-01-20,50,2
+North,2024-02-03,,3
+East,2024-02-14,25,4
+South,2024-03-01,75,5
+North,2024-03-30,200,6
+West,not a date,10,7
+"""
+
+
+def aggregate(*args, **kwargs):
+    # Two rows per chunk, so every label's totals are carried across chunks
+    labels, values = aggregate_csv(io.StringIO(CSV), *args, chunksize=2, **kwargs)
+    return list(labels), {column: list(column_values) for column, column_values in values.items()}
+
+
+def test_sum_per_label():
+    labels, values = aggregate('region', ['revenue', 'units'], agg='sum')
+    assert dict(zip(labels, zip(values['revenue'], values['units']))) == {
+        'North': (300, 10), 'South': (125, 7), 'East': (25, 4), 'West': (10, 7),
+    }
+
+
+def test_mean_skips_missing_values():
+    labels, values = aggregate('region', ['revenue'], agg='mean')
+    assert dict(zip(labels, values['revenue']))['North'] == 150
+
+
+def test_count_of_non_missing_values():
+    labels, values = aggregate('region', ['revenue', 'units'], agg='count')
+    counts = dict(zip(labels, zip(values['revenue'], values['units'])))
+    assert counts['North'] == (2, 3)
+
+
+def test_top_n_by_first_value_column():
+    labels, values = aggregate('region', ['revenue'], agg='sum', top_n=2)
+    assert (labels, values['revenue']) == (['North', 'South'], [300, 125])
+
+
+@pytest.mark.parametrize('bucket, labels, revenue', [
+    ('M', ['2024-01-01', '2024-02-01', '2024-03-01'], [150, 25, 275]),
+    ('Q', ['2024-01-01'], [450]),
+])
+def test_time_buckets_sum_in_date_order(bucket, labels, revenue):
+    # The unparseable date is dropped
+    assert aggregate('date', ['revenue'], agg='sum', time_bucket=bucket) == (labels, {'revenue': revenue})
+
+
+def test_time_buckets_mean_and_count():
+    _, mean = aggregate('date', ['revenue'], agg='mean', time_bucket='M')
+    _, count = aggregate('date', ['units'], agg='count', time_bucket='M')
+    assert mean['revenue'] == [75, 25, 137.5]
+    assert count['units'] == [2, 2, 2]
+
+
+def test_empty_file_and_unknown_aggregation():
+    labels, values = aggregate_csv(io.StringIO("region,revenue\n"), 'region', ['revenue'])
+    assert len(labels) == 0 and values['revenue'].dtype == np.float64
+    with pytest.raises(ValueError, match="Unsupported aggregation"):
+        aggregate_csv(io.StringIO(CSV), 'region', ['revenue'], agg='median')
+
+
+def test_preview_rewinds_the_upload():
+    upload = io.StringIO(CSV)
+    assert list(read_csv_preview(upload, nrows=2).columns) == ['region', 'date', 'revenue', 'units']
+    assert upload.tell() == 0
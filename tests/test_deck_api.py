@@ -0,0 +1,97 @@
+"""The HTTP API answers bad requests with 400 and unknown decks or routes with 404."""
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from deck_api import PPTX_MIME, make_server
+from gemini_client import GeminiClient
+from mock_model import MockGeminiModel
+
+
+@pytest.fixture(scope='module')
+def api():
+    server = make_server(port=0, client=GeminiClient(model=MockGeminiModel(latency=0)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def call(api, method, path, body=None, raw=None, content_type='application/json'):
+    data = raw if raw is not None else (json.dumps(body).encode('utf-8') if body is not None else None)
+    request = urllib.request.Request(api + path, data=data, method=method, headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            payload = response.read()
+            status, mime = response.status, response.headers['Content-Type']
+    except urllib.error.HTTPError as e:
+        payload, status, mime = e.read(), e.code, e.headers['Content-Type']
+    return status, json.loads(payload) if mime == 'application/json' else payload
+
+
+@pytest.fixture(scope='module')
+def deck(api):
+    status, body = call(api, 'POST', '/decks', {'topic': "Solar power", 'slides': "3"})
+    assert status == 201
+    return body['id']
+
+
+def test_create_view_download_and_delete(api, deck):
+    status, body = call(api, 'GET', f'/decks/{deck}/slides/2')
+    assert status == 200 and body['slide_number'] == 2
+    status, data = call(api, 'GET', f'/decks/{deck}/pptx')
+    assert status == 200 and data[:2] == b'PK'
+
+    status, created = call(api, 'POST', '/decks', raw=data, content_type=PPTX_MIME)
+    assert status == 201
+    assert call(api, 'DELETE', f"/decks/{created['id']}") == (200, {'deleted': created['id']})
+    assert call(api, 'GET', f"/decks/{created['id']}")[0] == 404
+
+
+@pytest.mark.parametrize('method, path, body, error', [
+    ('POST', '/decks', {}, "'topic' is required"),
+    ('POST', '/decks', {'topic': "Solar", 'slides': "five"}, "'slides' must be a whole number"),
+    ('POST', '/decks', {'topic': "Solar", 'slides': 4.5}, "'slides' must be a whole number"),
+    ('POST', '/decks', {'topic': "Solar", 'slides': True}, "'slides' must be a whole number"),
+    ('POST', '/decks', [1, 2], "must be a JSON object"),
+    ('POST', '/decks/{deck}/edit', {}, "'request' is required"),
+    ('POST', '/decks/{deck}/edit', {'request': "shorter", 'slides': "2"}, "'slides' must be a list"),
+    ('POST', '/decks/{deck}/edit', {'request': "shorter", 'slides': [2, "x"]}, "'slides' must be a whole number"),
+    ('POST', '/decks/{deck}/edit', {'request': "shorter", 'slide': 99}, "Slide 99 not found"),
+    ('POST', '/decks/{deck}/slides', {}, "'request' is required"),
+    ('POST', '/decks/{deck}/chat', {}, "'prompt' is required"),
+    ('POST', '/decks/{deck}/undo', {'steps': 0}, "Steps must be at least 1"),
+    ('POST', '/decks/{deck}/redo', {'steps': -2}, "Steps must be at least 1"),
+    ('POST', '/decks/{deck}/redo', {'steps': "many"}, "'steps' must be a whole number"),
+    ('POST', '/decks/{deck}/checkout', {}, "'version' is required"),
+    ('POST', '/decks/{deck}/checkout', {'version': "latest"}, "'version' must be a whole number"),
+    ('POST', '/decks/{deck}/checkout', {'version': 42}, "version"),
+    ('GET', '/decks/{deck}/slides/99', None, "Slide 99 not found"),
+])
+def test_bad_requests_are_400(api, deck, method, path, body, error):
+    status, response = call(api, method, path.format(deck=deck), body)
+    assert status == 400
+    assert error in response['error']
+
+
+def test_invalid_json_is_400(api, deck):
+    status, response = call(api, 'POST', f'/decks/{deck}/edit', raw=b'{"request": ')
+    assert status == 400 and "not valid JSON" in response['error']
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/decks/0123abcd'),
+    ('GET', f"/decks/{'f' * 32}"),
+    ('POST', f"/decks/{'f' * 32}/edit"),
+    ('GET', '/nowhere'),
+    ('GET', '/decks/{deck}/unknown'),
+    ('POST', '/decks/{deck}/pptx'),
+    ('DELETE', '/decks/{deck}/slides/1'),
+])
+def test_unknown_decks_and_routes_are_404(api, deck, method, path):
+    status, response = call(api, method, path.format(deck=deck), {})
+    assert status == 404 and response['error']
@@ -0,0 +1,133 @@
+"""Short and missing slides are regenerated with one request for just those slides."""
+import pytest
+
+from chatbot import PowerPointChatbot
+from deck_repair import GAP_MISSING, GAP_SHORT, Gap, RepairPlan, build_repair_prompt
+from deck_service import DeckService, MODE_SINGLE, MODE_STREAMING
+from gemini_client import GeminiClient
+from mock_model import MockResponse
+from response_cache import ResponseCache
+
+
+def slide(title, points=3):
+    return {'title': title, 'content': [f"{title} point {i + 1}" for i in range(points)]}
+
+
+def test_plan_finds_short_missing_and_cut_off_slides():
+    outline = [slide("Intro"), slide("Market", 1), {'title': "Pricing", 'content': []}, slide("Team")]
+    plan = RepairPlan(outline, 5)
+    assert plan.gaps == [
+        Gap(2, GAP_SHORT, "Market", ("Market point 1",)),
+        Gap(3, GAP_MISSING, "Pricing"),
+        Gap(5, GAP_MISSING, None),
+    ]
+    assert plan.context() == {1: "Intro", 4: "Team"}
+
+
+def test_plan_ignores_a_deck_title_heading_when_the_deck_is_complete():
+    outline = [{'title': "Solar Power", 'content': []}, slide("Intro"), slide("Market")]
+    assert RepairPlan(outline, 2).gaps == []
+
+
+def test_plan_without_a_count_only_repairs_short_slides():
+    outline = [slide("Intro"), slide("Market", 1), {'title': "Pricing", 'content': []}]
+    assert [gap.kind for gap in RepairPlan(outline, None).gaps] == [GAP_SHORT]
+
+
+def test_merge_fills_gaps_in_place():
+    plan = RepairPlan([slide("Intro"), slide("Market", 1), {'title': "Pricing", 'content': []}], 4)
+    slides, filled = plan.merge({
+        2: {'content': ["New one", "New two", "New three"]},
+        3: {'title': "Ignored", 'content': ["Price one", "Price two"]},
+        # Slide 4 got nothing back and is left out
+    })
+    assert [s['title'] for s in slides] == ["Intro", "Market", "Pricing"]
+    assert slides[1]['content'] == ["New one", "New two", "New three"]
+    assert [(position, gap.kind) for position, gap in filled] == [(2, GAP_SHORT), (3, GAP_MISSING)]
+
+
+def test_merge_keeps_a_short_slide_when_the_repair_is_not_longer():
+    plan = RepairPlan([slide("Intro"), slide("Market", 1)], 2)
+    slides, filled = plan.merge({2: {'content': [" "]}})
+    assert slides[1] == slide("Market", 1) and filled == []
+
+
+def test_repair_prompt_asks_only_for_the_gaps():
+    plan = RepairPlan([slide("Intro"), slide("Market", 1), slide("Team")], 4)
+    prompt = build_repair_prompt("Solar", plan)
+    assert "## Slide 2\nTitle: Market (keep this title)" in prompt
+    assert "## Slide 4\nTitle: choose one" in prompt
+    assert "## Slide 1" not in prompt and "## Slide 3" not in prompt
+
+
+class ScriptedModel:
+    """Answers each call with the next scripted text, keeping the prompts"""
+    model_name = 'scripted'
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        text = self.answers.pop(0)
+        return iter([MockResponse(text)]) if stream else MockResponse(text)
+
+
+def points(*texts):
+    return "\n".join(f"- {text} is a complete sentence about the topic." for text in texts)
+
+
+CUT_SHORT = f"# Intro\n{points('One', 'Two', 'Three')}\n\n# Market\n{points('Only')}\n\n# Pricing\n"
+REPAIRED = (f"# Slide 2: Market\n{points('Size', 'Growth', 'Share')}\n\n"
+            f"# Slide 3: Pricing\n{points('Plans', 'Discounts')}\n\n"
+            f"# Slide 4: Team\n{points('Founders', 'Hiring')}\n")
+
+
+def make_service(model, mode):
+    chatbot = PowerPointChatbot(client=GeminiClient(model=model, response_cache=ResponseCache(max_entries=0)))
+    return DeckService(chatbot, mode=mode)
+
+
+@pytest.mark.parametrize('mode', [MODE_SINGLE, MODE_STREAMING])
+def test_create_repairs_with_one_extra_request(mode):
+    model = ScriptedModel(CUT_SHORT, REPAIRED)
+    service = make_service(model, mode)
+    result = service.create("Solar", 4)
+
+    assert len(model.prompts) == 2
+    assert [s['title'] for s in result['slides']] == ["Intro", "Market", "Pricing", "Team"]
+    assert result['repaired'] == [2, 3, 4]
+    # Title slide, four content slides, conclusion
+    titles = [s.shapes.title.text.upper() for s in service.deck.slides]
+    assert titles[1:5] == ["INTRO", "MARKET", "PRICING", "TEAM"]
+    assert len(titles) == 6
+
+
+def test_streamed_repair_is_one_undoable_step():
+    service = make_service(ScriptedModel(CUT_SHORT, REPAIRED), MODE_STREAMING)
+    service.create("Solar", 4)
+    history = service.chatbot.history
+    assert [version['label'] for version in history.versions()][-1] == "Fill in missing slides"
+    assert service.chatbot.undo()
+    assert len(service.deck.slides) == 4
+
+
+def test_complete_answer_without_a_count_makes_no_repair_request():
+    model = ScriptedModel(f"# Intro\n{points('One', 'Two', 'Three')}\n\n# Team\n{points('Four', 'Five')}\n")
+    result = make_service(model, MODE_STREAMING).create("Solar", None, prompt="Create 4-6 slides about Solar")
+    assert len(model.prompts) == 1 and result['repaired'] == []
+
+
+def test_failed_repair_keeps_what_was_parsed():
+    class Failing(ScriptedModel):
+        def generate_content(self, prompt, stream=False, **kwargs):
+            if self.prompts:
+                self.prompts.append(prompt)
+                raise RuntimeError("quota")
+            return super().generate_content(prompt, stream, **kwargs)
+
+    service = make_service(Failing(CUT_SHORT), MODE_SINGLE)
+    result = service.create("Solar", 4)
+    assert [s['title'] for s in result['slides']] == ["Intro", "Market"]
+    assert result['repaired'] == []
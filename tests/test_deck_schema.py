@@ -0,0 +1,101 @@
+"""JSON deck validation, the markdown fallback and the ParseStats counters."""
+import json
+
+import pytest
+
+from chatbot import DEFAULT_SLIDE_STRUCTURE, PowerPointChatbot
+from deck_schema import PARSE_STATS, DeckSchemaError, ParseStats, SlideSpec, parse_deck_json
+from gemini_client import GeminiClient
+from mock_model import MockResponse
+from response_cache import ResponseCache
+
+
+def test_parses_and_cleans_slides():
+    text = '```json\n' + json.dumps({'slides': [
+        {'title': " Intro ", 'content': ["- First point", "• Second point", "  "], 'notes': " Say hi "},
+        {'title': "Plan", 'content': "Single point"},
+    ]}) + '\n```'
+    assert parse_deck_json(text) == [
+        SlideSpec("Intro", ("First point", "Second point"), "Say hi"),
+        SlideSpec("Plan", ("Single point",)),
+    ]
+
+
+def test_accepts_a_bare_array():
+    assert parse_deck_json('[{"title": "A", "content": ["x"]}]')[0].as_dict() == {'title': "A", 'content': ["x"]}
+
+
+@pytest.mark.parametrize('text, error', [
+    ("# Intro\n- not json", "not valid JSON"),
+    ('{"deck": []}', "no 'slides' array"),
+    ('{"slides": ["Intro"]}', "Slide 1 is not an object"),
+    ('{"slides": [{"content": ["x"]}]}', "Slide 1 has no title"),
+    ('{"slides": [{"title": "A", "content": [1, 2]}]}', "Slide 1 content is not a list of strings"),
+    ('{"slides": [{"title": "A", "content": ["x"]}, {"title": "B", "content": []}]}', "Slide 2 has no content"),
+])
+def test_rejects_unusable_decks(text, error):
+    with pytest.raises(DeckSchemaError, match=error):
+        parse_deck_json(text)
+
+
+def test_allow_empty_keeps_slides_without_points():
+    text = '{"slides": [{"title": "A", "content": ["x"]}, {"title": "B", "content": []}]}'
+    assert [spec.content for spec in parse_deck_json(text, allow_empty=True)] == [("x",), ()]
+    with pytest.raises(DeckSchemaError, match="No slide has any content"):
+        parse_deck_json('{"slides": [{"title": "B", "content": []}]}', allow_empty=True)
+
+
+def test_parse_stats_rates():
+    stats = ParseStats()
+    for field in ('requests', 'requests', 'requests', 'requests', 'markdown_fallbacks', 'retries', 'failures'):
+        stats.record(field)
+    counts = stats.stats()
+    assert (counts['fallback_rate'], counts['retry_rate'], counts['failure_rate']) == (0.25, 0.25, 0.25)
+    stats.reset()
+    assert stats.stats()['requests'] == 0
+
+
+class ScriptedModel:
+    model_name = 'scripted'
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.prompts = []
+
+    def generate_content(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return MockResponse(self.answers.pop(0))
+
+
+def generate(*answers):
+    model = ScriptedModel(*answers)
+    chatbot = PowerPointChatbot(client=GeminiClient(model=model, response_cache=ResponseCache(max_entries=0)))
+    PARSE_STATS.reset()
+    return chatbot.generate_structure("Create slides about solar"), model, PARSE_STATS.stats()
+
+
+MARKDOWN = "# Intro\n- Solar panels turn sunlight into power.\n- Costs fell by ninety percent.\n"
+
+
+def test_valid_json_needs_no_fallback():
+    slides, model, stats = generate('{"slides": [{"title": "Intro", "content": ["Sun"]}]}')
+    assert slides == [{'title': "Intro", 'content': ["Sun"]}]
+    assert (stats['json_parsed'], stats['markdown_fallbacks'], len(model.prompts)) == (1, 0, 1)
+
+
+def test_markdown_answer_falls_back_without_a_retry():
+    slides, model, stats = generate(MARKDOWN)
+    assert [slide['title'] for slide in slides] == ["Intro"]
+    assert (stats['markdown_fallbacks'], stats['retries'], len(model.prompts)) == (1, 0, 1)
+
+
+def test_unusable_answer_is_retried_with_the_error():
+    slides, model, stats = generate('{"slides": []}', '{"slides": [{"title": "Intro", "content": ["Sun"]}]}')
+    assert slides == [{'title': "Intro", 'content': ["Sun"]}]
+    assert stats['retries'] == 1 and "no 'slides' array" in model.prompts[1]
+
+
+def test_repeated_failure_uses_the_default_structure():
+    slides, _, stats = generate("nothing", "still nothing")
+    assert slides == DEFAULT_SLIDE_STRUCTURE
+    assert (stats['requests'], stats['retries'], stats['failures'], stats['failure_rate']) == (1, 1, 1, 1.0)
@@ -0,0 +1,63 @@
+"""Incremental saves match a full python-pptx save, and unchanged decks are not re-serialized."""
+import zipfile
+from io import BytesIO
+
+from pptx import Presentation
+
+from chatbot import PowerPointChatbot
+
+
+def make_chatbot():
+    chatbot = PowerPointChatbot(client=object())
+    chatbot.create_presentation("Plan", [
+        {'title': "Market", 'content': ["Size of the market", "Competitors"]},
+        {'title': "Pricing", 'content': ["Three tiers", "Annual discount"]},
+        {'title': "Team", 'content': ["Founders", "Advisors"]},
+    ])
+    return chatbot
+
+
+def members(data):
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def full_save(prs):
+    output = BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+def test_matches_a_full_save_after_edits():
+    chatbot = make_chatbot()
+    chatbot.get_pptx_bytes()
+    chatbot.edit_slide_content(2, {'title': "Pricing", 'content': ["Two tiers"]})
+    chatbot.move_slide(1, 3)
+    chatbot.delete_slide(2)
+
+    data = chatbot.get_pptx_bytes()
+    assert members(data) == members(full_save(chatbot.current_ppt))
+    titles = [slide.shapes.title.text.upper() for slide in Presentation(BytesIO(data)).slides]
+    assert titles[1:] == ["PRICING", "MARKET", "THANK YOU!"]
+
+
+def test_repeated_saves_return_the_cached_bytes():
+    chatbot = make_chatbot()
+    first = chatbot.get_pptx_bytes()
+    assert chatbot.get_pptx_bytes() is first
+    assert chatbot._saver.stats['cached_saves'] == 1
+
+
+def test_an_edit_reserializes_only_the_changed_slide():
+    chatbot = make_chatbot()
+    chatbot.get_pptx_bytes()
+    stats = chatbot._saver.stats
+    compressed = stats['members_compressed']
+
+    chatbot.edit_slide_content(2, {'content': ["Two tiers"]})
+    data = chatbot.get_pptx_bytes()
+    assert stats['saves'] == 2
+    # Only the edited slide is compressed again
+    assert stats['members_compressed'] - compressed == 1
+    assert "Two tiers" in Presentation(BytesIO(data)).slides[2].shapes[1].text_frame.text
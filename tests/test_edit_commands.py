@@ -0,0 +1,94 @@
+"""The edit-command grammar: what it handles locally and what it leaves to the model."""
+import pytest
+
+from chatbot import PowerPointChatbot
+from deck_service import DeckService, ServiceError
+from edit_commands import (
+    ACTION_ADD_BULLET, ACTION_CHECKOUT, ACTION_DELETE_BULLET, ACTION_DELETE_SLIDE, ACTION_DUPLICATE_SLIDE,
+    ACTION_MOVE_SLIDE, ACTION_REDO, ACTION_REPLACE_BULLET, ACTION_RETITLE, ACTION_SWAP_SLIDES, ACTION_UNDO,
+    LAST, PLACE_AFTER, PLACE_BEFORE, EditCommand, parse_edit_command,
+)
+from intent_router import INTENT_EDIT, IntentRouter
+
+
+@pytest.mark.parametrize('prompt, command', [
+    ("Edit slide 2 title to New Marketing Strategy", EditCommand(ACTION_RETITLE, 2, text="New Marketing Strategy")),
+    ("change the title of the third slide to 'Q3 Results'.", EditCommand(ACTION_RETITLE, 3, text="Q3 Results")),
+    ("please rename slide #4 as Roadmap", EditCommand(ACTION_RETITLE, 4, text="Roadmap")),
+    ("retitle slide 2 to Better Outcomes", EditCommand(ACTION_RETITLE, 2, text="Better Outcomes")),
+    ("rename slide 3 to More Revenue Streams", EditCommand(ACTION_RETITLE, 3, text="More Revenue Streams")),
+    ("replace bullet 2 on slide 3 with Ship weekly", EditCommand(ACTION_REPLACE_BULLET, 3, target=2, text="Ship weekly")),
+    ("change slide 1's last bullet to Done", EditCommand(ACTION_REPLACE_BULLET, 1, target=LAST, text="Done")),
+    ("add a bullet to slide 2: Hire two engineers", EditCommand(ACTION_ADD_BULLET, 2, text="Hire two engineers")),
+    ('add "Cut costs" to the last slide', EditCommand(ACTION_ADD_BULLET, LAST, text="Cut costs")),
+    ("remove the 2nd bullet from slide 5", EditCommand(ACTION_DELETE_BULLET, 5, target=2)),
+    ("delete slide 4", EditCommand(ACTION_DELETE_SLIDE, 4)),
+    ("duplicate the second slide", EditCommand(ACTION_DUPLICATE_SLIDE, 2)),
+    ("move slide 5 to position 2", EditCommand(ACTION_MOVE_SLIDE, 5, target=2)),
+    ("move slide 2 to the end", EditCommand(ACTION_MOVE_SLIDE, 2, target=LAST)),
+    ("move slide 4 before slide 2", EditCommand(ACTION_MOVE_SLIDE, 4, target=2, place=PLACE_BEFORE)),
+    ("move the first slide after the last slide", EditCommand(ACTION_MOVE_SLIDE, 1, target=LAST, place=PLACE_AFTER)),
+    ("swap slides 2 and 3", EditCommand(ACTION_SWAP_SLIDES, 2, target=3)),
+    ("undo", EditCommand(ACTION_UNDO, None, target=1)),
+    ("undo the last 3 changes", EditCommand(ACTION_UNDO, None, target=3)),
+    ("redo 2 steps", EditCommand(ACTION_REDO, None, target=2)),
+    ("restore version 2", EditCommand(ACTION_CHECKOUT, None, target=2)),
+    ("go back to the original deck", EditCommand(ACTION_CHECKOUT, None, target=None)),
+])
+def test_parses_simple_commands(prompt, command):
+    assert parse_edit_command(prompt) == command
+
+
+@pytest.mark.parametrize('prompt', [
+    # Describes the new text instead of giving it
+    "change slide 2 title to something catchier",
+    "rename slide 2 to something a bit more engaging",
+    "edit slide 3 title to be more concise",
+    "set slide 1 title to a better one",
+    "replace bullet 2 on slide 3 with something shorter",
+    "change slide 4's title to sound more professional",
+    # Needs the model to write content
+    "make slide 3 more concise",
+    "improve the bullets on slide 2",
+    "rewrite slide 2",
+    # Not the whole request
+    "delete slide 4 and add a chart",
+    "change slide 2 title to",
+    "move slide 2 somewhere",
+    "swap slide 2",
+])
+def test_leaves_other_requests_to_the_model(prompt):
+    assert parse_edit_command(prompt) is None
+
+
+@pytest.mark.parametrize('prompt', ["rename slide 2 to Roadmap", "retitle slide 3 as Q3 Results"])
+def test_router_sends_grammar_verbs_to_edit(prompt):
+    assert IntentRouter().route(prompt).intent == INTENT_EDIT
+
+
+@pytest.fixture
+def service():
+    # No model: anything that is not a local command fails loudly
+    chatbot = PowerPointChatbot(client=object())
+    structure = [{'title': f"Section {i + 1}", 'content': [f"Point {j + 1}" for j in range(3)]} for i in range(3)]
+    chatbot.create_presentation("Commands", structure)
+    return DeckService(chatbot)
+
+
+def titles(service):
+    # The deck's styling sets titles in capitals
+    return [slide.shapes.title.text.upper() for slide in service.deck.slides]
+
+
+def test_commands_apply_without_a_model_call(service):
+    service.edit("rename slide 2 to Better Outcomes")
+    service.edit("swap slides 2 and 3")
+    service.edit("delete the last slide")
+    # Title slide, content slides, and the conclusion slide that was last
+    assert titles(service)[1:] == ["SECTION 2", "BETTER OUTCOMES", "SECTION 3"]
+    assert service.edit("undo")['total_slides'] == 5
+
+
+def test_command_on_a_missing_slide_is_an_error(service):
+    with pytest.raises(ServiceError, match="Slide 9 not found"):
+        service.edit("delete slide 9")
@@ -0,0 +1,77 @@
+"""IntentRouter picks intents in priority order and extracts slide references."""
+import pytest
+
+from intent_router import (
+    DEFAULT_SLIDE_COUNT, INTENT_ADD_SLIDE, INTENT_CHAT, INTENT_CREATE, INTENT_EDIT, INTENT_VIEW,
+    IntentRouter, extract_slide_count, extract_slide_numbers,
+)
+
+ROUTER = IntentRouter()
+
+
+@pytest.mark.parametrize('prompt, intent', [
+    ("Create a presentation about solar power", INTENT_CREATE),
+    ("Edit slide 3 to mention pricing", INTENT_EDIT),
+    ("Add a slide about hiring", INTENT_ADD_SLIDE),
+    ("Show me slide 2", INTENT_VIEW),
+    ("How long should a talk be?", INTENT_CHAT),
+    # Several intents match: the earlier one in priority order wins
+    ("Create a presentation on AI and edit slide 2", INTENT_CREATE),
+    ("Edit slide 2 and add a slide about costs", INTENT_EDIT),
+    ("Add a slide, then show me slide 4", INTENT_ADD_SLIDE),
+    ("UPDATE SLIDE 4 PLEASE", INTENT_EDIT),
+])
+def test_intent_priority(prompt, intent):
+    assert ROUTER.route(prompt).intent == intent
+
+
+def test_custom_keywords_keep_their_order():
+    router = IntentRouter({'second': ["beta"], 'first': ["alpha"]})
+    assert router.match_intent("alpha beta") == 'second'
+    assert router.match_intent("gamma") == INTENT_CHAT
+
+
+@pytest.mark.parametrize('prompt, numbers', [
+    ("edit slides 1, 3 and 5", (1, 3, 5)),
+    ("edit slides 2-4", (2, 3, 4)),
+    ("edit slides 6 to 4", (4, 5, 6)),
+    ("edit slide 1 and 2", (1, 2)),
+    ("edit slides 2 through 3 and 7", (2, 3, 7)),
+    ("edit slides 3, 3 and 2", (3, 2)),
+    ("edit slide 4", (4,)),
+    ("edit the intro", ()),
+])
+def test_slide_lists_and_ranges(prompt, numbers):
+    assert extract_slide_numbers(prompt) == numbers
+
+
+def test_huge_ranges_are_not_expanded():
+    assert extract_slide_numbers("edit slides 1-5000") == ()
+
+
+def test_slide_references_only_for_edit_and_view():
+    edit = ROUTER.route("Edit the slide about pricing to add a discount")
+    assert (edit.slide_query, edit.slide_numbers) == ("pricing", ())
+    view = ROUTER.route("Show me slides 2-3")
+    assert view.slide_numbers == (2, 3)
+    create = ROUTER.route("Create a presentation about slides 2-3 of the report")
+    assert (create.slide_query, create.slide_numbers) == (None, ())
+
+
+def test_route_extracts_topic_count_and_number():
+    route = ROUTER.route("Create a presentation about renewable energy with 7 slides")
+    assert (route.topic, route.slide_count) == ("renewable energy", 7)
+    assert ROUTER.route("Edit the third slide").slide_number == 3
+
+
+@pytest.mark.parametrize('prompt, count', [
+    ("include 8 slides", 8),
+    ("i need 40 slides", DEFAULT_SLIDE_COUNT),
+    ("make it short", DEFAULT_SLIDE_COUNT),
+])
+def test_slide_count(prompt, count):
+    assert extract_slide_count(prompt) == count
+
+
+def test_slide_count_default_can_be_none():
+    assert extract_slide_count("make it short", default=None) is None
@@ -0,0 +1,47 @@
+"""Deck prompts are served from the response cache; chat replies never are."""
+from chatbot import PowerPointChatbot
+from deck_service import DeckService
+from gemini_client import GeminiClient
+from mock_model import MockGeminiModel
+from response_cache import ResponseCache, make_cache_key
+
+
+def make_service():
+    model = MockGeminiModel(latency=0)
+    chatbot = PowerPointChatbot(client=GeminiClient(model=model, response_cache=ResponseCache()))
+    return DeckService(chatbot), model
+
+
+def test_repeated_structure_prompt_is_cached():
+    service, model = make_service()
+    first = service.create("Solar power", 4)
+    calls = model.calls
+    assert service.create("Solar power", 4)['slides'] == first['slides']
+    assert model.calls == calls
+
+
+def test_chat_replies_are_not_cached():
+    service, model = make_service()
+    service.chat("How many bullets should a slide have?")
+    service.chat("How many bullets should a slide have?")
+    assert model.calls == 2
+    assert service.chatbot.response_cache.stats()['memory_entries'] == 0
+
+
+def test_cache_key_ignores_whitespace_but_not_model_or_config():
+    key = make_cache_key("Create  slides\n about X", 'model-a')
+    assert key == make_cache_key("Create slides about X", 'model-a')
+    assert key != make_cache_key("Create slides about X", 'model-b')
+    assert key != make_cache_key("Create slides about X", 'model-a', {'temperature': 0})
+
+
+def test_lru_and_ttl(monkeypatch):
+    cache = ResponseCache(max_entries=2, ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr('response_cache.time.time', lambda: now[0])
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get('a') is None and cache.get('c') == "C"
+    now[0] += 11
+    assert cache.get('c') is None
+    assert cache.stats()['evictions'] == 1 and cache.stats()['expirations'] == 1
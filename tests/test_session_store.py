@@ -0,0 +1,84 @@
+"""Sessions over the memory budget are offloaded without holding up the other sessions."""
+import threading
+
+import pytest
+
+from chatbot import PowerPointChatbot
+from session_store import BlobStore, SessionStore
+
+
+def make_chatbot(title):
+    chatbot = PowerPointChatbot(client=object())
+    structure = [{'title': f"Section {i + 1}", 'content': [f"Point {j + 1}" for j in range(3)]} for i in range(3)]
+    chatbot.create_presentation(title, structure)
+    return chatbot
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(BlobStore(str(tmp_path)), memory_budget=float('inf'), idle_seconds=None)
+
+
+def test_least_recently_used_decks_are_offloaded_and_reloaded(store):
+    chatbots = [make_chatbot(f"Deck {i}") for i in range(3)]
+    for i, chatbot in enumerate(chatbots):
+        with store.session(f"s{i}", chatbot):
+            pass
+    # Room for one deck
+    store.memory_budget = chatbots[2].memory_usage()['total'] * 1.5
+    store.enforce()
+    assert [chatbot.deck_resident for chatbot in chatbots] == [False, False, True]
+    assert store.stats()['blobs'] == 2
+
+    with store.session('s0', chatbots[0]):
+        assert len(chatbots[0].current_ppt.slides) == 5
+    assert [chatbot.deck_resident for chatbot in chatbots] == [True, False, False]
+
+
+def test_offload_runs_outside_the_store_lock(store, monkeypatch):
+    idle, busy = make_chatbot("Idle"), make_chatbot("Busy")
+    with store.session('idle', idle):
+        pass
+    store.idle_seconds = 0
+
+    writing, release = threading.Event(), threading.Event()
+    put = store.blobs.put
+
+    def slow_put(data):
+        writing.set()
+        release.wait(5)
+        return put(data)
+
+    monkeypatch.setattr(store.blobs, 'put', slow_put)
+    offloader = threading.Thread(target=store.enforce)
+    offloader.start()
+    assert writing.wait(5)
+    store.idle_seconds = None
+
+    # Another session runs to completion while the idle deck is being written
+    finished = threading.Event()
+
+    def use_busy():
+        with store.session('busy', busy):
+            busy.get_slide_content(2)
+        finished.set()
+
+    threading.Thread(target=use_busy).start()
+    assert finished.wait(2)
+
+    # The session being offloaded waits for the write, then reloads its deck
+    entered = threading.Event()
+
+    def use_idle():
+        with store.session('idle', idle):
+            entered.set()
+
+    user = threading.Thread(target=use_idle)
+    user.start()
+    assert not entered.wait(0.2)
+    release.set()
+    offloader.join(5)
+    user.join(5)
+    assert entered.is_set()
+    assert store.offloads >= 1
+    assert idle.current_ppt is not None
@@ -0,0 +1,32 @@
+"""Cloned content slides get their own text and their own decoration."""
+import random
+
+from chatbot import DECORATIVE_DOT_NAME, PowerPointChatbot
+
+
+def make_deck(slides):
+    chatbot = PowerPointChatbot(client=object())
+    structure = [{'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of {i + 1}" for j in range(3)]}
+                 for i in range(slides)]
+    return chatbot.create_presentation("Factory", structure)
+
+
+def dots(slide):
+    return [(shape.left, shape.top, shape.width, shape.fill.fore_color.rgb)
+            for shape in slide.shapes if shape.name.startswith(DECORATIVE_DOT_NAME)]
+
+
+def test_clones_carry_their_own_text():
+    prs = make_deck(4)
+    for number, slide in enumerate(list(prs.slides)[1:5], 1):
+        assert slide.shapes.title.text == f"SECTION {number}"
+        body = [shape for shape in slide.shapes if shape.has_text_frame and "Point" in shape.text_frame.text]
+        assert body[0].text_frame.text.split("\n") == [f"• Point {j + 1} of {number}" for j in range(3)]
+
+
+def test_clones_scatter_decorative_dots_per_slide():
+    random.seed(7)
+    prs = make_deck(4)
+    patterns = [dots(slide) for slide in list(prs.slides)[1:5]]
+    assert all(len(pattern) == 5 for pattern in patterns)
+    assert len({tuple(pattern) for pattern in patterns}) == 4
@@ -0,0 +1,68 @@
+"""The slide index re-reads only changed slides and follows edits, moves and deletes."""
+from unittest import mock
+
+import slide_index
+from chatbot import PowerPointChatbot
+
+
+def make_chatbot():
+    chatbot = PowerPointChatbot(client=object())
+    chatbot.create_presentation("Plan", [
+        {'title': "Market", 'content': ["Size of the market", "Competitors"]},
+        {'title': "Pricing", 'content': ["Three tiers", "Annual discount", "Free trial"]},
+        {'title': "Team", 'content': ["Founders"]},
+    ])
+    return chatbot
+
+
+def titles(chatbot):
+    return [slide['title'].upper() for slide in chatbot.get_presentation_summary()['slides']]
+
+
+def test_summary_counts_points_per_slide():
+    summary = make_chatbot().get_presentation_summary()
+    assert summary['total_slides'] == 5
+    assert [slide['content_points'] for slide in summary['slides'][1:4]] == [2, 3, 1]
+
+
+def test_edit_reindexes_only_that_slide():
+    chatbot = make_chatbot()
+    chatbot.get_presentation_summary()
+    with mock.patch.object(slide_index, 'index_slide', wraps=slide_index.index_slide) as index:
+        chatbot.edit_slide_content(2, {'content': ["Two tiers"]})
+        assert chatbot.get_slide_content(3)['content'] == ["• Two tiers"]
+        assert chatbot.get_presentation_summary()['slides'][2]['content_points'] == 1
+    assert index.call_count == 1
+
+
+def test_unchanged_deck_is_not_walked_again():
+    chatbot = make_chatbot()
+    summary = chatbot.get_presentation_summary()
+    with mock.patch.object(slide_index, 'index_slide') as index:
+        assert chatbot.get_presentation_summary() is summary
+        assert chatbot.get_slide_content(2)['content'] == ["• Size of the market", "• Competitors"]
+    index.assert_not_called()
+
+
+def test_move_and_delete_keep_numbers_in_sync():
+    chatbot = make_chatbot()
+    chatbot.get_presentation_summary()
+    chatbot.move_slide(1, 3)
+    assert titles(chatbot)[1:4] == ["PRICING", "TEAM", "MARKET"]
+    assert chatbot.find_slide("competitors") == 4
+
+    chatbot.delete_slide(1)
+    assert titles(chatbot)[1:3] == ["TEAM", "MARKET"]
+    assert chatbot.find_slide("competitors") == 3
+    assert chatbot.find_slide("tiers") is None
+    assert chatbot.get_slide_content(6) is None
+
+
+def test_undo_restores_the_index():
+    chatbot = make_chatbot()
+    chatbot.get_presentation_summary()
+    chatbot.delete_slide(2)
+    assert len(titles(chatbot)) == 4
+    assert chatbot.undo()
+    assert titles(chatbot)[1:4] == ["MARKET", "PRICING", "TEAM"]
+    assert chatbot.find_slide("tiers") == 3
@@ -0,0 +1,60 @@
+"""BM25 ranking of slides, and "the slide about X" resolved on a real deck."""
+from chatbot import PowerPointChatbot
+from slide_search import BM25Index, tokenize
+
+
+def make_index():
+    index = BM25Index()
+    index.add('pricing', "Pricing", ["Three plans for teams", "Discounts for annual billing"])
+    index.add('hiring', "Hiring Plan", ["Two engineers in Q3", "One designer"])
+    index.add('roadmap', "Roadmap", ["Pricing page redesign", "Mobile app", "Team plans launch"])
+    index.add('risks', "Risks", ["Competitors cut prices", "Hiring is slow"])
+    return index
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    assert tokenize("Show me the slides about Pricing Plans and Business") == ['pricing', 'plan', 'business']
+
+
+def test_title_match_outranks_body_match():
+    ranked = [doc_id for doc_id, _ in make_index().search("pricing")]
+    assert ranked == ['pricing', 'roadmap']
+
+
+def test_rarer_terms_weigh_more():
+    # "plan" is on three slides, "designer" only on one
+    assert make_index().search("plan designer", limit=1)[0][0] == 'hiring'
+
+
+def test_scores_are_descending_and_limited():
+    results = make_index().search("pricing plan hiring team", limit=3)
+    assert len(results) == 3
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_no_match_and_empty_index():
+    assert make_index().search("weather") == []
+    assert BM25Index().search("pricing") == []
+
+
+def test_reindex_and_remove():
+    index = make_index()
+    index.add('pricing', "Packaging", ["Bundles"])
+    assert [doc_id for doc_id, _ in index.search("pricing")] == ['roadmap']
+    index.remove('roadmap')
+    assert index.search("pricing") == [] and len(index) == 3
+    assert 'roadmap' not in index
+
+
+def test_find_slide_follows_edits():
+    chatbot = PowerPointChatbot(client=object())
+    chatbot.create_presentation("Plan", [
+        {'title': "Market", 'content': ["Size of the market", "Competitors"]},
+        {'title': "Pricing", 'content': ["Three tiers", "Annual discount"]},
+        {'title': "Team", 'content': ["Founders", "Advisors"]},
+    ])
+    assert chatbot.find_slide("pricing") == 3
+    chatbot.edit_slide_content(3, {'title': "Pricing and hiring", 'content': ["Two new engineers"]})
+    assert chatbot.find_slide("engineers") == 4
+    assert chatbot.find_slide("weather") is None
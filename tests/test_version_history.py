@@ -0,0 +1,130 @@
+"""Undo, redo and checkout restore the saved deck exactly, for every kind of edit."""
+import io
+import zipfile
+from unittest import mock
+
+import pytest
+
+import chatbot as chatbot_module
+from chatbot import PowerPointChatbot
+from session_store import BlobStore
+
+
+def make_chatbot(slides=5):
+    chatbot = PowerPointChatbot(client=object())
+    structure = [
+        {'title': f"Section {i + 1}", 'content': [f"Point {j + 1} of section {i + 1}" for j in range(3)]}
+        for i in range(slides)
+    ]
+    chatbot.current_ppt = chatbot.create_presentation("History", structure)
+    return chatbot
+
+
+def members(chatbot):
+    """Every member of the saved .pptx, by name"""
+    with zipfile.ZipFile(io.BytesIO(chatbot.get_pptx_bytes())) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def titles(chatbot):
+    return [slide.shapes.title.text if slide.shapes.title is not None else None for slide in chatbot.current_ppt.slides]
+
+
+EDITS = {
+    'edit': lambda c: c.edit_slide_content(2, {'title': "Edited", 'content': ["New one", "New two"]}),
+    'replace_bullet': lambda c: c.replace_bullet(2, 1, "Replaced"),
+    'add_bullet': lambda c: c.add_bullet(3, "Added"),
+    'delete_bullet': lambda c: c.delete_bullet(3, 2),
+    'add': lambda c: c.add_new_slide({'title': "Added slide", 'content': ["One", "Two"]}),
+    'delete': lambda c: c.delete_slide(2),
+    'move': lambda c: c.move_slide(1, 4),
+    'duplicate': lambda c: c.duplicate_slide(2),
+    'chart': lambda c: c.add_chart_slide({'title': "Chart", 'labels': ["a", "b"], 'values': [1, 2]}),
+    'native_chart': lambda c: c.add_native_chart_slide({'title': "Chart", 'labels': ["a", "b"], 'values': [1, 2]}),
+}
+
+
+@pytest.mark.parametrize('edit', EDITS)
+def test_undo_redo_checkout_restore_saved_deck(edit):
+    chatbot = make_chatbot()
+    original = members(chatbot)
+    assert EDITS[edit](chatbot)
+    edited = members(chatbot)
+    assert edited != original
+
+    assert chatbot.undo()
+    assert members(chatbot) == original
+    assert chatbot.redo()
+    assert members(chatbot) == edited
+    assert chatbot.checkout(0)
+    assert members(chatbot) == original
+    assert chatbot.checkout(1)
+    assert members(chatbot) == edited
+
+
+def test_sequence_of_edits_checks_out_every_version():
+    chatbot = make_chatbot()
+    snapshots = [members(chatbot)]
+    for edit in ('delete', 'add', 'move', 'duplicate', 'edit', 'delete', 'chart'):
+        assert EDITS[edit](chatbot)
+        snapshots.append(members(chatbot))
+    assert [version['number'] for version in chatbot.history.versions()] == list(range(len(snapshots)))
+
+    for number in (0, 7, 3, 5, 1, 6, 2, 4):
+        assert chatbot.checkout(number)
+        assert members(chatbot) == snapshots[number], number
+
+
+def test_new_edit_after_undo_discards_redo():
+    chatbot = make_chatbot()
+    EDITS['edit'](chatbot)
+    EDITS['move'](chatbot)
+    chatbot.undo()
+    EDITS['delete'](chatbot)
+    assert [version['label'] for version in chatbot.history.versions()] == ["Original", "Edit slide 3", "Delete slide 3"]
+    assert not chatbot.redo()
+
+
+def test_added_slide_after_delete_gets_a_free_partname():
+    chatbot = make_chatbot()
+    chatbot.delete_slide(2)
+    chatbot.add_new_slide({'title': "Added slide", 'content': ["One"]})
+    partnames = [str(slide.part.partname) for slide in chatbot.current_ppt.slides]
+    assert len(set(partnames)) == len(partnames)
+
+
+def test_history_survives_offload_and_reload(tmp_path):
+    chatbot = make_chatbot()
+    original = members(chatbot)
+    EDITS['delete'](chatbot)
+    EDITS['move'](chatbot)
+    edited = members(chatbot)
+
+    chatbot.offload(BlobStore(str(tmp_path)))
+    assert chatbot.deck_offloaded
+    assert members(chatbot) == edited
+    assert chatbot.checkout(0)
+    assert members(chatbot) == original
+
+
+def test_failed_chart_slide_leaves_deck_and_history_unchanged():
+    chatbot = make_chatbot()
+    original = members(chatbot)
+    with mock.patch.object(chatbot_module, 'add_native_chart', side_effect=RuntimeError("render failed")):
+        assert not EDITS['native_chart'](chatbot)
+    assert members(chatbot) == original
+
+    EDITS['edit'](chatbot)
+    assert [version['label'] for version in chatbot.history.versions()] == ["Original", "Edit slide 3"]
+    chatbot.undo()
+    assert members(chatbot) == original
+
+
+def test_failed_edit_is_rolled_back():
+    chatbot = make_chatbot()
+    original = titles(chatbot)
+    # Fails on the content, after the title was already replaced
+    with mock.patch.object(chatbot_module, 'Pt', side_effect=RuntimeError("formatting failed")):
+        assert not EDITS['edit'](chatbot)
+    assert titles(chatbot) == original
+    assert chatbot.history.last == 0
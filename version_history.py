@@ -0,0 +1,359 @@
+"""Copy-on-write, slide-granular version history of a presentation.
+
+Edits change the live python-pptx tree in place, so undo needs the earlier
+state of whatever an edit touched. Storing a whole .pptx per step would
+make history grow with the deck; instead ``VersionHistory`` keeps
+
+* a *base*: the original state of every part, captured only the first
+  time that part is about to change (``begin``),
+* one *delta* per version: the state of just the parts that version
+  changed, keyed by partname, or ``ABSENT`` for parts it removed.
+
+A part's state is its zlib-compressed XML (or, for media, a reference to
+the very same bytes object, so pictures are shared by every version and
+the live deck) plus its relationships by target partname. Memory therefore
+grows with the edits made, not with the number of slides.
+
+The newest version's states are taken lazily: until something else is
+about to change (the next edit, a checkout, offloading the deck) the live
+parts *are* that version. ``checkout`` restores the parts that differ
+between the current and the requested version in place, so the
+``Presentation`` object and untouched slides stay exactly as they are.
+"""
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from pptx.opc.oxml import parse_xml, serialize_part_xml
+from pptx.opc.package import PartFactory, XmlPart, _Relationship
+from pptx.opc.packuri import PackURI
+from pptx.slide import Slides
+from pptx.util import lazyproperty
+
+# Older versions are folded into the base beyond this many
+DEFAULT_MAX_VERSIONS = 50
+
+ABSENT = None  # the part is not in the deck at that version
+
+
+class PartState:
+    """The content and relationships of one part at one version"""
+    __slots__ = ('content_type', 'blob', 'xml', 'rels')
+
+    def __init__(self, content_type, blob, xml, rels):
+        self.content_type = content_type
+        self.blob = blob  # compressed XML, or the media bytes themselves
+        self.xml = xml
+        self.rels = rels  # ((rId, reltype, target_mode, target partname or URL), ...)
+
+    @classmethod
+    def of(cls, part):
+        if isinstance(part, XmlPart):
+            blob, xml = zlib.compress(serialize_part_xml(part._element), 1), True
+        else:
+            blob, xml = part.blob, False
+        rels = tuple(
+            (rel.rId, rel.reltype, rel._target_mode, rel.target_ref if rel.is_external else str(rel.target_part.partname))
+            for rel in part.rels.values()
+        )
+        return cls(part.content_type, blob, xml, rels)
+
+    @property
+    def data(self):
+        return zlib.decompress(self.blob) if self.xml else self.blob
+
+    @property
+    def size(self):
+        """Bytes this state adds to the history (media is shared, not counted)"""
+        return len(self.blob) if self.xml else 0
+
+
+def _replace_xml(element, new):
+    """Make ``element`` equal to ``new`` in place.
+
+    Top-level children with the same tag are kept and refilled rather than
+    replaced, so proxies python-pptx cached on them (e.g. the presentation's
+    ``slides`` over ``sldIdLst``) stay attached to the part's tree.
+    """
+    old_children = list(element)
+    children = []
+    for i, child in enumerate(new):
+        if i < len(old_children) and old_children[i].tag == child.tag:
+            kept = old_children[i]
+            kept.attrib.clear()
+            kept.attrib.update(child.attrib)
+            kept.text = child.text
+            kept[:] = list(child)
+            child = kept
+        children.append(child)
+    element.attrib.clear()
+    element.attrib.update(new.attrib)
+    element[:] = children
+
+
+def _reset_proxies(part):
+    """Drop python-pptx's cached objects built on elements no longer in ``part``'s tree"""
+    for proxy in list(vars(part).values()):
+        if getattr(proxy, '_element', None) is not part._element:
+            continue
+        for name, value in list(vars(proxy).items()):
+            if not isinstance(getattr(type(proxy), name, None), lazyproperty):
+                continue
+            element = getattr(value, '_element', None)
+            # (a removed lxml element still reports its old document's root)
+            if element is None or not any(e is part._element for e in element.iterancestors()):
+                del vars(proxy)[name]
+
+
+def _restore_part(part, state, resolve, content=True):
+    """Give ``part`` the content and relationships of ``state``; ``resolve`` maps a target partname to its part"""
+    if not content:
+        pass  # a part just created from ``state``
+    elif isinstance(part, XmlPart):
+        _replace_xml(part._element, parse_xml(state.data))
+        _reset_proxies(part)
+    else:
+        part._blob = state.blob
+    rels = part.rels
+    rels._rels.clear()
+    for r_id, reltype, target_mode, target in state.rels:
+        if target_mode != RTM.EXTERNAL:
+            target = resolve(target)
+        rels._rels[r_id] = _Relationship(rels._base_uri, r_id, reltype, target_mode, target)
+
+
+def bind_slides(prs):
+    """Create ``prs.slides`` without renaming slide parts.
+
+    python-pptx renumbers slide partnames into slide-list order the first
+    time ``slides`` is read. History identifies parts by partname, so a
+    reloaded deck must keep the names it was saved with.
+    """
+    if 'slides' not in vars(prs):
+        vars(prs)['slides'] = Slides(prs._element.get_or_add_sldIdLst(), prs)
+    return prs
+
+
+@dataclass
+class Version:
+    number: int
+    label: str
+    changes: dict = field(default_factory=dict)  # partname -> PartState or ABSENT
+    created: float = field(default_factory=time.time)
+
+
+class _Pending:
+    """A change being made: its label, the parts it touched and the parts before it"""
+
+    def __init__(self, label):
+        self.label = label
+        self.touched = {}  # partname -> part
+        self.step = {}  # partname -> (part, PartState) before the edit not yet committed
+        self.structural = False
+        self.parts_before = None
+
+
+class VersionHistory:
+    """Undo/redo/checkout for one presentation"""
+
+    def __init__(self, max_versions=DEFAULT_MAX_VERSIONS):
+        self.max_versions = max_versions
+        self._base = {}  # partname -> PartState at the first version
+        self._versions = [Version(0, "Original")]
+        self.position = 0  # number of the version the live deck is at
+        self._live = {}  # partname -> part whose state is the newest version's, not yet taken
+        self._pending = None
+        self._depth = 0
+
+    def _index(self, number):
+        return number - self._versions[0].number
+
+    @property
+    def first(self):
+        return self._versions[0].number
+
+    @property
+    def last(self):
+        return self._versions[-1].number
+
+    @property
+    def can_undo(self):
+        return self.position > self.first
+
+    @property
+    def can_redo(self):
+        return self.position < self.last
+
+    def versions(self):
+        """``[{number, label, parts, current, created}]``, oldest first"""
+        return [
+            {
+                'number': version.number,
+                'label': version.label,
+                'parts': len(version.changes) + (len(self._live) if version is self._versions[-1] else 0),
+                'current': version.number == self.position,
+                'created': version.created,
+            }
+            for version in self._versions
+        ]
+
+    def _known(self, name):
+        if name in self._base or name in self._live:
+            return True
+        return any(name in version.changes for version in self._versions[1:self._index(self.position) + 1])
+
+    def _state_at(self, number, name):
+        for version in reversed(self._versions[1:self._index(number) + 1]):
+            if name in version.changes:
+                return version.changes[name]
+        return self._base.get(name, ABSENT)
+
+    def seal(self):
+        """Take the newest version's states from the live parts (before they change again)"""
+        if self._live:
+            changes = self._versions[-1].changes
+            for name, part in self._live.items():
+                changes[name] = PartState.of(part)
+            self._live = {}
+
+    @contextmanager
+    def group(self):
+        """Record every change made inside the block as one version"""
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth and self._pending is not None and self._pending.touched:
+                self._flush()
+
+    def begin(self, prs, label, part=None):
+        """Called before a change to ``part`` (a slide's part), or to the slide list when None"""
+        if self._pending is None:
+            self.seal()
+            self._pending = _Pending(label)
+        changing = part if part is not None else prs.part
+        name = str(changing.partname)
+        if name not in self._pending.step:
+            state = PartState.of(changing)
+            self._pending.step[name] = (changing, state)
+            if not self._known(name):
+                self._base[name] = state
+        if part is None and self._pending.parts_before is None:
+            self._pending.parts_before = {str(p.partname): p for p in prs.part.package.iter_parts()}
+
+    def commit(self, prs, part=None):
+        """Called after a change; outside a ``group`` the change becomes a new version"""
+        if self._pending is None:
+            # A change without ``begin``: its earlier state was not captured,
+            # so undoing it leaves the parts it touched as they are
+            self.begin(prs, "Change", part)
+        if part is None:
+            self._pending.structural = True
+            part = prs.part
+        self._pending.touched[str(part.partname)] = part
+        self._pending.step = {}
+        if not self._depth:
+            self._flush()
+
+    def rollback(self, prs):
+        """Put back the parts an edit began on when it failed before ``commit``; returns them.
+
+        Changes already committed inside a ``group`` are kept.
+        """
+        pending = self._pending
+        if pending is None:
+            return []
+        parts = dict(pending.parts_before or {})
+        parts.update((str(p.partname), p) for p in prs.part.package.iter_parts())
+        restored = []
+        for part, state in pending.step.values():
+            _restore_part(part, state, parts.__getitem__)
+            restored.append(part)
+        pending.step = {}
+        if not pending.touched:
+            self._pending = None
+        return restored
+
+    def _flush(self):
+        pending, self._pending = self._pending, None
+        changes = {}
+        live = dict(pending.touched)
+        if pending.structural and pending.parts_before is not None:
+            package = next(iter(live.values())).package
+            parts_after = {str(p.partname): p for p in package.iter_parts()}
+            for name, part in parts_after.items():
+                if name not in pending.parts_before:
+                    live[name] = part
+            for name, part in pending.parts_before.items():
+                if name not in parts_after:
+                    # Removed parts are unchanged since before, so taking their state now is exact
+                    if not self._known(name):
+                        self._base[name] = PartState.of(part)
+                    live.pop(name, None)
+                    changes[name] = ABSENT
+
+        # A new change after undo discards the versions that were undone
+        del self._versions[self._index(self.position) + 1:]
+        self._versions.append(Version(self.position + 1, pending.label, changes))
+        self._live = live
+        self.position += 1
+        while len(self._versions) - 1 > self.max_versions:
+            self._fold_oldest()
+
+    def _fold_oldest(self):
+        if len(self._versions) == 2:
+            self.seal()
+        oldest = self._versions.pop(1)
+        for name, state in oldest.changes.items():
+            if state is ABSENT:
+                self._base.pop(name, None)
+            else:
+                self._base[name] = state
+        self._versions[0] = Version(oldest.number, oldest.label, created=oldest.created)
+
+    def checkout(self, prs, number):
+        """Restore the deck to version ``number``; returns the parts whose content changed"""
+        if not self.first <= number <= self.last:
+            raise ValueError(f"No version {number}; versions {self.first}-{self.last} exist")
+        if number == self.position:
+            return []
+        self.seal()
+        self._pending = None
+        low, high = sorted((self.position, number))
+        names = set()
+        for version in self._versions[self._index(low) + 1:self._index(high) + 1]:
+            names.update(version.changes)
+
+        package = prs.part.package
+        parts = {str(p.partname): p for p in package.iter_parts()}
+        restored = {}
+
+        def restore(name):
+            # Content first, then relationships, resolving their targets (and
+            # recreating parts that were deleted) by partname
+            if name in restored:
+                return restored[name]
+            state = self._state_at(number, name)
+            created = name not in parts
+            if created:
+                parts[name] = PartFactory(PackURI(name), state.content_type, package, state.data)
+            part = restored[name] = parts[name]
+            _restore_part(part, state, lambda target: restore(target) if target in names or target not in parts
+                          else parts[target], content=not created)
+            return part
+
+        for name in sorted(names):
+            if self._state_at(number, name) is not ABSENT:
+                restore(name)
+        self.position = number
+        return list(restored.values())
+
+    def memory_bytes(self):
+        """Bytes held by stored states (shared media excluded)"""
+        states = list(self._base.values())
+        for version in self._versions:
+            states.extend(version.changes.values())
+        return sum(state.size for state in states if state is not ABSENT)